@@ -5,9 +5,26 @@ import os
 from routes import main, users
 from routes.movie_route import create_movie_blueprint
 from routes.admin import create_admin_blueprint
+from routes.api import create_api_blueprint
+from routes.metrics import create_metrics_blueprint
 from services.database_service import get_db
-from services.user_service import get_user_by_id
+from services.user_service import get_cached_user, configure_user_cache
+from services.password_service import configure_password_hasher
 from services.movie_service import movieService
+from services.enrichment_service import enrichmentService
+from services.export_service import exportService
+from services.recommendation_service import recommendationService
+from services.suggest_service import SuggestIndex
+from services.search_log_service import searchLogService
+from services.popular_query_service import popularQueryService
+from services.metrics_service import metricsService
+from services.omdb_cache import OmdbCache, DAY
+from services.page_cache import create_page_cache
+from services.dataset_service import create_dataset_tables, datasets_loaded, load_datasets
+from services.review_service import create_review_stats_table
+from services.stats_service import create_counters_table
+from services.facet_service import create_facet_tables
+from cli import create_seed_cli
 
 
 def create_app():
@@ -21,16 +38,41 @@ def create_app():
     login_manager.init_app(app)
     login_manager.login_view = 'users.login'
 
+    configure_user_cache(
+        max_entries=int(os.getenv("USER_CACHE_MAX_ENTRIES", "1024")),
+        ttl=float(os.getenv("USER_CACHE_TTL_SECONDS", "300")),
+        version_check=float(os.getenv("USER_CACHE_VERSION_CHECK_SECONDS", "1")),
+    )
+
+    configure_password_hasher(
+        method=os.getenv("PASSWORD_HASH_METHOD", "scrypt"),
+        workers=int(os.getenv("PASSWORD_HASH_WORKERS", "2")),
+        max_pending=int(os.getenv("PASSWORD_HASH_MAX_PENDING", "8")),
+        queue_timeout=float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", "2")),
+    )
+
     @login_manager.user_loader
     def load_user(user_id: str):
         try:
-            return get_user_by_id(int(user_id))
+            user = get_cached_user(int(user_id))
+            # Flask-Login only checks is_active at login; deactivated sessions end here.
+            return user if user is not None and user.is_active else None
         except Exception:
             return None
 
-    from services.database_service import get_db, init_app
+    from services.database_service import get_db, init_app, DEFAULT_CONFIG
     from models.users import initialize_users_table
+    # DATABASE_PATH, DATABASE_POOL_SIZE, ... may be overridden from the environment.
+    app.config.update({key: os.environ[key] for key in DEFAULT_CONFIG if key in os.environ})
     init_app(app)
+    metrics = None
+    if os.getenv("METRICS_ENABLED", "1") != "0":
+        metrics = metricsService(
+            slow_request_ms=float(os.getenv("SLOW_REQUEST_MS", "500")),
+            server_timing=os.getenv("METRICS_SERVER_TIMING", "0") == "1",
+        )
+        metrics.init_app(app)
+        app.register_blueprint(create_metrics_blueprint(metrics, token=os.getenv("METRICS_TOKEN")))
     
     
     with app.app_context():
@@ -38,15 +80,93 @@ def create_app():
         initialize_users_table()
         row = db.execute("SELECT datetime('now') AS utc_time").fetchone()
         print({"utc_time": row["utc_time"]})
-        movie_service = movieService(os.getenv("MOVIE_SERVICE_API_KEY"))
+        movie_service = movieService(
+            os.getenv("MOVIE_SERVICE_API_KEY"),
+            base_omdb_url=os.getenv("OMDB_BASE_URL", "http://www.omdbapi.com/"),
+            omdb_rate_limit=float(os.getenv("OMDB_RATE_LIMIT", "5")),
+            omdb_cache=OmdbCache(
+                hit_ttl=float(os.getenv("OMDB_CACHE_HIT_TTL_DAYS", "30")) * DAY,
+                miss_ttl=float(os.getenv("OMDB_CACHE_MISS_TTL_DAYS", "7")) * DAY,
+                max_entries=int(os.getenv("OMDB_CACHE_MAX_ENTRIES", "50000")),
+            ),
+            metrics=metrics,
+        )
         movie_service.create_movie_table()
-        movie_service.seed_movies_from_csv('./data/netflix_titles.csv')
+        # Seeding runs out-of-band (`flask seed movies`); only an empty catalog is loaded at boot.
+        if not movie_service.has_movies():
+            movie_service.seed_movies_from_csv('./data/netflix_titles.csv')
+        create_dataset_tables()
+        create_review_stats_table()
+        create_counters_table()
+        create_facet_tables()
+        if not datasets_loaded():
+            load_datasets('./data')
+        enrichment_service = enrichmentService(
+            app, movie_service,
+            workers=int(os.getenv("ENRICHMENT_WORKERS", "2")),
+            batch_size=int(os.getenv("ENRICHMENT_BATCH_SIZE", "10")),
+            concurrency=int(os.getenv("OMDB_CONCURRENCY", "4")),
+            lease_seconds=int(os.getenv("ENRICHMENT_LEASE_SECONDS", "600")),
+        )
+        enrichment_service.create_job_table()
+        export_service = exportService(
+            app,
+            export_dir=os.getenv("EXPORT_DIR", "./exports"),
+            lease_seconds=int(os.getenv("EXPORT_LEASE_SECONDS", "120")),
+        )
+        export_service.create_job_table()
+        recommendation_service = recommendationService(
+            app,
+            k=int(os.getenv("SIMILAR_TITLES_K", "10")),
+            max_df=float(os.getenv("SIMILAR_TITLES_MAX_DF", "0.05")),
+            workers=int(os.getenv("RECOMMENDATION_WORKERS", "1")),
+        )
+        recommendation_service.create_tables()
+        suggest_index = SuggestIndex()
+        search_log = searchLogService(
+            app,
+            capacity=int(os.getenv("SEARCH_LOG_BUFFER_SIZE", "10000")),
+            batch_size=int(os.getenv("SEARCH_LOG_BATCH_SIZE", "500")),
+            flush_interval=float(os.getenv("SEARCH_LOG_FLUSH_INTERVAL", "1")),
+        )
+        popular_queries = popularQueryService(
+            app, movie_service,
+            top_n=int(os.getenv("POPULAR_QUERIES_TOP_N", "50")),
+            window_days=int(os.getenv("POPULAR_QUERIES_WINDOW_DAYS", "0")) or None,
+            refresh_interval=float(os.getenv("POPULAR_QUERIES_REFRESH_INTERVAL", "5")),
+            mine_interval=float(os.getenv("POPULAR_QUERIES_MINE_INTERVAL", "600")),
+        )
     
-        app.register_blueprint(create_movie_blueprint(movie_service))
-        app.register_blueprint(create_admin_blueprint(movie_service))
+        page_cache = create_page_cache(
+            backend=os.getenv("PAGE_CACHE_BACKEND", "memory"),
+            max_entries=int(os.getenv("PAGE_CACHE_MAX_ENTRIES", "512")),
+            ttl=float(os.getenv("PAGE_CACHE_TTL_SECONDS", "3600")),
+        )
+
+        app.register_blueprint(create_movie_blueprint(
+            movie_service, enrichment_service, page_cache, recommendation_service, search_log, popular_queries,
+            max_age=int(os.getenv("MOVIES_CACHE_MAX_AGE", "60"))
+        ))
+        app.register_blueprint(create_admin_blueprint(
+            movie_service, enrichment_service, page_cache, export_service, suggest_index, search_log,
+            popular_queries
+        ))
+        app.register_blueprint(create_api_blueprint(
+            movie_service, recommendation_service, suggest_index,
+            max_age=int(os.getenv("MOVIES_CACHE_MAX_AGE", "60"))
+        ))
+        app.cli.add_command(create_seed_cli(movie_service, recommendation_service))
+    enrichment_service.start()
+    export_service.start()
+    recommendation_service.start()
+    search_log.start()
+    suggest_index.start(app, refresh_interval=float(os.getenv("SUGGEST_REFRESH_INTERVAL", "30")))
+    movie_service.fuzzy_index.start(app, refresh_interval=float(os.getenv("FUZZY_REFRESH_INTERVAL", "30")))
+    popular_queries.start()
     return app
 
-app = create_app()
+# Password hashing workers started with forkserver or spawn import this module as __mp_main__: they need no app.
+app = create_app() if __name__ != "__mp_main__" else None
 
 if __name__ == "__main__":
     # Read environment variables
@@ -0,0 +1,121 @@
+"""
+Typo-tolerant search: replays search_logs queries through movieService, with a
+typo injected into the ones logged with had_typo, and reports how many exact
+searches come back empty, how many of those the fuzzy fallback recovers, and
+what it costs.
+
+    uv run python benchmarks/bench_fuzzy.py
+    uv run python benchmarks/bench_fuzzy.py --rows 25000
+
+Runs against a throwaway database (DATABASE_PATH) seeded from ./data.
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(samples: list[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def add_typo(query: str, rng: random.Random) -> str:
+    """
+    One keyboard slip in one word of 4+ letters: swap, drop, double or replace a letter.
+    """
+    words = query.split()
+    candidates = [i for i, w in enumerate(words) if len(w) >= 4]
+    if not candidates:
+        return query
+    i = rng.choice(candidates)
+    word, pos = words[i], rng.randrange(1, len(words[i]) - 1)
+    kind = rng.choice(("swap", "drop", "double", "replace"))
+    if kind == "swap":
+        word = word[:pos] + word[pos + 1] + word[pos] + word[pos + 2:]
+    elif kind == "drop":
+        word = word[:pos] + word[pos + 1:]
+    elif kind == "double":
+        word = word[:pos] + word[pos] + word[pos:]
+    else:
+        word = word[:pos] + rng.choice("abcdefghijklmnopqrstuvwxyz") + word[pos + 1:]
+    words[i] = word
+    return " ".join(words)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000, help="search_logs rows to replay")
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_fuzzy_")
+    os.environ.update(
+        DATABASE_PATH=os.path.join(tmp, "bench.db"),
+        ENRICHMENT_WORKERS="0",
+        RECOMMENDATION_WORKERS="0",
+    )
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    from app import app
+    from services.database_service import get_db
+    from services.movie_service import movieService
+
+    rng = random.Random(0)
+    service = movieService(None)
+    with app.app_context():
+        logs = get_db().execute(
+            "SELECT search_query, had_typo FROM search_logs ORDER BY search_date, search_id LIMIT ?", (args.rows,)
+        ).fetchall()
+        start = time.perf_counter()
+        service.fuzzy_index.rebuild()
+        print(f"trigram index build: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        # What the query would have returned without the typo, to judge the fallback's results.
+        intended: dict[str, set[str]] = {}
+        exact_times, fuzzy_times = [], []
+        typos = empty = recovered = overlapping = 0
+        empty_typos = recovered_typos = 0
+        for row in logs:
+            query = row['search_query']
+            if query not in intended:
+                movies, _, _ = service.search_movies(query, page_size=args.page_size, consolidate=False)
+                intended[query] = {m.show_id for m in movies}
+            if row['had_typo']:
+                typos += 1
+                typed = add_typo(query, rng)
+            else:
+                typed = query
+            start = time.perf_counter()
+            movies, _, _ = service.search_movies(typed, page_size=args.page_size, consolidate=False)
+            exact_times.append(time.perf_counter() - start)
+            if movies:
+                continue
+            empty += 1
+            empty_typos += row['had_typo']
+            start = time.perf_counter()
+            movies, _ = service.fuzzy_search_movies(typed, page_size=args.page_size)
+            fuzzy_times.append(time.perf_counter() - start)
+            if movies:
+                recovered += 1
+                recovered_typos += row['had_typo']
+                overlapping += bool(intended[query] & {m.show_id for m in movies})
+
+    print(f"replayed {len(logs)} searches ({typos} with an injected typo, {len(intended)} distinct intents)")
+    print(f"exact search: p50 {percentile(exact_times, 0.5) * 1000:.1f} ms, p99 {percentile(exact_times, 0.99) * 1000:.1f} ms, "
+          f"{empty} empty ({empty * 100 / max(1, len(logs)):.1f}%), {empty_typos} of them with a typo")
+    print(f"fuzzy fallback: p50 {percentile(fuzzy_times, 0.5) * 1000:.1f} ms, p99 {percentile(fuzzy_times, 0.99) * 1000:.1f} ms, "
+          f"recovered {recovered}/{empty} ({recovered_typos}/{empty_typos} with a typo), "
+          f"{overlapping} sharing a title with the intended query's results")
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
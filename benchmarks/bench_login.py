@@ -0,0 +1,96 @@
+"""
+Login throughput under a login storm, and what it does to /movies latency.
+
+    uv run python benchmarks/bench_login.py --workers 0   # hash on request threads
+    uv run python benchmarks/bench_login.py --workers 2   # hash in the process pool
+
+Runs against a throwaway database (DATABASE_PATH), with OMDB enrichment and the similar-titles refresh disabled.
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(samples: list[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=2, help="PASSWORD_HASH_WORKERS (0 = inline)")
+    parser.add_argument("--method", default="scrypt", help="PASSWORD_HASH_METHOD")
+    parser.add_argument("--login-threads", type=int, default=8)
+    parser.add_argument("--browse-threads", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_login_")
+    os.environ.update(
+        DATABASE_PATH=os.path.join(tmp, "bench.db"),
+        ENRICHMENT_WORKERS="0",
+        RECOMMENDATION_WORKERS="0",
+        PASSWORD_HASH_WORKERS=str(args.workers),
+        PASSWORD_HASH_METHOD=args.method,
+        PASSWORD_HASH_MAX_PENDING=str(max(1, args.workers) * 4),
+    )
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    from app import app
+    from services.user_service import create_user
+
+    with app.app_context():
+        for i in range(args.login_threads):
+            create_user(email=f"bench{i}@example.com", password="bench-password")
+
+    stop = threading.Event()
+    logins, busy, browse = [], [0], []
+
+    def login_loop(i: int) -> None:
+        client = app.test_client()
+        while not stop.is_set():
+            start = time.perf_counter()
+            response = client.post("/login", data={"email": f"bench{i}@example.com", "password": "bench-password"})
+            if response.status_code == 503:
+                busy[0] += 1
+            else:
+                logins.append(time.perf_counter() - start)
+            client.get("/logout")
+
+    def browse_loop() -> None:
+        client = app.test_client()
+        while not stop.is_set():
+            start = time.perf_counter()
+            client.get("/movies")
+            browse.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=login_loop, args=(i,)) for i in range(args.login_threads)]
+    threads += [threading.Thread(target=browse_loop) for _ in range(args.browse_threads)]
+    for t in threads:
+        t.start()
+    time.sleep(args.duration)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    print(f"hash method={args.method} workers={args.workers} "
+          f"login threads={args.login_threads} browse threads={args.browse_threads} ({args.duration:.0f}s)")
+    print(f"logins: {len(logins) / args.duration:.1f}/s, rejected busy: {busy[0]}, "
+          f"p50 {percentile(logins, 0.5) * 1000:.0f} ms, p95 {percentile(logins, 0.95) * 1000:.0f} ms")
+    print(f"/movies: {len(browse) / args.duration:.1f}/s, "
+          f"p50 {percentile(browse, 0.5) * 1000:.0f} ms, p95 {percentile(browse, 0.95) * 1000:.0f} ms, "
+          f"mean {statistics.fmean(browse) * 1000 if browse else 0:.0f} ms")
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
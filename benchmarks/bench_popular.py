@@ -0,0 +1,82 @@
+"""
+Popular-query warm cache: mines the top queries of search_logs, replays logged
+searches against it and reports the hit rate, the latency of a warm hit next to
+the SQLite search it replaces, and what a full refresh costs.
+
+    uv run python benchmarks/bench_popular.py
+    uv run python benchmarks/bench_popular.py --top-n 10 --rows 25000
+
+Runs against a throwaway database (DATABASE_PATH) seeded from ./data.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(samples: list[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000, help="search_logs rows to replay")
+    parser.add_argument("--top-n", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_popular_")
+    os.environ.update(
+        DATABASE_PATH=os.path.join(tmp, "bench.db"),
+        ENRICHMENT_WORKERS="0",
+        RECOMMENDATION_WORKERS="0",
+        POPULAR_QUERIES_TOP_N="0",
+    )
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    from app import app
+    from services.database_service import get_db
+    from services.movie_service import movieService
+    from services.popular_query_service import popularQueryService
+    from services.stats_service import get_text_version
+
+    service = movieService(None)
+    popular = popularQueryService(app, service, top_n=args.top_n, page_size=args.page_size)
+    with app.app_context():
+        refresh = popular.refresh()
+        print(f"refresh: {refresh['entries']} queries in {refresh['ms']:.0f} ms")
+        version = get_text_version()
+        logs = [r['search_query'] for r in get_db().execute(
+            "SELECT search_query FROM search_logs ORDER BY search_date, search_id LIMIT ?", (args.rows,)
+        )]
+        warm_times, sqlite_times = [], []
+        for query in logs:
+            start = time.perf_counter()
+            hit = popular.get(query, version)
+            if hit is not None:
+                service.get_movies_by_ids(hit['show_ids'])  # the route still reads the rows themselves
+                warm_times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            movies, _, _ = service.search_movies(query, page_size=args.page_size, consolidate=False)
+            sqlite_times.append(time.perf_counter() - start)
+            if hit is not None:
+                assert hit['show_ids'] == [m.show_id for m in movies], query
+        stats = popular.get_stats()
+
+    print(f"log coverage of the top {args.top_n}: {(stats['coverage'] or 0) * 100:.1f}% "
+          f"({stats['covered_searches']}/{stats['logged_searches']} logged searches)")
+    print(f"replayed {len(logs)} searches: {stats['hits']} warm hits ({(stats['hit_ratio'] or 0) * 100:.1f}%)")
+    print(f"warm hit: p50 {percentile(warm_times, 0.5) * 1000:.2f} ms, p99 {percentile(warm_times, 0.99) * 1000:.2f} ms")
+    print(f"SQLite search: p50 {percentile(sqlite_times, 0.5) * 1000:.2f} ms, p99 {percentile(sqlite_times, 0.99) * 1000:.2f} ms")
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Similar-titles index: full rebuild time over the catalog, incremental refresh
+after edits, and the cost of serving one neighbour list.
+
+    uv run python benchmarks/bench_similar.py
+    uv run python benchmarks/bench_similar.py --max-df 0.1 --k 20
+
+Runs against a throwaway database (DATABASE_PATH) seeded from ./data.
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(samples: list[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--k", type=int, default=10, help="neighbours per title")
+    parser.add_argument("--max-df", type=float, default=0.05, help="drop terms in more than this share of titles")
+    parser.add_argument("--rebuilds", type=int, default=3)
+    parser.add_argument("--edits", type=int, default=20, help="titles edited before each incremental refresh")
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_similar_")
+    os.environ.update(
+        DATABASE_PATH=os.path.join(tmp, "bench.db"),
+        ENRICHMENT_WORKERS="0",
+        RECOMMENDATION_WORKERS="0",
+    )
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    from app import app
+    from services.database_service import get_db
+    from services.recommendation_service import recommendationService
+
+    service = recommendationService(app, k=args.k, max_df=args.max_df, workers=0)
+    rng = random.Random(0)
+    with app.app_context():
+        rebuilds = [service.rebuild() for _ in range(args.rebuilds)]
+        stats = rebuilds[-1]
+        print(f"catalog: {stats['titles']} titles, {stats['terms']} terms, {stats['postings']} postings "
+              f"(k={args.k}, max_df={args.max_df})")
+        for phase in ("index_ms", "neighbors_ms", "write_ms"):
+            print(f"  {phase[:-3]:<10} median {statistics.median(r[phase] for r in rebuilds):8.0f} ms")
+        totals = [r['index_ms'] + r['neighbors_ms'] + r['write_ms'] for r in rebuilds]
+        print(f"full rebuild: median {statistics.median(totals):.0f} ms over {args.rebuilds} runs")
+
+        db = get_db()
+        show_ids = [r['show_id'] for r in db.execute("SELECT show_id FROM movies")]
+        refreshes, rewritten = [], []
+        for _ in range(5):
+            edited = rng.sample(show_ids, args.edits)
+            donors = rng.sample(show_ids, args.edits)
+            db.executemany(
+                "UPDATE movies SET description = (SELECT description FROM movies WHERE show_id = ?) WHERE show_id = ?",
+                list(zip(donors, edited))
+            )
+            db.commit()
+            start = time.perf_counter()
+            rewritten.append(service.refresh())
+            refreshes.append(time.perf_counter() - start)
+        print(f"incremental refresh of {args.edits} edited titles: median {statistics.median(refreshes) * 1000:.0f} ms, "
+              f"{statistics.median(rewritten):.0f} lists rewritten")
+
+        lookups = []
+        for show_id in rng.choices(show_ids, k=args.lookups):
+            start = time.perf_counter()
+            service.get_similar(show_id)
+            lookups.append(time.perf_counter() - start)
+        print(f"get_similar: p50 {percentile(lookups, 0.5) * 1e6:.0f} us, p99 {percentile(lookups, 0.99) * 1e6:.0f} us")
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Typeahead index: build time, memory budget, lookup latency and /api/movies/suggest
+throughput for prefixes typed from real titles and names.
+
+    uv run python benchmarks/bench_suggest.py
+    uv run python benchmarks/bench_suggest.py --threads 8 --duration 10
+
+Runs against a throwaway database (DATABASE_PATH) seeded from ./data.
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(samples: list[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=4, help="HTTP client threads")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds of HTTP load")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_suggest_")
+    os.environ.update(
+        DATABASE_PATH=os.path.join(tmp, "bench.db"),
+        ENRICHMENT_WORKERS="0",
+        RECOMMENDATION_WORKERS="0",
+    )
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    from app import app
+    from services.database_service import get_db
+    from services.suggest_service import SuggestIndex
+
+    rng = random.Random(0)
+    index = SuggestIndex()
+    with app.app_context():
+        start = time.perf_counter()
+        index.rebuild()
+        print(f"build: {(time.perf_counter() - start) * 1000:.0f} ms")
+        report = index.memory_report()
+        print(f"index: {report['keys']} keys, {report['titles']} titles, {report['people']} people")
+        for part in ("arrays", "entries", "titles", "people", "total"):
+            print(f"  {part:<8} {report[part + '_bytes'] / 1048576:6.1f} MiB")
+        labels = [r['title'] for r in get_db().execute("SELECT title FROM movies WHERE title IS NOT NULL")]
+        labels += [r['director'] for r in get_db().execute("SELECT director FROM movies WHERE director IS NOT NULL")]
+
+    # What a user has typed so far: the first 1-8 characters of a title or a name.
+    prefixes = [label[:rng.randint(1, 8)] for label in rng.choices(labels, k=args.lookups)]
+    lookups = []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        index.suggest(prefix)
+        lookups.append(time.perf_counter() - start)
+    print(f"suggest(): p50 {percentile(lookups, 0.5) * 1e6:.0f} us, p99 {percentile(lookups, 0.99) * 1e6:.0f} us, "
+          f"max {max(lookups) * 1e6:.0f} us")
+
+    stop = threading.Event()
+    latencies: list[float] = []
+
+    def client_loop(seed: int) -> None:
+        client, local = app.test_client(), random.Random(seed)
+        while not stop.is_set():
+            start = time.perf_counter()
+            client.get("/api/movies/suggest", query_string={"q": local.choice(prefixes)})
+            latencies.append(time.perf_counter() - start)
+
+    with app.test_client() as client:
+        # The app builds its own index in the background: wait for it outside the timed window.
+        while not client.get("/api/movies/suggest?q=a").get_json()['items']:
+            time.sleep(0.1)
+    threads = [threading.Thread(target=client_loop, args=(i,)) for i in range(args.threads)]
+    for t in threads:
+        t.start()
+    time.sleep(args.duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    print(f"/api/movies/suggest ({args.threads} threads): {len(latencies) / args.duration:.0f} req/s, "
+          f"p50 {percentile(latencies, 0.5) * 1000:.2f} ms, p99 {percentile(latencies, 0.99) * 1000:.2f} ms")
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import click
+from flask.cli import AppGroup
+from services.dataset_service import load_datasets
+from services.review_service import rebuild_review_stats
+from services.stats_service import rebuild_counters
+from services.facet_service import rebuild_facets
+
+
+def create_seed_cli(movie_service, recommendation_service):
+    seed = AppGroup('seed', help="Load the CSV datasets into the database.")
+
+    @seed.command('movies')
+    @click.option('--path', default='./data/netflix_titles.csv', show_default=True, help="Netflix titles CSV.")
+    @click.option('--force', is_flag=True, help="Reload even if the file fingerprint is unchanged.")
+    def seed_movies(path: str, force: bool):
+        result = movie_service.seed_movies_from_csv(path, force=force)
+        click.echo(f"{result['source']}: {result['status']} ({result['rows']} rows read, {result['changed']} written)")
+
+    @seed.command('datasets')
+    @click.option('--data-dir', default='./data', show_default=True, help="Directory holding the CSV files.")
+    @click.option('--force', is_flag=True, help="Reload even if the file fingerprints are unchanged.")
+    def seed_datasets(data_dir: str, force: bool):
+        for result in load_datasets(data_dir, force=force):
+            click.echo(f"{result['source']}: {result['status']} ({result['rows']} rows read, {result['changed']} written)")
+
+    @seed.command('review-stats')
+    def seed_review_stats():
+        count = rebuild_review_stats()
+        click.echo(f"movie_review_stats rebuilt ({count} movies)")
+
+    @seed.command('counters')
+    def seed_counters():
+        for name, value in rebuild_counters().items():
+            click.echo(f"{name}: {value}")
+
+    @seed.command('facets')
+    def seed_facets():
+        for table, count in rebuild_facets().items():
+            click.echo(f"{table}: {count} rows")
+
+    @seed.command('similar')
+    def seed_similar():
+        stats = recommendation_service.rebuild()
+        click.echo(f"movie_similar rebuilt ({stats['titles']} titles, {stats['neighbors']} neighbours, "
+                   f"{stats['index_ms'] + stats['neighbors_ms'] + stats['write_ms']:.0f} ms)")
+
+    @seed.command('search-index')
+    def rebuild_search_index():
+        movie_service.rebuild_search_index()
+        click.echo("movies_fts rebuilt")
+
+    return seed
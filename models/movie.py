@@ -1,4 +1,19 @@
+from functools import lru_cache
+from services.database_service import get_db
+
+MOVIE_FIELDS = (
+    "show_id", "type", "title", "director", "cast", "country", "date_added", "release_year",
+    "rating", "duration", "listed_in", "description", "imdb_rating", "imdb_votes", "runtime",
+    "genre", "language", "awards", "box_office", "poster", "production", "website",
+    "last_updated", "omdb_data_available",
+)
+# What compact listings (admin table, exports) select; the rest loads on first access.
+MOVIE_SUMMARY_FIELDS = ("show_id", "type", "title", "release_year", "rating", "omdb_data_available")
+
+
 class movie:
+    __slots__ = MOVIE_FIELDS
+
     def __init__(self, show_id, type, title, director, cast, country, 
                  date_added, release_year, rating, duration, listed_in, 
                  description,
@@ -32,4 +47,44 @@ class movie:
         self.website = website
         
         self.last_updated = last_updated
-        self.omdb_data_available = omdb_data_available
\ No newline at end of file
+        self.omdb_data_available = omdb_data_available
+
+    def __getattr__(self, name):
+        # Only reached for unset slots, i.e. fields left out of a summary query.
+        if name not in MOVIE_FIELDS or name == "show_id":
+            raise AttributeError(name)
+        self._load_details()
+        return object.__getattribute__(self, name)
+
+    def _load_details(self) -> None:
+        row = get_db().execute(
+            "SELECT * FROM movies WHERE show_id = ?",
+            (self.show_id,)
+        ).fetchone()
+        for field in MOVIE_FIELDS:
+            try:
+                object.__getattribute__(self, field)
+            except AttributeError:
+                value = row[field] if row is not None else None
+                setattr(self, field, bool(value) if field == "omdb_data_available" else value)
+
+
+@lru_cache(maxsize=32)
+def _mapped_columns(columns: tuple) -> tuple:
+    # Queries return a handful of distinct column lists; filter each one once.
+    return tuple(c for c in columns if c in MOVIE_FIELDS)
+
+
+def row_to_movie(row):
+    """
+    Builds a movie from a sqlite3.Row, ignoring columns movie does not know
+    (omdb_last_attempt, ranking scores, ...). Fields the row lacks stay unset
+    and are loaded together on first access.
+    """
+    if row is None:
+        return None
+    obj = movie.__new__(movie)
+    for c in _mapped_columns(tuple(row.keys())):
+        setattr(obj, c, row[c])
+    obj.omdb_data_available = bool(row["omdb_data_available"])
+    return obj
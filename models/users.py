@@ -1,11 +1,14 @@
 from typing import Optional, Dict, Any
-from dataclasses import dataclass
-from flask_login import UserMixin
+from dataclasses import dataclass, fields
 from services.database_service import get_db
 
 
-@dataclass
-class User(UserMixin):
+@dataclass(slots=True)
+class User:
+    """
+    Slotted user record. password_hash is never loaded into it; see
+    user_service.verify_credentials.
+    """
     user_id: int
     email: str
     first_name: Optional[str] = None
@@ -23,7 +26,6 @@ class User(UserMixin):
     household_size: Optional[int] = None
     created_at: str = ""
     role: str = "user"
-    password_hash: str = ""
 
     def to_public_dict(self) -> Dict[str, Any]:
         return {
@@ -87,31 +89,18 @@ def initialize_users_table() -> None:
         )
         """
     )
+    db.execute("CREATE INDEX IF NOT EXISTS idx_users_created_at_user_id ON users (created_at, user_id)")
     db.commit()
 
 
+USER_COLUMNS = tuple(f.name for f in fields(User))
+# Column list for SELECTs feeding row_to_user; leaves password_hash in the table.
+USER_SELECT = ", ".join(USER_COLUMNS)
+
+
 def row_to_user(row) -> Optional[User]:
     if row is None:
         return None
-    return User(
-        user_id=row["user_id"],
-        email=row["email"],
-        first_name=row["first_name"],
-        last_name=row["last_name"],
-        age=row["age"],
-        gender=row["gender"],
-        country=row["country"],
-        state_province=row["state_province"],
-        city=row["city"],
-        subscription_plan=row["subscription_plan"],
-        subscription_start_date=row["subscription_start_date"],
-        is_active=row["is_active"],
-        monthly_spend=row["monthly_spend"],
-        primary_device=row["primary_device"],
-        household_size=row["household_size"],
-        created_at=row["created_at"],
-        role=row["role"],
-        password_hash=row["password_hash"],
-    )
+    return User(*(row[c] for c in USER_COLUMNS))
 
 
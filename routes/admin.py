@@ -1,10 +1,13 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+import os
+from flask import Blueprint, render_template, request, redirect, url_for, flash, Response, send_file, stream_with_context
 from flask_login import login_required, current_user
 from functools import wraps
+from services.export_service import DATASETS, available_formats, iter_csv
 from services.user_service import (
     list_users, get_user_by_id, update_user, delete_user, create_user,
-    count_users, count_active_users
+    count_users, count_active_users, get_user_cache_stats
 )
+from services.password_service import HashingBusy
 
 def roles_required(roles: list[str]):
     def decorator(fn):
@@ -18,7 +21,8 @@ def roles_required(roles: list[str]):
         return wrapper
     return decorator
 
-def create_admin_blueprint(movie_service):
+def create_admin_blueprint(movie_service, enrichment_service, page_cache, export_service, suggest_index, search_log,
+                           popular_queries):
     bp = Blueprint('admin', __name__, url_prefix='/admin')
 
     @bp.route('/')
@@ -31,7 +35,58 @@ def create_admin_blueprint(movie_service):
         return render_template('admin/dashboard.html',
                                total_users=total_users,
                                active_users=active_users,
-                               movie_stats=stats)
+                               movie_stats=stats,
+                               queue_stats=enrichment_service.get_queue_stats(),
+                               user_cache_stats=get_user_cache_stats(),
+                               search_log_stats=search_log.get_stats())
+
+    @bp.route('/enrichment')
+    @roles_required(['admin'])
+    def enrichment():
+        stats = enrichment_service.get_queue_stats()
+        jobs = enrichment_service.list_recent_jobs(20)
+        cache_stats = movie_service.omdb_cache.get_stats()
+        return render_template('admin/enrichment.html', stats=stats, jobs=jobs, cache_stats=cache_stats)
+
+    @bp.route('/cache')
+    @roles_required(['admin'])
+    def cache():
+        return render_template('admin/cache.html', page_stats=page_cache.get_stats(),
+                               user_cache_stats=get_user_cache_stats(),
+                               suggest_stats=suggest_index.memory_report(),
+                               popular_stats=popular_queries.get_stats())
+
+    # Exports
+    @bp.route('/exports', methods=['GET', 'POST'])
+    @roles_required(['admin'])
+    def exports():
+        if request.method == 'POST':
+            try:
+                export_service.submit(request.form.get('dataset', ''), request.form.get('format', 'csv'))
+            except ValueError as e:
+                flash(str(e), "error")
+            return redirect(url_for('admin.exports'))
+        return render_template('admin/exports.html', jobs=export_service.list_jobs(20),
+                               datasets=list(DATASETS), formats=available_formats())
+
+    @bp.route('/exports/<int:job_id>/download')
+    @roles_required(['admin'])
+    def exports_download(job_id: int):
+        path = export_service.get_job_path(job_id)
+        if path is None:
+            return redirect(url_for('admin.exports'))
+        if not os.path.exists(path):
+            flash("Le fichier de cet export n'existe plus, relancez l'export.", "error")
+            return redirect(url_for('admin.exports'))
+        return send_file(path, as_attachment=True)
+
+    @bp.route('/exports/<string:dataset>.csv')
+    @roles_required(['admin'])
+    def exports_stream(dataset: str):
+        if dataset not in DATASETS:
+            return redirect(url_for('admin.exports'))
+        return Response(stream_with_context(iter_csv(dataset)), mimetype='text/csv',
+                        headers={'Content-Disposition': f'attachment; filename="{dataset}.csv"'})
 
     # Users list
     @bp.route('/users')
@@ -39,8 +94,11 @@ def create_admin_blueprint(movie_service):
     def users_list():
         q = request.args.get('q')
         page = request.args.get('page', 1, type=int)
-        users, has_next = list_users(q, page, 20)
-        return render_template('admin/users_list.html', users=users, q=q, page=page, has_next=has_next)
+        users, next_cursor, prev_cursor = list_users(
+            q, page_size=20, after=request.args.get('after'), before=request.args.get('before')
+        )
+        return render_template('admin/users_list.html', users=users, q=q, page=page,
+                               next_cursor=next_cursor, prev_cursor=prev_cursor)
 
     @bp.route('/users/new', methods=['GET', 'POST'])
     @roles_required(['admin'])
@@ -52,8 +110,12 @@ def create_admin_blueprint(movie_service):
             first_name = request.form.get('first_name') or None
             last_name = request.form.get('last_name') or None
             is_active = request.form.get('is_active') == 'on'
-            create_user(email=email, password=password, role=role,
-                        first_name=first_name, last_name=last_name, is_active=is_active)
+            try:
+                create_user(email=email, password=password, role=role,
+                            first_name=first_name, last_name=last_name, is_active=is_active)
+            except HashingBusy:
+                flash("Service momentanément surchargé, veuillez réessayer.", "error")
+                return render_template('admin/users_form.html', form_mode='create', user=None), 503
             return redirect(url_for('admin.users_list'))
         return render_template('admin/users_form.html', form_mode='create', user=None)
 
@@ -79,7 +141,11 @@ def create_admin_blueprint(movie_service):
             password = request.form.get('password')
             if password:
                 updates['password'] = password
-            update_user(user_id, **updates)
+            try:
+                update_user(user_id, **updates)
+            except HashingBusy:
+                flash("Service momentanément surchargé, veuillez réessayer.", "error")
+                return render_template('admin/users_form.html', form_mode='edit', user=user), 503
             return redirect(url_for('admin.users_list'))
         return render_template('admin/users_form.html', form_mode='edit', user=user)
 
@@ -95,8 +161,11 @@ def create_admin_blueprint(movie_service):
     def movies_list():
         q = request.args.get('q')
         page = request.args.get('page', 1, type=int)
-        movies, has_next = movie_service.list_movies(q, page, 20)
-        return render_template('admin/movies_list.html', movies=movies, q=q, page=page, has_next=has_next)
+        movies, next_cursor, prev_cursor = movie_service.list_movies(
+            q, page_size=20, after=request.args.get('after'), before=request.args.get('before')
+        )
+        return render_template('admin/movies_list.html', movies=movies, q=q, page=page,
+                               next_cursor=next_cursor, prev_cursor=prev_cursor)
 
     @bp.route('/movies/new', methods=['GET', 'POST'])
     @roles_required(['admin'])
@@ -117,6 +186,8 @@ def create_admin_blueprint(movie_service):
                 "description": request.form.get('description', '').strip() or None,
             }
             movie_service.create_movie(data)
+            page_cache.invalidate()
+            suggest_index.refresh([data['show_id']])
             return redirect(url_for('admin.movies_list'))
         return render_template('admin/movies_form.html', form_mode='create', movie=None)
 
@@ -141,6 +212,8 @@ def create_admin_blueprint(movie_service):
                 "description": request.form.get('description', '').strip() or None,
             }
             movie_service.update_movie(show_id, updates)
+            page_cache.invalidate()
+            suggest_index.refresh([show_id])
             return redirect(url_for('admin.movies_list'))
         return render_template('admin/movies_form.html', form_mode='edit', movie=mv)
 
@@ -148,6 +221,8 @@ def create_admin_blueprint(movie_service):
     @roles_required(['admin'])
     def movies_delete(show_id: str):
         movie_service.delete_movie(show_id)
+        page_cache.invalidate()
+        suggest_index.refresh([show_id])
         return redirect(url_for('admin.movies_list'))
 
     return bp
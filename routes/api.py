@@ -0,0 +1,108 @@
+import json
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from services.http_cache import CatalogValidators
+from services.facet_service import facet_counts, parse_filters
+
+MAX_PAGE_SIZE = 200
+MAX_SUGGESTIONS = 20
+
+
+def _requested_fields() -> tuple[str, ...] | None:
+    raw = request.args.get('fields', '')
+    fields = tuple(f.strip() for f in raw.split(',') if f.strip())
+    return fields or None
+
+
+def create_api_blueprint(movie_service, recommendation_service, suggest_index, max_age: int = 60):
+    bp = Blueprint('api', __name__, url_prefix='/api')
+
+    @bp.errorhandler(ValueError)
+    def bad_request(e):
+        return jsonify(error=str(e)), 400
+
+    @bp.route('/movies')
+    def movies():
+        # The payload depends only on the URL and the catalog version.
+        validators = CatalogValidators()
+        if validators.not_modified():
+            return validators.not_modified_response(max_age)
+        page_size = max(1, min(request.args.get('limit', 50, type=int), MAX_PAGE_SIZE))
+        items, next_cursor, prev_cursor = movie_service.query_movies(
+            fields=_requested_fields(),
+            search=request.args.get('search', '', type=str).strip() or None,
+            page_size=page_size,
+            after=request.args.get('after'),
+            before=request.args.get('before'),
+            filters=parse_filters(request.args),
+        )
+        response = jsonify(items=items, next_cursor=next_cursor, prev_cursor=prev_cursor)
+        return validators.apply(response, max_age)
+
+    @bp.route('/movies/facets')
+    def facets():
+        validators = CatalogValidators()
+        if validators.not_modified():
+            return validators.not_modified_response(max_age)
+        limit = max(1, min(request.args.get('limit', 30, type=int), MAX_PAGE_SIZE))
+        counts = facet_counts(parse_filters(request.args), limit=limit)
+        year_min, year_max = counts.pop('release_year')
+        return validators.apply(jsonify(
+            facets={name: [{'value': v, 'count': c} for v, c in values] for name, values in counts.items()},
+            release_year={'min': year_min, 'max': year_max},
+        ), max_age)
+
+    @bp.route('/movies/suggest')
+    def suggest():
+        """
+        Typeahead: titles and people whose name has a word starting with `q`.
+        """
+        limit = max(1, min(request.args.get('limit', 10, type=int), MAX_SUGGESTIONS))
+        response = jsonify(items=suggest_index.suggest(request.args.get('q', ''), limit))
+        if not suggest_index.ready():
+            response.cache_control.no_store = True  # empty while the index builds: do not let caches keep it
+            return response
+        # Served from this process's index rather than the catalog version: a short shared cache.
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+        return response
+
+    @bp.route('/movies/<string:show_id>')
+    def movie_detail(show_id: str):
+        validators = CatalogValidators()
+        if validators.not_modified():
+            return validators.not_modified_response(max_age)
+        item = movie_service.get_movie_fields(show_id, _requested_fields())
+        if item is None:
+            return jsonify(error="Movie not found"), 404
+        return validators.apply(jsonify(item), max_age)
+
+    @bp.route('/movies/<string:show_id>/similar')
+    def movie_similar(show_id: str):
+        validators = CatalogValidators()
+        if validators.not_modified():
+            return validators.not_modified_response(max_age)
+        if movie_service.get_movie_fields(show_id, ('show_id',)) is None:
+            return jsonify(error="Movie not found"), 404
+        limit = max(1, min(request.args.get('limit', 10, type=int), recommendation_service.k))
+        return validators.apply(jsonify(items=recommendation_service.get_similar(show_id, limit)), max_age)
+
+    @bp.route('/movies/export')
+    def export():
+        """
+        Full catalog as JSON lines, streamed straight from the SQLite cursor.
+        """
+        rows = movie_service.iter_movies(_requested_fields())
+        # Pull the first row now so an invalid `fields` is still answered with a 400.
+        first = next(rows, None)
+
+        def generate():
+            if first is None:
+                return
+            yield json.dumps(first, ensure_ascii=False) + '\n'
+            for item in rows:
+                yield json.dumps(item, ensure_ascii=False) + '\n'
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson',
+                        headers={'Content-Disposition': 'attachment; filename="movies.ndjson"'})
+
+    return bp
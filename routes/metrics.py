@@ -0,0 +1,15 @@
+import hmac
+from flask import Blueprint, Response, abort, request
+
+
+def create_metrics_blueprint(metrics, token: str | None = None):
+    bp = Blueprint('metrics', __name__)
+
+    @bp.route('/metrics')
+    def export():
+        # Scrapers cannot log in; METRICS_TOKEN, when set, is expected as a bearer token.
+        if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}"):
+            abort(401)
+        return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+    return bp
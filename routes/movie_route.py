@@ -1,36 +1,131 @@
-from flask import Blueprint, render_template, request
+import json
+import time
+from flask import Blueprint, render_template, request, make_response
+from flask_login import current_user
+from markupsafe import Markup
+from services.http_cache import CatalogValidators, viewer_scope
+from services.facet_service import facet_counts, parse_filters
+from services.search_log_service import device_type
+from services.stats_service import get_text_version
 
-def create_movie_blueprint(movie_service):
+def create_movie_blueprint(movie_service, enrichment_service, page_cache, recommendation_service, search_log,
+                           popular_queries, max_age: int = 60):
     bp = Blueprint('movie', __name__)
 
-    @bp.route('/movies')
-    def movies():
-        page = request.args.get('page', 1, type=int)
-        search_query = request.args.get('search', '', type=str).strip()
-
-        if search_query:
-            movies_list, has_next = movie_service.search_movies(
+    def render_listing(search_query: str, after: str | None, before: str | None, filters: dict,
+                       warm: dict | None) -> dict:
+        # OMDB consolidation runs in the enrichment workers; render what SQLite has now.
+        if warm:
+            movies_list = movie_service.get_movies_by_ids(warm['show_ids'])
+            next_cursor, prev_cursor = warm['next_cursor'], warm['prev_cursor']
+        elif search_query:
+            movies_list, next_cursor, prev_cursor = movie_service.search_movies(
                 query=search_query,
-                page=page,
                 page_size=20,
-                consolidate=True
+                after=after,
+                before=before,
+                consolidate=False,
+                filters=filters
             )
         else:
-            movies_list, has_next = movie_service.get_movies_paginated(
-                page=page,
+            movies_list, next_cursor, prev_cursor = movie_service.get_movies_paginated(
                 page_size=20,
-                consolidate=True
+                after=after,
+                before=before,
+                consolidate=False,
+                filters=filters
             )
 
+        # Nothing matched as typed: fall back to the closest titles, people and genres.
+        fuzzy_matches = []
+        if search_query and not movies_list and not after and not before:
+            movies_list, fuzzy_matches = movie_service.fuzzy_search_movies(search_query, page_size=20, filters=filters)
+
+        enrichment_service.enqueue(m.show_id for m in movies_list if not m.omdb_data_available)
+
+        return {
+            'cards': render_template('_movie_cards.html', movies=movies_list),
+            'modals': render_template(
+                '_movie_modals.html', movies=movies_list,
+                similar=recommendation_service.get_similar_many([m.show_id for m in movies_list], limit=5)
+            ),
+            'count': len(movies_list),
+            'next_cursor': next_cursor,
+            'prev_cursor': prev_cursor,
+            'total': warm['total'] if warm else None,
+            'fuzzy_matches': [m['label'] for m in fuzzy_matches[:3]],
+        }
+
+    @bp.route('/movies')
+    def movies():
+        started = time.perf_counter()
+        page = request.args.get('page', 1, type=int)
+        search_query = request.args.get('search', '', type=str).strip()
+        after = request.args.get('after')
+        before = request.args.get('before')
+        filters = parse_filters(request.args)
+
+        def log_search(results: int | None, had_typo: bool) -> None:
+            # A new search, not a page of one: buffered here, written by the search log flusher.
+            if search_query and not after and not before:
+                search_log.record(
+                    search_query, results, time.perf_counter() - started,
+                    user_id=current_user.get_id() if current_user.is_authenticated else None,
+                    device=device_type(request.headers.get('User-Agent')),
+                    had_typo=had_typo, used_filters=bool(filters),
+                )
+
+        # Unchanged catalog: answer the conditional GET before querying or rendering anything.
+        validators = CatalogValidators(viewer_scope())
+        if validators.not_modified():
+            # Browsers revalidate repeated searches: they still count, with the result count unknown.
+            log_search(None, False)
+            return validators.not_modified_response(max_age)
+
+        # Frequent searches have their first page precomputed for the current text version. Looked up
+        # ahead of the page cache so its hit rate covers all of their traffic, not just page-cache misses.
+        warm = None
+        if search_query and not after and not before and not filters:
+            warm = popular_queries.get(search_query, get_text_version())
+
+        # The listing fragments depend only on the query and the catalog version.
+        cache_key = "movies:" + json.dumps([search_query, after, before, filters], ensure_ascii=False, sort_keys=True)
+        listing = page_cache.get(cache_key, validators.version)
+        # An empty search answered before the typo-tolerant index is built must not stick for the version.
+        cacheable = True
+        if listing is None:
+            listing = render_listing(search_query, after, before, filters, warm)
+            cacheable = bool(listing['count'] or not search_query or movie_service.fuzzy_index.ready())
+            if cacheable:
+                page_cache.put(cache_key, validators.version, listing)
+        # Facet counts ignore the search and cursor, so every page of a filter set shares them.
+        facets_key = "facets:" + json.dumps(filters, ensure_ascii=False, sort_keys=True)
+        facets = page_cache.get(facets_key, validators.version)
+        if facets is None:
+            facets = facet_counts(filters)
+            page_cache.put(facets_key, validators.version, facets)
+
         stats = movie_service.get_consolidation_stats()
 
-        return render_template(
+        response = make_response(render_template(
             'movies.html',
-            movies=movies_list,
+            cards_html=Markup(listing['cards']),
+            modals_html=Markup(listing['modals']),
+            result_count=listing['count'],
+            total_count=listing.get('total'),
             page=page,
-            has_next=has_next,
+            next_cursor=listing['next_cursor'],
+            prev_cursor=listing['prev_cursor'],
             stats=stats,
-            search_query=search_query
-        )
+            search_query=search_query,
+            filters=filters,
+            facets=facets,
+            fuzzy_matches=listing['fuzzy_matches']
+        ))
+        log_search(listing['count'], bool(listing['fuzzy_matches']))
+        if not cacheable:
+            response.cache_control.no_store = True
+            return response
+        return validators.apply(response, max_age)
 
     return bp
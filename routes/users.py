@@ -1,6 +1,7 @@
 from flask import Blueprint, render_template, redirect, url_for, request, session
 import sqlite3
 from services.user_service import create_user, verify_credentials, get_user_by_id
+from services.password_service import HashingBusy
 from flask_login import login_user, logout_user, login_required, current_user
 
 bp = Blueprint('users', __name__)
@@ -26,6 +27,9 @@ def register():
             return redirect(url_for('users.profile'))
         except sqlite3.IntegrityError:
             error = "Cet email est déjà utilisé."
+        except HashingBusy:
+            error = "Service momentanément surchargé, veuillez réessayer."
+            return render_template('auth_register.html', error=error), 503
     return render_template('auth_register.html', error=error)
 
 
@@ -35,7 +39,11 @@ def login():
     if request.method == 'POST':
         email = request.form.get('email', '').strip()
         password = request.form.get('password', '')
-        user = verify_credentials(email, password)
+        try:
+            user = verify_credentials(email, password)
+        except HashingBusy:
+            error = "Service momentanément surchargé, veuillez réessayer."
+            return render_template('auth_login.html', error=error), 503
         if user:
             login_user(user)
             return redirect(url_for('users.profile'))
@@ -0,0 +1,61 @@
+import threading
+from typing import Callable
+
+
+class BackgroundLoop:
+    """
+    Runs `step` inside an app context on `threads` daemon threads until stop(),
+    waiting `interval` seconds between calls. A step returning True has more work
+    queued and is called again at once; wake() cuts a wait short. Errors are
+    logged and the loop goes on. With `final_step`, stop() lets each thread run
+    one last step, so work queued before shutdown is not lost.
+    """
+
+    def __init__(self, app, name: str, step: Callable[[], bool | None], interval: float,
+                 threads: int = 1, final_step: bool = False):
+        self.app = app
+        self.name = name
+        self.step = step
+        self.interval = interval
+        self.threads = threads
+        self.final_step = final_step
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        if self._threads or self.threads <= 0:
+            return
+        self._stop.clear()
+        for i in range(self.threads):
+            name = self.name if self.threads == 1 else f"{self.name}-{i}"
+            thread = threading.Thread(target=self._run, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def alive(self) -> int:
+        return sum(1 for t in self._threads if t.is_alive())
+
+    def _run(self) -> None:
+        while self.final_step or not self._stop.is_set():
+            busy = False
+            try:
+                with self.app.app_context():
+                    busy = self.step()
+            except Exception as e:
+                self.app.logger.exception("%s error: %s", self.name, e)
+            if self._stop.is_set():
+                return
+            if not busy:
+                self._wake.wait(self.interval)
+                self._wake.clear()
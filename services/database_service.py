@@ -1,29 +1,106 @@
-
+import queue
 import sqlite3
-from flask import g
+import threading
+from flask import current_app, g
+
+DEFAULT_CONFIG = {
+    "DATABASE_PATH": "app.db",
+    "DATABASE_POOL_SIZE": 8,
+    "DATABASE_BUSY_TIMEOUT_MS": 5000,
+    "DATABASE_CACHE_SIZE_KB": 16384,
+    "DATABASE_MMAP_SIZE": 256 * 1024 * 1024,
+    "DATABASE_CACHED_STATEMENTS": 256,
+}
+
+
+class ConnectionPool:
+    """
+    Keeps up to `size` idle SQLite connections configured for WAL, so each
+    request context borrows one instead of opening the file again.
+    """
+
+    def __init__(self, path: str, size: int = 8, busy_timeout_ms: int = 5000, cache_size_kb: int = 16384,
+                 mmap_size: int = 256 * 1024 * 1024, cached_statements: int = 256):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size = mmap_size
+        self.cached_statements = cached_statements
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._lock = threading.Lock()
+        self._wal_checked = False
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections move between worker threads, but only one thread holds a connection at a time.
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000,
+                               cached_statements=self.cached_statements, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA cache_size = -{int(self.cache_size_kb)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        with self._lock:
+            if not self._wal_checked:
+                # journal_mode is persistent in the file; switching once is enough.
+                conn.execute("PRAGMA journal_mode = WAL")
+                self._wal_checked = True
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put_nowait(conn)
+        except (queue.Full, sqlite3.Error):
+            conn.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
 
-DATABASE = "app.db"
 
 def get_db():
     """
-    Returns a SQLite3 connection tied to the Flask request context.
+    Returns a pooled SQLite3 connection tied to the Flask application context.
     """
     if "db" not in g:
-        conn = sqlite3.connect(DATABASE)
-        conn.row_factory = sqlite3.Row
-        g.db = conn
+        conn = current_app.extensions["sqlite_pool"].acquire()
+        # services.metrics_service registers a proxy timing every statement.
+        wrapper = current_app.extensions.get("sqlite_wrapper")
+        g.db = wrapper(conn) if wrapper else conn
     return g.db
 
 def close_db(e=None):
     """
-    Closes the SQLite3 connection at the end of the request.
+    Hands the connection back to the pool at the end of the request.
+    Uncommitted work is rolled back, as closing the connection used to do.
     """
     db = g.pop("db", None)
     if db is not None:
-        db.close()
+        current_app.extensions["sqlite_pool"].release(getattr(db, "raw_connection", db))
 
 def init_app(app):
     """
-    Registers teardown cleanup with Flask.
+    Builds the connection pool from app.config and registers teardown cleanup with Flask.
     """
+    for key, value in DEFAULT_CONFIG.items():
+        app.config.setdefault(key, value)
+    app.extensions["sqlite_pool"] = ConnectionPool(
+        app.config["DATABASE_PATH"],
+        size=int(app.config["DATABASE_POOL_SIZE"]),
+        busy_timeout_ms=int(app.config["DATABASE_BUSY_TIMEOUT_MS"]),
+        cache_size_kb=int(app.config["DATABASE_CACHE_SIZE_KB"]),
+        mmap_size=int(app.config["DATABASE_MMAP_SIZE"]),
+        cached_statements=int(app.config["DATABASE_CACHED_STATEMENTS"]),
+    )
     app.teardown_appcontext(close_db)
@@ -0,0 +1,183 @@
+import os
+from typing import Optional
+from services.database_service import get_db
+from services.ingestion_service import CsvSource, ingest_csv
+
+
+def _text(value: str) -> Optional[str]:
+    return value if value != '' else None
+
+
+def _int(value: str) -> Optional[int]:
+    # Several columns were exported from pandas as floats ("43.0").
+    return int(float(value)) if value not in ('', 'nan') else None
+
+
+def _float(value: str) -> Optional[float]:
+    return float(value) if value not in ('', 'nan') else None
+
+
+def _bool(value: str) -> Optional[int]:
+    if value == '':
+        return None
+    return 1 if value.strip().lower() in ('true', '1', 'yes') else 0
+
+
+def create_dataset_tables() -> None:
+    db = get_db()
+    db.executescript("""
+    CREATE TABLE IF NOT EXISTS catalog_titles (
+        movie_id TEXT PRIMARY KEY, title TEXT NOT NULL, content_type TEXT,
+        genre_primary TEXT, genre_secondary TEXT, release_year INTEGER,
+        duration_minutes REAL, rating TEXT, language TEXT, country_of_origin TEXT,
+        imdb_rating REAL, production_budget REAL, box_office_revenue REAL,
+        number_of_seasons INTEGER, number_of_episodes INTEGER,
+        is_netflix_original INTEGER, added_to_platform TEXT, content_warning INTEGER
+    );
+    CREATE INDEX IF NOT EXISTS idx_catalog_titles_title ON catalog_titles (title);
+
+    CREATE TABLE IF NOT EXISTS reviews (
+        review_id TEXT PRIMARY KEY, user_id TEXT NOT NULL, movie_id TEXT NOT NULL,
+        rating INTEGER, review_date TEXT, device_type TEXT, is_verified_watch INTEGER,
+        helpful_votes INTEGER, total_votes INTEGER, review_text TEXT,
+        sentiment TEXT, sentiment_score REAL
+    );
+    CREATE INDEX IF NOT EXISTS idx_reviews_movie_id ON reviews (movie_id, review_date);
+    CREATE INDEX IF NOT EXISTS idx_reviews_user_id ON reviews (user_id, review_date);
+
+    CREATE TABLE IF NOT EXISTS search_logs (
+        search_id TEXT PRIMARY KEY, user_id TEXT, search_query TEXT NOT NULL,
+        search_date TEXT NOT NULL, results_returned INTEGER, clicked_result_position INTEGER,
+        device_type TEXT, search_duration_seconds REAL, had_typo INTEGER,
+        used_filters INTEGER, location_country TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_search_logs_date ON search_logs (search_date);
+    CREATE INDEX IF NOT EXISTS idx_search_logs_query ON search_logs (search_query, search_date);
+
+    CREATE TABLE IF NOT EXISTS subscribers (
+        user_id TEXT PRIMARY KEY, email TEXT, first_name TEXT, last_name TEXT,
+        age INTEGER, gender TEXT, country TEXT, state_province TEXT, city TEXT,
+        subscription_plan TEXT, subscription_start_date TEXT, is_active INTEGER,
+        monthly_spend REAL, primary_device TEXT, household_size INTEGER, created_at TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_subscribers_email ON subscribers (email);
+    CREATE INDEX IF NOT EXISTS idx_subscribers_created_at ON subscribers (created_at);
+    """)
+    db.commit()
+
+
+def _catalog_title_row(row: dict) -> Optional[tuple]:
+    if not row.get('movie_id') or not row.get('title'):
+        return None
+    return (
+        row['movie_id'], row['title'], _text(row['content_type']), _text(row['genre_primary']),
+        _text(row['genre_secondary']), _int(row['release_year']), _float(row['duration_minutes']),
+        _text(row['rating']), _text(row['language']), _text(row['country_of_origin']), _float(row['imdb_rating']),
+        _float(row['production_budget']), _float(row['box_office_revenue']), _int(row['number_of_seasons']),
+        _int(row['number_of_episodes']), _bool(row['is_netflix_original']), _text(row['added_to_platform']),
+        _bool(row['content_warning'])
+    )
+
+
+def _review_row(row: dict) -> Optional[tuple]:
+    if not row.get('review_id') or not row.get('movie_id') or not row.get('user_id'):
+        return None
+    return (
+        row['review_id'], row['user_id'], row['movie_id'], _int(row['rating']), _text(row['review_date']),
+        _text(row['device_type']), _bool(row['is_verified_watch']), _int(row['helpful_votes']),
+        _int(row['total_votes']), _text(row['review_text']), _text(row['sentiment']), _float(row['sentiment_score'])
+    )
+
+
+def _search_log_row(row: dict) -> Optional[tuple]:
+    if not row.get('search_id') or not row.get('search_query') or not row.get('search_date'):
+        return None
+    return (
+        row['search_id'], _text(row['user_id']), row['search_query'], row['search_date'],
+        _int(row['results_returned']), _int(row['clicked_result_position']), _text(row['device_type']),
+        _float(row['search_duration_seconds']), _bool(row['had_typo']), _bool(row['used_filters']),
+        _text(row['location_country'])
+    )
+
+
+def _subscriber_row(row: dict) -> Optional[tuple]:
+    if not row.get('user_id'):
+        return None
+    return (
+        row['user_id'], _text(row['email']), _text(row['first_name']), _text(row['last_name']), _int(row['age']),
+        _text(row['gender']), _text(row['country']), _text(row['state_province']), _text(row['city']),
+        _text(row['subscription_plan']), _text(row['subscription_start_date']), _bool(row['is_active']),
+        _float(row['monthly_spend']), _text(row['primary_device']), _int(row['household_size']),
+        _text(row['created_at'])
+    )
+
+
+CATALOG_TITLES = CsvSource(
+    name="catalog_titles",
+    table="catalog_titles",
+    columns=("movie_id", "title", "content_type", "genre_primary", "genre_secondary", "release_year",
+             "duration_minutes", "rating", "language", "country_of_origin", "imdb_rating",
+             "production_budget", "box_office_revenue", "number_of_seasons", "number_of_episodes",
+             "is_netflix_original", "added_to_platform", "content_warning"),
+    key=("movie_id",),
+    transform=_catalog_title_row,
+)
+
+REVIEWS = CsvSource(
+    name="reviews",
+    table="reviews",
+    columns=("review_id", "user_id", "movie_id", "rating", "review_date", "device_type",
+             "is_verified_watch", "helpful_votes", "total_votes", "review_text", "sentiment",
+             "sentiment_score"),
+    key=("review_id",),
+    transform=_review_row,
+)
+
+SEARCH_LOGS = CsvSource(
+    name="search_logs",
+    table="search_logs",
+    columns=("search_id", "user_id", "search_query", "search_date", "results_returned",
+             "clicked_result_position", "device_type", "search_duration_seconds", "had_typo",
+             "used_filters", "location_country"),
+    key=("search_id",),
+    transform=_search_log_row,
+)
+
+SUBSCRIBERS = CsvSource(
+    name="subscribers",
+    table="subscribers",
+    columns=("user_id", "email", "first_name", "last_name", "age", "gender", "country",
+             "state_province", "city", "subscription_plan", "subscription_start_date", "is_active",
+             "monthly_spend", "primary_device", "household_size", "created_at"),
+    key=("user_id",),
+    transform=_subscriber_row,
+)
+
+# (source, file name under the data directory)
+DATASETS = (
+    (CATALOG_TITLES, "movies.csv"),
+    (REVIEWS, "reviews.csv"),
+    (SEARCH_LOGS, "search_logs.csv"),
+    (SUBSCRIBERS, "users.csv"),
+)
+
+
+def load_datasets(data_dir: str = "./data", force: bool = False, chunk_size: int = 2000) -> list[dict]:
+    results = []
+    for source, filename in DATASETS:
+        path = os.path.join(data_dir, filename)
+        if not os.path.exists(path):
+            results.append({'source': source.name, 'status': 'missing', 'rows': 0, 'changed': 0})
+            continue
+        results.append(ingest_csv(source, path, force=force, chunk_size=chunk_size))
+    return results
+
+
+def datasets_loaded() -> bool:
+    db = get_db()
+    names = [source.name for source, _ in DATASETS]
+    placeholders = ", ".join("?" for _ in names)
+    row = db.execute(
+        f"SELECT COUNT(*) AS c FROM source_fingerprints WHERE source IN ({placeholders})", tuple(names)
+    ).fetchone()
+    return row['c'] == len(names)
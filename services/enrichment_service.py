@@ -0,0 +1,131 @@
+import time
+from typing import Iterable
+from services.background import BackgroundLoop
+from services.database_service import get_db
+
+
+class enrichmentService:
+    """
+    Persistent OMDB enrichment queue processed by a pool of background threads.
+    """
+
+    def __init__(self, app, movie_service, workers: int = 2, batch_size: int = 10,
+                 concurrency: int = 4, poll_interval: float = 1.0, retry_after_days: int = 7,
+                 lease_seconds: int = 600):
+        self.app = app
+        self.movie_service = movie_service
+        self.workers = workers
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.retry_after_days = retry_after_days
+        self.lease_seconds = lease_seconds
+        self._loop = BackgroundLoop(app, "enrichment-worker", self._work, poll_interval, threads=workers)
+
+    def create_job_table(self) -> None:
+        db = get_db()
+        db.execute("""
+        CREATE TABLE IF NOT EXISTS enrichment_jobs (
+            show_id TEXT PRIMARY KEY,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            enqueued_at TEXT NOT NULL DEFAULT (datetime('now')),
+            started_at TEXT, finished_at TEXT, duration_ms INTEGER, last_message TEXT
+        )
+        """)
+        db.execute("CREATE INDEX IF NOT EXISTS idx_enrichment_jobs_status ON enrichment_jobs (status, enqueued_at)")
+        db.execute("CREATE INDEX IF NOT EXISTS idx_enrichment_jobs_finished ON enrichment_jobs (finished_at)")
+        db.commit()
+
+    def enqueue(self, show_ids: Iterable[str]) -> int:
+        ids = list(dict.fromkeys(show_ids))
+        if not ids:
+            return 0
+        db = get_db()
+        before = db.total_changes
+        retry_window = f"-{self.retry_after_days} days"
+        db.executemany("""
+            INSERT INTO enrichment_jobs (show_id) VALUES (?)
+            ON CONFLICT(show_id) DO UPDATE SET
+                status = 'pending', enqueued_at = datetime('now'),
+                started_at = NULL, finished_at = NULL, duration_ms = NULL
+            WHERE enrichment_jobs.status = 'done'
+               OR (enrichment_jobs.status = 'failed' AND enrichment_jobs.finished_at < datetime('now', ?))
+        """, [(show_id, retry_window) for show_id in ids])
+        db.commit()
+        return db.total_changes - before
+
+    def start(self) -> None:
+        self._loop.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._loop.stop(timeout)
+
+    def _work(self) -> bool:
+        show_ids = self._claim()
+        if show_ids:
+            self._process(show_ids)
+        return bool(show_ids)
+
+    def _claim(self) -> list[str]:
+        db = get_db()
+        rows = db.execute("""
+            UPDATE enrichment_jobs
+            SET status = 'running', started_at = datetime('now'), attempts = attempts + 1
+            WHERE show_id IN (
+                SELECT show_id FROM enrichment_jobs
+                -- A running job past its lease lost its worker (crashed or stopped process).
+                WHERE status = 'pending' OR (status = 'running' AND started_at < datetime('now', ?))
+                ORDER BY enqueued_at LIMIT ?
+            )
+            RETURNING show_id
+        """, (f"-{self.lease_seconds} seconds", self.batch_size)).fetchall()
+        db.commit()
+        return [r['show_id'] for r in rows]
+
+    def _process(self, show_ids: list[str]) -> None:
+        started = time.monotonic()
+        try:
+            results = self.movie_service.consolidate_many(show_ids, concurrency=self.concurrency)
+        except Exception as e:
+            results = {show_id: (False, str(e)) for show_id in show_ids}
+        # Jobs of a batch share its wall time, so record the per-job share.
+        duration_ms = int((time.monotonic() - started) * 1000 / len(show_ids))
+        db = get_db()
+        db.executemany("""
+            UPDATE enrichment_jobs
+            SET status = ?, finished_at = datetime('now'), duration_ms = ?, last_message = ?
+            WHERE show_id = ? AND status = 'running'
+        """, [
+            ('done' if ok else 'failed', duration_ms, message, show_id)
+            for show_id, (ok, message) in results.items()
+        ])
+        db.commit()
+
+    def get_queue_stats(self) -> dict:
+        db = get_db()
+        stats = db.execute("""
+            SELECT COUNT(CASE WHEN status = 'pending' THEN 1 END) AS pending,
+                COUNT(CASE WHEN status = 'running' THEN 1 END) AS running,
+                COUNT(CASE WHEN status = 'done' THEN 1 END) AS done,
+                COUNT(CASE WHEN status = 'failed' THEN 1 END) AS failed,
+                COUNT(CASE WHEN finished_at >= datetime('now', '-1 minute') THEN 1 END) AS finished_last_minute,
+                COUNT(CASE WHEN finished_at >= datetime('now', '-1 hour') THEN 1 END) AS finished_last_hour,
+                AVG(CASE WHEN finished_at >= datetime('now', '-1 hour') THEN duration_ms END) AS avg_duration_ms,
+                MIN(CASE WHEN status = 'pending' THEN enqueued_at END) AS oldest_pending
+            FROM enrichment_jobs
+        """).fetchone()
+        result = dict(stats)
+        result['workers'] = self.workers
+        result['workers_alive'] = self._loop.alive()
+        return result
+
+    def list_recent_jobs(self, limit: int = 20) -> list[dict]:
+        db = get_db()
+        rows = db.execute("""
+            SELECT j.show_id, m.title, j.status, j.attempts, j.finished_at, j.duration_ms, j.last_message
+            FROM enrichment_jobs j LEFT JOIN movies m ON m.show_id = j.show_id
+            WHERE j.finished_at IS NOT NULL
+            ORDER BY j.finished_at DESC LIMIT ?
+        """, (limit,)).fetchall()
+        return [dict(r) for r in rows]
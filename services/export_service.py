@@ -0,0 +1,217 @@
+import csv
+import io
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+from services.background import BackgroundLoop
+from services.database_service import get_db
+from models.movie import MOVIE_FIELDS
+from models.users import USER_COLUMNS
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # optional: `uv add pyarrow` enables Parquet exports
+    pyarrow = None
+
+MOVIE_COLUMNS = ", ".join(f'"{c}"' for c in MOVIE_FIELDS)  # "cast" is an SQL keyword
+
+# dataset -> (table holding the declared column types, columns, query)
+DATASETS = {
+    "movies": ("movies", MOVIE_FIELDS, f"SELECT {MOVIE_COLUMNS} FROM movies ORDER BY show_id"),
+    "users": ("users", USER_COLUMNS, f"SELECT {', '.join(USER_COLUMNS)} FROM users ORDER BY user_id"),
+}
+
+
+def available_formats() -> tuple[str, ...]:
+    return ("csv", "parquet") if pyarrow is not None else ("csv",)
+
+
+def iter_chunks(dataset: str, chunk_size: int = 1000) -> Iterator[list[tuple]]:
+    """
+    Yields the dataset as lists of row tuples, one fetchmany() batch at a time.
+    """
+    _, _, sql = DATASETS[dataset]
+    cursor = get_db().execute(sql)
+    try:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield [tuple(r) for r in rows]
+    finally:
+        cursor.close()
+
+
+def iter_csv(dataset: str, chunk_size: int = 1000) -> Iterator[str]:
+    """
+    The dataset as CSV text, one string per chunk (header first).
+    """
+    _, columns, _ = DATASETS[dataset]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for chunk in iter_chunks(dataset, chunk_size):
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _arrow_schema(dataset: str):
+    table, columns, _ = DATASETS[dataset]
+    declared = {r['name']: (r['type'] or '').upper() for r in get_db().execute(f"PRAGMA table_info({table})")}
+    kinds = {"INTEGER": pyarrow.int64(), "REAL": pyarrow.float64()}
+    return pyarrow.schema([(c, kinds.get(declared.get(c), pyarrow.string())) for c in columns])
+
+
+def write_export(dataset: str, fmt: str, path: str, chunk_size: int = 1000) -> int:
+    """
+    Writes the dataset to `path` chunk by chunk (one Parquet row group per chunk)
+    and returns the row count. The file appears under its final name only when complete.
+    """
+    if fmt not in available_formats():
+        raise ValueError(f"Unsupported export format: {fmt}")
+    partial = path + ".partial"
+    rows = 0
+    if fmt == "csv":
+        _, columns, _ = DATASETS[dataset]
+        with open(partial, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for chunk in iter_chunks(dataset, chunk_size):
+                writer.writerows(chunk)
+                rows += len(chunk)
+    else:
+        schema = _arrow_schema(dataset)
+        with pyarrow.parquet.ParquetWriter(partial, schema, compression="zstd") as writer:
+            for chunk in iter_chunks(dataset, chunk_size):
+                columns = list(zip(*chunk))
+                writer.write_table(pyarrow.Table.from_arrays(
+                    [pyarrow.array(values, type=field.type) for values, field in zip(columns, schema)],
+                    schema=schema
+                ))
+                rows += len(chunk)
+    os.replace(partial, path)
+    return rows
+
+
+class exportService:
+    """
+    Runs admin exports in a background thread and records them in export_jobs;
+    finished files live in `export_dir`.
+
+    Jobs run in the thread pool of the process that submitted them, which renews
+    heartbeat_at on its pending and running jobs every `heartbeat_interval`
+    seconds. A job whose heartbeat is older than `lease_seconds` lost its process
+    (restart, crash, another host going away) and is marked failed.
+    """
+
+    def __init__(self, app, export_dir: str = "./exports", workers: int = 1, chunk_size: int = 1000,
+                 heartbeat_interval: float = 15.0, lease_seconds: int = 120):
+        self.app = app
+        self.export_dir = os.path.abspath(export_dir)
+        self.chunk_size = chunk_size
+        self.lease_seconds = lease_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="export-worker")
+        # job ids this process has submitted and not finished yet
+        self._active: set[int] = set()
+        self._active_lock = threading.Lock()
+        self._loop = BackgroundLoop(app, "export-heartbeat", self._heartbeat, heartbeat_interval)
+
+    def create_job_table(self) -> None:
+        db = get_db()
+        db.execute("""
+        CREATE TABLE IF NOT EXISTS export_jobs (
+            job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            dataset TEXT NOT NULL, format TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            created_at TEXT NOT NULL DEFAULT (datetime('now')),
+            finished_at TEXT, duration_ms INTEGER, rows INTEGER, bytes INTEGER,
+            filename TEXT, error TEXT,
+            heartbeat_at TEXT NOT NULL DEFAULT (datetime('now'))
+        )
+        """)
+        self._fail_expired(db)
+        db.commit()
+
+    def _fail_expired(self, db) -> None:
+        # Jobs of live processes, this one or other workers, have a fresh heartbeat.
+        db.execute("""
+            UPDATE export_jobs SET status = 'failed', error = 'Interrupted by a restart'
+            WHERE status IN ('pending', 'running') AND heartbeat_at < datetime('now', ?)
+        """, (f"-{self.lease_seconds} seconds",))
+
+    def _heartbeat(self) -> None:
+        with self._active_lock:
+            active = list(self._active)
+        db = get_db()
+        db.executemany(
+            "UPDATE export_jobs SET heartbeat_at = datetime('now') WHERE job_id = ?", [(j,) for j in active]
+        )
+        self._fail_expired(db)
+        db.commit()
+
+    def start(self) -> None:
+        self._loop.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._loop.stop(timeout)
+
+    def submit(self, dataset: str, fmt: str) -> int:
+        if dataset not in DATASETS:
+            raise ValueError(f"Unknown dataset: {dataset}")
+        if fmt not in available_formats():
+            raise ValueError(f"Unsupported export format: {fmt}")
+        db = get_db()
+        job_id = db.execute(
+            "INSERT INTO export_jobs (dataset, format) VALUES (?, ?) RETURNING job_id", (dataset, fmt)
+        ).fetchone()['job_id']
+        db.commit()
+        with self._active_lock:
+            self._active.add(job_id)
+        self._executor.submit(self._run, job_id, dataset, fmt)
+        return job_id
+
+    def _run(self, job_id: int, dataset: str, fmt: str) -> None:
+        try:
+            with self.app.app_context():
+                db = get_db()
+                db.execute("UPDATE export_jobs SET status = 'running' WHERE job_id = ?", (job_id,))
+                db.commit()
+                started = time.monotonic()
+                filename = f"{dataset}-{job_id}.{fmt}"
+                try:
+                    os.makedirs(self.export_dir, exist_ok=True)
+                    path = os.path.join(self.export_dir, filename)
+                    rows = write_export(dataset, fmt, path, self.chunk_size)
+                    db.execute("""
+                        UPDATE export_jobs SET status = 'done', finished_at = datetime('now'), duration_ms = ?,
+                            rows = ?, bytes = ?, filename = ?
+                        WHERE job_id = ?
+                    """, (int((time.monotonic() - started) * 1000), rows, os.path.getsize(path), filename, job_id))
+                except Exception as e:
+                    db.rollback()
+                    db.execute("""
+                        UPDATE export_jobs SET status = 'failed', finished_at = datetime('now'), duration_ms = ?, error = ?
+                        WHERE job_id = ?
+                    """, (int((time.monotonic() - started) * 1000), str(e), job_id))
+                db.commit()
+        finally:
+            # Stop the heartbeat even if the job could not be marked done or failed.
+            with self._active_lock:
+                self._active.discard(job_id)
+
+    def list_jobs(self, limit: int = 20) -> list[dict]:
+        rows = get_db().execute("SELECT * FROM export_jobs ORDER BY job_id DESC LIMIT ?", (limit,)).fetchall()
+        return [dict(r) for r in rows]
+
+    def get_job_path(self, job_id: int) -> str | None:
+        row = get_db().execute(
+            "SELECT filename FROM export_jobs WHERE job_id = ? AND status = 'done'", (job_id,)
+        ).fetchone()
+        return os.path.join(self.export_dir, row['filename']) if row else None
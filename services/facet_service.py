@@ -0,0 +1,169 @@
+from services.database_service import get_db
+
+# junction table -> (value column, [(movies column split into it, constant extra columns)])
+FACET_TABLES = {
+    "movie_genre": ("genre", [("listed_in", {}), ("genre", {})]),
+    "movie_country": ("country", [("country", {})]),
+    "movie_person": ("name", [("cast", {"role": "'cast'"}), ("director", {"role": "'director'"})]),
+}
+# Facets exposed as filters: name -> (junction table, value column) or a plain movies column.
+LIST_FACETS = {"genre": ("movie_genre", "genre"), "country": ("movie_country", "country")}
+COLUMN_FACETS = ("type", "rating")
+
+
+def _split(expr: str) -> str:
+    """
+    SQL for a json_each() source splitting a comma-separated column into its items.
+    Triggers cannot use recursive CTEs, so the list is rewritten as a JSON array.
+    """
+    cleaned = f"""replace(replace(replace(replace(replace(COALESCE({expr}, ''),
+        '\\', '\\\\'), '"', '\\"'), char(9), ' '), char(10), ' '), char(13), ' ')"""
+    array = f"""'["' || replace({cleaned}, ',', '","') || '"]'"""
+    return f"json_each(CASE WHEN json_valid({array}) THEN {array} ELSE '[]' END)"
+
+
+def _insert_sql(table: str, row: str) -> str:
+    value_column, sources = FACET_TABLES[table]
+    statements = []
+    for source, extra in sources:
+        columns = ", ".join([value_column, "show_id", *extra])
+        values = ", ".join(["trim(value)", f"{row}.show_id", *extra.values()])
+        statements.append(
+            f'INSERT OR IGNORE INTO {table} ({columns}) SELECT {values} FROM {_split(f"{row}.{source}")} '
+            f"WHERE trim(value) != '';"
+        )
+    return "\n            ".join(statements)
+
+
+def create_facet_tables() -> None:
+    """
+    movie_genre / movie_country / movie_person hold the comma-separated movie
+    columns one value per row, kept in sync by triggers on movies.
+    """
+    db = get_db()
+    exists = db.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'movie_genre'"
+    ).fetchone()
+    script = """
+        CREATE TABLE IF NOT EXISTS movie_genre (
+            genre TEXT NOT NULL, show_id TEXT NOT NULL, PRIMARY KEY (genre, show_id)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS movie_country (
+            country TEXT NOT NULL, show_id TEXT NOT NULL, PRIMARY KEY (country, show_id)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS movie_person (
+            name TEXT NOT NULL, show_id TEXT NOT NULL, role TEXT NOT NULL, PRIMARY KEY (name, show_id, role)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_movie_genre_show_id ON movie_genre (show_id);
+        CREATE INDEX IF NOT EXISTS idx_movie_country_show_id ON movie_country (show_id);
+        CREATE INDEX IF NOT EXISTS idx_movie_person_show_id ON movie_person (show_id);
+        CREATE INDEX IF NOT EXISTS idx_movies_type ON movies (type);
+        CREATE INDEX IF NOT EXISTS idx_movies_rating ON movies (rating);
+        CREATE INDEX IF NOT EXISTS idx_movies_release_year ON movies (release_year);
+    """
+    for table, (_, sources) in FACET_TABLES.items():
+        watched = ", ".join(f'"{source}"' for source, _ in sources)
+        script += f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON movies BEGIN
+            {_insert_sql(table, "new")}
+        END;
+        CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON movies BEGIN
+            DELETE FROM {table} WHERE show_id = old.show_id;
+        END;
+        CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE OF {watched}, show_id ON movies BEGIN
+            DELETE FROM {table} WHERE show_id = old.show_id;
+            {_insert_sql(table, "new")}
+        END;
+        """
+    db.executescript(script)
+    if not exists:
+        rebuild_facets()
+
+
+def rebuild_facets() -> dict:
+    db = get_db()
+    counts = {}
+    for table, (value_column, sources) in FACET_TABLES.items():
+        db.execute(f"DELETE FROM {table}")
+        for source, extra in sources:
+            columns = ", ".join([value_column, "show_id", *extra])
+            values = ", ".join(["trim(value)", "m.show_id", *extra.values()])
+            db.execute(
+                f"INSERT OR IGNORE INTO {table} ({columns}) SELECT {values} "
+                f"FROM movies m, {_split(f'm.{source}')} WHERE trim(value) != ''"
+            )
+        counts[table] = db.execute(f"SELECT COUNT(*) AS c FROM {table}").fetchone()['c']
+    db.commit()
+    return counts
+
+
+def parse_filters(args) -> dict:
+    """
+    Reads the facet filters from request args, dropping empty or malformed values.
+    """
+    filters = {}
+    for key in ("type", "rating", "genre", "country"):
+        value = (args.get(key) or "").strip()
+        if value:
+            filters[key] = value
+    for key in ("year_min", "year_max"):
+        value = (args.get(key) or "").strip()
+        if value.isdigit():
+            filters[key] = int(value)
+    return filters
+
+
+def filter_clause(filters: dict | None, alias: str = "m") -> tuple[str, list]:
+    """
+    Returns an SQL condition on `alias` (a movies row) and its parameters.
+    """
+    conditions, params = ["1 = 1"], []
+    for column in COLUMN_FACETS:
+        if filters and filters.get(column):
+            conditions.append(f"{alias}.{column} = ?")
+            params.append(filters[column])
+    for name, (table, column) in LIST_FACETS.items():
+        if filters and filters.get(name):
+            conditions.append(f"{alias}.show_id IN (SELECT show_id FROM {table} WHERE {column} = ?)")
+            params.append(filters[name])
+    if filters and filters.get("year_min") is not None:
+        conditions.append(f"{alias}.release_year >= ?")
+        params.append(filters["year_min"])
+    if filters and filters.get("year_max") is not None:
+        conditions.append(f"{alias}.release_year <= ?")
+        params.append(filters["year_max"])
+    return " AND ".join(conditions), params
+
+
+def facet_counts(filters: dict | None = None, limit: int = 30) -> dict:
+    """
+    Counts per value of every facet among the movies matching `filters`. Each
+    facet ignores its own filter so the alternatives stay visible.
+    """
+    db = get_db()
+    counts = {}
+    for name in (*COLUMN_FACETS, *LIST_FACETS):
+        others = {k: v for k, v in (filters or {}).items() if k != name}
+        condition, params = filter_clause(others)
+        if name in COLUMN_FACETS:
+            sql = (f"SELECT m.{name} AS value, COUNT(*) AS count FROM movies m "
+                   f"WHERE {condition} AND m.{name} IS NOT NULL GROUP BY m.{name}")
+        elif others:
+            table, column = LIST_FACETS[name]
+            sql = (f"SELECT f.{column} AS value, COUNT(*) AS count FROM {table} f "
+                   f"JOIN movies m ON m.show_id = f.show_id WHERE {condition} GROUP BY f.{column}")
+        else:
+            # Unfiltered: a scan of the junction table's primary key, no movies lookup.
+            table, column = LIST_FACETS[name]
+            sql = f"SELECT {column} AS value, COUNT(*) AS count FROM {table} GROUP BY {column}"
+        rows = db.execute(f"{sql} ORDER BY count DESC, value LIMIT ?", (*params, limit)).fetchall()
+        counts[name] = [(r['value'], r['count']) for r in rows]
+    year_condition, year_params = filter_clause(
+        {k: v for k, v in (filters or {}).items() if k not in ("year_min", "year_max")}
+    )
+    year = db.execute(
+        f"SELECT MIN(m.release_year) AS lo, MAX(m.release_year) AS hi FROM movies m WHERE {year_condition}",
+        year_params
+    ).fetchone()
+    counts["release_year"] = (year['lo'], year['hi'])
+    return counts
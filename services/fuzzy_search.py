@@ -0,0 +1,202 @@
+import heapq
+import threading
+from collections import Counter
+from services.background import BackgroundLoop
+from services.database_service import get_db
+from services.stats_service import get_text_changes, get_text_version
+from services.suggest_service import normalize
+
+
+def trigrams(text: str) -> set[str]:
+    """
+    Trigrams of every word padded like pg_trgm ("  word "), so word starts weigh more.
+    """
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def levenshtein(a: str, b: str) -> int:
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def edit_similarity(query: str, text: str) -> float:
+    """
+    1 - normalized edit distance between the query and the best window of as many
+    words in `text`, so a title is not penalized for words the query left out.
+    """
+    words, size = text.split(), len(query.split())
+    windows = [" ".join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))]
+    return max(1 - levenshtein(query, w) / max(len(query), len(w)) for w in windows)
+
+
+class TrigramIndex:
+    """
+    Trigram inverted index over titles, people (directors and cast) and listed_in
+    genres, for typo-tolerant matching. Candidates are scored by trigram Jaccard
+    similarity, then the best ones are re-ranked with edit distance.
+
+    Only the background thread of start() builds it; it then replays
+    movie_text_changes into it like SuggestIndex does, and refresh() patches it for
+    this process's writes right away (dead entries stay in the postings and are
+    skipped). search() matches nothing until the first build is done.
+    """
+
+    def __init__(self, threshold: float = 0.3, candidates: int = 50):
+        self.threshold = threshold
+        self.candidates = candidates
+        self.version: int | None = None
+        # (entries, postings, members, keys, links), swapped as one reference.
+        self._state = None
+        self._lock = threading.Lock()
+        self._loop: BackgroundLoop | None = None
+
+    def _build(self):
+        # entry id -> (kind, key, label, normalized label, trigram count), None once dropped
+        entries: list[tuple | None] = []
+        postings: dict[str, list[int]] = {}
+        # entry id -> show_ids it stands for; keys: (kind, key) -> entry id; links: show_id -> (kind, key) pairs
+        members: dict[int, frozenset] = {}
+        keys: dict[tuple[str, str], int] = {}
+        links: dict[str, tuple] = {}
+        state = (entries, postings, members, keys, links)
+        for row in get_db().execute('SELECT show_id, title, director, "cast", listed_in FROM movies'):
+            self._add(state, row)
+        return state
+
+    @staticmethod
+    def _row_entries(row) -> list[tuple[str, str, str]]:
+        found = []
+        if row['title']:
+            found.append(("title", row['show_id'], row['title']))
+        for kind, columns in (("person", ("director", "cast")), ("genre", ("listed_in",))):
+            for column in columns:
+                for label in (row[column] or "").split(","):
+                    if label.strip():
+                        found.append((kind, normalize(label), label.strip()))
+        return found
+
+    def _add(self, state, row) -> None:
+        entries, postings, members, keys, links = state
+        show_id = row['show_id']
+        linked = []
+        for kind, key, label in self._row_entries(row):
+            if not key:
+                continue
+            entry_id = None if kind == "title" else keys.get((kind, key))
+            if entry_id is None:
+                norm = normalize(label)
+                grams = trigrams(norm)
+                entry_id = len(entries)
+                entries.append((kind, key, label, norm, len(grams)))
+                for gram in grams:
+                    postings.setdefault(gram, []).append(entry_id)
+                keys[(kind, key)] = entry_id
+                members[entry_id] = frozenset((show_id,))
+            else:
+                members[entry_id] = members[entry_id] | {show_id}
+            linked.append((kind, key))
+        links[show_id] = tuple(linked)
+
+    def _remove(self, state, show_id: str) -> None:
+        entries, postings, members, keys, links = state
+        for kind, key in links.pop(show_id, ()):
+            entry_id = keys.get((kind, key))
+            if entry_id is None:
+                continue
+            remaining = members[entry_id] - {show_id}
+            if remaining:
+                members[entry_id] = remaining
+            else:
+                entries[entry_id] = None
+                del members[entry_id], keys[(kind, key)]
+
+    def rebuild(self) -> None:
+        with self._lock:
+            version = get_text_version()
+            self._state = self._build()
+            self.version = version
+
+    def ready(self) -> bool:
+        return self._state is not None
+
+    def sync(self) -> None:
+        if self._state is None:
+            self.rebuild()
+            return
+        latest, changed = get_text_changes(self.version)
+        if changed is None:
+            self.rebuild()
+        elif changed:
+            self.refresh(changed, latest)
+
+    def refresh(self, show_ids: list[str], version: int | None = None) -> None:
+        state = self._state
+        if state is None:
+            return
+        placeholders = ", ".join("?" for _ in show_ids)
+        with self._lock:
+            rows = get_db().execute(
+                f'SELECT show_id, title, director, "cast", listed_in FROM movies WHERE show_id IN ({placeholders})',
+                show_ids
+            ).fetchall()
+            for show_id in show_ids:
+                self._remove(state, show_id)
+            for row in rows:
+                self._add(state, row)
+            if version is not None:
+                self.version = version
+
+    def search(self, query: str, limit: int = 10) -> list[dict]:
+        """
+        Best matching entries as {'kind', 'label', 'score', 'show_ids'}, best first.
+        """
+        state = self._state
+        if state is None:
+            return []
+        entries, postings, members, _, _ = state
+        q = normalize(query)
+        grams = trigrams(q)
+        if not grams:
+            return []
+        counts = Counter()
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting:
+                counts.update(posting)
+        scored = []
+        for entry_id, shared in counts.items():
+            entry = entries[entry_id]
+            if entry is None:
+                continue
+            similarity = shared / (len(grams) + entry[4] - shared)
+            if similarity >= self.threshold:
+                scored.append((similarity, entry_id))
+        ranked = []
+        for similarity, entry_id in heapq.nlargest(self.candidates, scored):
+            entry, show_ids = entries[entry_id], members.get(entry_id)
+            if entry is None or not show_ids:
+                continue
+            score = (similarity + edit_similarity(q, entry[3])) / 2
+            ranked.append({'kind': entry[0], 'label': entry[2], 'score': round(score, 4), 'show_ids': show_ids})
+        ranked.sort(key=lambda m: m['score'], reverse=True)
+        return ranked[:limit]
+
+    def start(self, app, refresh_interval: float = 30.0) -> None:
+        if self._loop is None:
+            self._loop = BackgroundLoop(app, "fuzzy-index", self.sync, refresh_interval)
+        self._loop.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._loop is not None:
+            self._loop.stop(timeout)
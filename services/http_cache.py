@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+from flask import Response, request
+from flask_login import current_user
+from services.stats_service import get_catalog_version
+
+
+def _parse_utc(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    return datetime.strptime(value, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
+
+
+def viewer_scope() -> str:
+    """
+    What a catalog page depends on besides the catalog: the navigation differs by role.
+    """
+    if current_user.is_authenticated:
+        return f"u{current_user.get_id()}-{current_user.role}"
+    return "anon"
+
+
+class CatalogValidators:
+    """
+    ETag / Last-Modified for responses rendered from the catalog, derived from
+    the trigger-maintained catalog version so computing them costs one lookup.
+    """
+
+    def __init__(self, scope: str = ""):
+        version, updated_at = get_catalog_version()
+        self.version = version
+        # No scope: the response depends only on the URL and the catalog (the JSON API).
+        self.private = scope not in ("", "anon")
+        self.etag = f"catalog-{version}-{scope}" if scope else f"catalog-{version}"
+        self.last_modified = _parse_utc(updated_at)
+
+    def not_modified(self) -> bool:
+        if request.if_none_match:
+            return request.if_none_match.contains_weak(self.etag)
+        if request.if_modified_since and self.last_modified:
+            return self.last_modified <= request.if_modified_since
+        return False
+
+    def apply(self, response: Response, max_age: int = 0) -> Response:
+        response.set_etag(self.etag, weak=True)
+        if self.last_modified:
+            response.last_modified = self.last_modified
+        if self.private:
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            response.vary.add('Cookie')
+        else:
+            response.cache_control.public = True
+            response.cache_control.max_age = max_age
+        return response
+
+    def not_modified_response(self, max_age: int = 0) -> Response:
+        return self.apply(Response(status=304), max_age)
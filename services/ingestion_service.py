@@ -0,0 +1,110 @@
+import csv
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+from services.database_service import get_db
+
+
+@dataclass(frozen=True)
+class CsvSource:
+    """
+    Describes how one CSV file maps onto a table: `transform` turns a
+    csv.DictReader row into a tuple ordered like `columns`, or None to skip it.
+    """
+    name: str
+    table: str
+    columns: tuple[str, ...]
+    key: tuple[str, ...]
+    transform: Callable[[dict], Optional[tuple]]
+
+
+def create_ingestion_table() -> None:
+    db = get_db()
+    db.execute("""
+    CREATE TABLE IF NOT EXISTS source_fingerprints (
+        source TEXT PRIMARY KEY, path TEXT NOT NULL,
+        size INTEGER NOT NULL, mtime REAL NOT NULL, sha256 TEXT NOT NULL,
+        rows INTEGER NOT NULL DEFAULT 0, loaded_at TEXT NOT NULL DEFAULT (datetime('now'))
+    )
+    """)
+    db.commit()
+
+
+def file_sha256(path: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _upsert_sql(source: CsvSource) -> str:
+    columns = ", ".join(f'"{c}"' for c in source.columns)
+    placeholders = ", ".join("?" for _ in source.columns)
+    values = [c for c in source.columns if c not in source.key]
+    conflict = ", ".join(f'"{c}"' for c in source.key)
+    if not values:
+        return f"INSERT OR IGNORE INTO {source.table} ({columns}) VALUES ({placeholders})"
+    assignments = ", ".join(f'"{c}" = excluded."{c}"' for c in values)
+    current = ", ".join(f'{source.table}."{c}"' for c in values)
+    incoming = ", ".join(f'excluded."{c}"' for c in values)
+    # Only rewrite rows whose content changed, so unchanged rows fire no triggers.
+    return f"""
+        INSERT INTO {source.table} ({columns}) VALUES ({placeholders})
+        ON CONFLICT({conflict}) DO UPDATE SET {assignments}
+        WHERE ({current}) IS NOT ({incoming})
+    """
+
+
+def _read_chunks(source: CsvSource, path: str, chunk_size: int) -> Iterator[list[tuple]]:
+    with open(path, newline='', encoding='utf-8') as csvfile:
+        chunk = []
+        for row in csv.DictReader(csvfile):
+            values = source.transform(row)
+            if values is None:
+                continue
+            chunk.append(values)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def ingest_csv(source: CsvSource, path: str, force: bool = False, chunk_size: int = 1000) -> dict:
+    """
+    Streams `path` into `source.table` with one executemany/commit per chunk.
+    Files whose size, mtime or content hash match the last load are skipped.
+    """
+    db = get_db()
+    stat = os.stat(path)
+    stored = db.execute(
+        "SELECT size, mtime, sha256 FROM source_fingerprints WHERE source = ?", (source.name,)
+    ).fetchone()
+    result = {'source': source.name, 'status': 'unchanged', 'rows': 0, 'changed': 0}
+
+    if not force and stored and stored['size'] == stat.st_size and stored['mtime'] == stat.st_mtime:
+        return result
+    digest = file_sha256(path)
+    if not force and stored and stored['sha256'] == digest:
+        db.execute("UPDATE source_fingerprints SET mtime = ? WHERE source = ?", (stat.st_mtime, source.name))
+        db.commit()
+        return result
+
+    sql = _upsert_sql(source)
+    rows = changed = 0
+    for chunk in _read_chunks(source, path, chunk_size):
+        changed += db.executemany(sql, chunk).rowcount
+        db.commit()
+        rows += len(chunk)
+
+    db.execute("""
+        INSERT INTO source_fingerprints (source, path, size, mtime, sha256, rows, loaded_at)
+        VALUES (?, ?, ?, ?, ?, ?, datetime('now'))
+        ON CONFLICT(source) DO UPDATE SET path = excluded.path, size = excluded.size, mtime = excluded.mtime,
+            sha256 = excluded.sha256, rows = excluded.rows, loaded_at = excluded.loaded_at
+    """, (source.name, os.path.abspath(path), stat.st_size, stat.st_mtime, digest, rows))
+    db.commit()
+    result.update(status='loaded', rows=rows, changed=changed)
+    return result
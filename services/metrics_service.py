@@ -0,0 +1,289 @@
+import threading
+import time
+from bisect import bisect_left
+from flask import before_render_template, current_app, g, has_app_context, request, template_rendered
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250, 1000)
+STATEMENTS = ("SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "WITH")
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _statement(sql: str) -> str:
+    verb = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+    return verb if verb in STATEMENTS else "OTHER"
+
+
+def _short_sql(sql: str, limit: int = 200) -> str:
+    sql = " ".join(sql.split())
+    return sql if len(sql) <= limit else sql[:limit - 3] + "..."
+
+
+class Histogram:
+    """
+    Prometheus histogram: one series of bucket counts, sum and count per label values.
+    """
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple = DURATION_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # label values -> [count per bucket..., count above the last bucket, sum]
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> list[str]:
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for label_values, values in sorted(series.items()):
+            pairs = [f'{k}="{_escape(v)}"' for k, v in zip(self.labels, label_values)]
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), values):
+                cumulative += count
+                bucket_labels = ",".join([*pairs, f'le="{bound}"'])
+                lines.append(f"{self.name}_bucket{{{bucket_labels}}} {cumulative}")
+            suffix = "{" + ",".join(pairs) + "}" if pairs else ""
+            lines.append(f"{self.name}_sum{suffix} {values[-1]}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class _TimedCursor:
+    """
+    Cursor proxy adding fetch time to its statement's record: with SQLite, most of
+    a query runs while rows are stepped, not in execute().
+    """
+
+    def __init__(self, cursor, record: list):
+        self._cursor = cursor
+        self._record = record
+
+    def _timed(self, method, *args):
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            self._record[1] += time.perf_counter() - started
+
+    def fetchone(self):
+        return self._timed(self._cursor.fetchone)
+
+    def fetchmany(self, *args):
+        return self._timed(self._cursor.fetchmany, *args)
+
+    def fetchall(self):
+        return self._timed(self._cursor.fetchall)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self._timed(self._cursor.__next__)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    """
+    sqlite3.Connection proxy recording [sql, seconds] for every statement run in
+    the current app context. Past max_queries the older half is handed to the
+    histograms early, so long-lived background contexts stay bounded.
+    """
+
+    def __init__(self, conn, metrics: "metricsService", max_queries: int = 1000):
+        self.raw_connection = conn
+        self.metrics = metrics
+        self.max_queries = max_queries
+        self.queries: list[list] = []
+        self.executed = 0
+        self.evicted_seconds = 0.0
+
+    def _record(self, sql: str) -> list:
+        if len(self.queries) >= self.max_queries:
+            evicted, self.queries = self.queries[:self.max_queries // 2], self.queries[self.max_queries // 2:]
+            self.evicted_seconds += sum(seconds for _, seconds in evicted)
+            self.metrics.observe_queries(evicted)
+        record = [sql, 0.0]
+        self.queries.append(record)
+        self.executed += 1
+        return record
+
+    def _run(self, method, sql: str, *args):
+        record = self._record(sql)
+        started = time.perf_counter()
+        try:
+            cursor = method(sql, *args)
+        finally:
+            record[1] += time.perf_counter() - started
+        return _TimedCursor(cursor, record)
+
+    def execute(self, sql: str, *args):
+        return self._run(self.raw_connection.execute, sql, *args)
+
+    def executemany(self, sql: str, *args):
+        return self._run(self.raw_connection.executemany, sql, *args)
+
+    def executescript(self, sql: str):
+        return self._run(self.raw_connection.executescript, sql)
+
+    def db_seconds(self) -> float:
+        return self.evicted_seconds + sum(seconds for _, seconds in self.queries)
+
+    def __enter__(self):
+        self.raw_connection.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self.raw_connection.__exit__(*exc)
+
+    def __getattr__(self, name):
+        return getattr(self.raw_connection, name)
+
+
+class metricsService:
+    """
+    Request instrumentation: wraps the pooled SQLite connections of get_db() to
+    count and time statements, times template rendering and OMDB calls, and keeps
+    histograms rendered in the Prometheus text format. Requests slower than
+    slow_request_ms are logged with their statements; with server_timing on,
+    responses carry the per-request breakdown in a Server-Timing header.
+    """
+
+    def __init__(self, slow_request_ms: float = 500, server_timing: bool = False, max_logged_queries: int = 50):
+        self.slow_request_ms = slow_request_ms
+        self.server_timing = server_timing
+        self.max_logged_queries = max_logged_queries
+        self.requests = Histogram(
+            "http_request_duration_seconds", "Time spent handling a request.", ("endpoint", "method", "status")
+        )
+        self.request_db = Histogram(
+            "http_request_db_seconds", "SQLite time of a request, fetches included.", ("endpoint",)
+        )
+        self.request_queries = Histogram(
+            "http_request_queries", "SQLite statements run by a request.", ("endpoint",), COUNT_BUCKETS
+        )
+        self.queries = Histogram(
+            "db_query_duration_seconds", "SQLite statement time, fetches included.", ("statement",), QUERY_BUCKETS
+        )
+        self.templates = Histogram(
+            "template_render_duration_seconds", "Jinja template rendering time.", ("template",)
+        )
+        self.omdb_requests = Histogram(
+            "omdb_request_duration_seconds", "OMDB HTTP lookups, retries and rate limiting included.", ("outcome",)
+        )
+        self.omdb_fetches = Histogram(
+            "omdb_fetch_duration_seconds",
+            "OMDB lookups of one consolidation (path=single) or one batch (path=batch), cache included.",
+            ("path", "source")
+        )
+
+    def init_app(self, app) -> None:
+        app.extensions["sqlite_wrapper"] = lambda conn: InstrumentedConnection(conn, self)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        # Registered after database_service.init_app, so it runs before close_db releases the connection.
+        app.teardown_appcontext(self._teardown)
+        before_render_template.connect(self._before_render, app)
+        template_rendered.connect(self._rendered, app)
+
+    def observe_queries(self, queries: list[list]) -> None:
+        for sql, seconds in queries:
+            self.queries.observe(seconds, _statement(sql))
+
+    def observe_omdb_request(self, seconds: float, outcome: str) -> None:
+        self.omdb_requests.observe(seconds, outcome)
+        self._add_span("omdb", seconds)
+
+    def observe_omdb_fetch(self, seconds: float, path: str, source: str) -> None:
+        """
+        `source` is "cache" when no lookup had to go to OMDB, else "omdb".
+        """
+        self.omdb_fetches.observe(seconds, path, source)
+
+    def _add_span(self, name: str, seconds: float) -> None:
+        # OMDB calls also run in worker threads and background contexts, outside any request.
+        if has_app_context():
+            state = g.get("_metrics")
+            if state is not None:
+                state[name] += seconds
+
+    def _before_request(self) -> None:
+        g._metrics = {'started': time.perf_counter(), 'tpl': 0.0, 'omdb': 0.0, 'renders': []}
+
+    def _before_render(self, sender, template, context, **extra) -> None:
+        state = g.get("_metrics")
+        if state is not None:
+            state['renders'].append(time.perf_counter())
+
+    def _rendered(self, sender, template, context, **extra) -> None:
+        state = g.get("_metrics")
+        if state is None or not state['renders']:
+            return
+        seconds = time.perf_counter() - state['renders'].pop()
+        self.templates.observe(seconds, template.name or "string")
+        # Nested renders are already inside their parent's time.
+        if not state['renders']:
+            state['tpl'] += seconds
+
+    def _after_request(self, response):
+        state = g.pop("_metrics", None)
+        if state is None:
+            return response
+        total = time.perf_counter() - state['started']
+        endpoint = request.endpoint or "none"
+        db = g.get("db")
+        instrumented = isinstance(db, InstrumentedConnection)
+        db_seconds = db.db_seconds() if instrumented else 0.0
+        executed = db.executed if instrumented else 0
+        self.requests.observe(total, endpoint, request.method, str(response.status_code))
+        self.request_db.observe(db_seconds, endpoint)
+        self.request_queries.observe(executed, endpoint)
+        if self.server_timing:
+            response.headers["Server-Timing"] = ", ".join([
+                f'db;dur={db_seconds * 1000:.2f};desc="{executed} queries"',
+                f"tpl;dur={state['tpl'] * 1000:.2f}",
+                f"omdb;dur={state['omdb'] * 1000:.2f}",
+                f"total;dur={total * 1000:.2f}",
+            ])
+        if total * 1000 >= self.slow_request_ms:
+            self._log_slow(total, db_seconds, executed, state, db.queries if instrumented else [])
+        return response
+
+    def _log_slow(self, total: float, db_seconds: float, executed: int, state: dict, queries: list[list]) -> None:
+        lines = [
+            f"Slow request {request.method} {request.full_path.rstrip('?')}: {total * 1000:.1f} ms "
+            f"(db {db_seconds * 1000:.1f} ms in {executed} queries, templates {state['tpl'] * 1000:.1f} ms, "
+            f"omdb {state['omdb'] * 1000:.1f} ms)"
+        ]
+        for sql, seconds in queries[:self.max_logged_queries]:
+            lines.append(f"  {seconds * 1000:8.2f} ms  {_short_sql(sql)}")
+        if len(queries) > self.max_logged_queries:
+            lines.append(f"  ... {len(queries) - self.max_logged_queries} more")
+        current_app.logger.warning("\n".join(lines))
+
+    def _teardown(self, e=None) -> None:
+        db = g.get("db")
+        if isinstance(db, InstrumentedConnection):
+            self.observe_queries(db.queries)
+            db.queries = []
+
+    def render(self) -> str:
+        histograms = (self.requests, self.request_db, self.request_queries, self.queries, self.templates,
+                      self.omdb_requests, self.omdb_fetches)
+        return "\n".join(line for h in histograms for line in h.render()) + "\n"
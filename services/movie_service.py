@@ -1,13 +1,60 @@
-import csv
+import re
+import time
 import requests
+from typing import Iterator
 from datetime import datetime
 from services.database_service import get_db
-from models.movie import movie
+from services.omdb_client import OmdbClient, parse_omdb_payload
+from services.omdb_cache import OmdbCache
+from services.pagination import keyset_window, build_page
+from services.ingestion_service import CsvSource, create_ingestion_table, ingest_csv
+from services.stats_service import get_counters
+from services.facet_service import filter_clause
+from services.fuzzy_search import TrigramIndex
+from models.movie import (
+    movie, row_to_movie, MOVIE_FIELDS, MOVIE_SUMMARY_FIELDS
+)
+
+FTS_COLUMNS = ("title", "director", "cast", "description", "listed_in")
+# bm25 weights, in FTS_COLUMNS order: a title match outranks a synopsis match.
+FTS_WEIGHTS = (10.0, 4.0, 2.0, 1.0, 1.0)
+FTS_TOKEN = re.compile(r"\w+", re.UNICODE)
+# From FTS hits to their movies rows, through the docids of movies_fts_ids.
+FTS_JOIN = "JOIN movies_fts_ids f ON f.docid = movies_fts.rowid JOIN movies m ON m.show_id = f.show_id"
+# The admin table only renders these; other fields load lazily on access.
+SUMMARY_COLUMNS = ", ".join(f"m.{c}" for c in MOVIE_SUMMARY_FIELDS)
+
+
+def _netflix_title_row(row: dict) -> tuple | None:
+    if not row.get('show_id') or not row.get('title'):
+        return None
+    release_year = int(row['release_year']) if row['release_year'] and row['release_year'].isdigit() else None
+    return (
+        row['show_id'], row['type'], row['title'],
+        row['director'] or None, row['cast'] or None, row['country'] or None,
+        row['date_added'] or None, release_year, row['rating'] or None,
+        row['duration'] or None, row['listed_in'] or None, row['description'] or None
+    )
+
+
+NETFLIX_TITLES = CsvSource(
+    name="netflix_titles",
+    table="movies",
+    columns=("show_id", "type", "title", "director", "cast", "country",
+             "date_added", "release_year", "rating", "duration", "listed_in", "description"),
+    key=("show_id",),
+    transform=_netflix_title_row,
+)
 
 class movieService:
-    def __init__(self, omdb_api_key: str):
+    def __init__(self, omdb_api_key: str, base_omdb_url: str = "http://www.omdbapi.com/",
+                 omdb_rate_limit: float = 5.0, omdb_cache: OmdbCache | None = None, metrics=None):
         self.omdb_api_key = omdb_api_key
-        self.base_omdb_url = "http://www.omdbapi.com/"
+        self.base_omdb_url = base_omdb_url
+        self.metrics = metrics
+        self.omdb_client = OmdbClient(omdb_api_key, base_omdb_url, rate_per_second=omdb_rate_limit, metrics=metrics)
+        self.omdb_cache = omdb_cache or OmdbCache()
+        self.fuzzy_index = TrigramIndex()
     
     def create_movie_table(self) -> None:
         db = get_db()
@@ -22,79 +69,109 @@ class movieService:
             omdb_data_available INTEGER DEFAULT 0, omdb_last_attempt TEXT
         )
         """)
+        db.execute("CREATE INDEX IF NOT EXISTS idx_movies_title_show_id ON movies (title, show_id)")
         db.commit()
-    
-    def seed_movies_from_csv(self, csv_path: str) -> None:
+        self.omdb_cache.create_cache_table()
+        self.create_search_index()
+        create_ingestion_table()
+
+    def create_search_index(self) -> None:
+        # FTS rows are keyed on movies_fts_ids.docid, not on the movies rowid, which VACUUM may renumber.
         db = get_db()
-        with open(csv_path, newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                if not row.get('show_id') or not row.get('title'):
-                    continue
-                
-                release_year = int(row['release_year']) if row['release_year'] and row['release_year'].isdigit() else None
-                
-                db.execute("""
-                    INSERT OR IGNORE INTO movies (
-                        show_id, type, title, director, cast, country,
-                        date_added, release_year, rating, duration, listed_in, description
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    row['show_id'], row['type'], row['title'],
-                    row['director'] or None, row['cast'] or None, row['country'] or None,
-                    row['date_added'] or None, release_year, row['rating'] or None,
-                    row['duration'] or None, row['listed_in'] or None, row['description'] or None
-                ))
+        exists = db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'movies_fts'").fetchone()
+        columns = ", ".join(f'"{c}"' for c in FTS_COLUMNS)
+        new_values = ", ".join(f'new."{c}"' for c in FTS_COLUMNS)
+        docid = "(SELECT docid FROM movies_fts_ids WHERE show_id = {row}.show_id)"
+        db.executescript(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5(
+                {columns}, tokenize = 'unicode61 remove_diacritics 2'
+            );
+            CREATE TABLE IF NOT EXISTS movies_fts_ids (
+                docid INTEGER PRIMARY KEY, show_id TEXT NOT NULL UNIQUE
+            );
+        """)
+        db.execute(
+            "INSERT INTO movies_fts (movies_fts, rank) VALUES ('rank', ?)",
+            (f"bm25({', '.join(str(w) for w in FTS_WEIGHTS)})",)
+        )
+        db.executescript(f"""
+            CREATE TRIGGER IF NOT EXISTS movies_fts_ai AFTER INSERT ON movies BEGIN
+                INSERT INTO movies_fts_ids (show_id) VALUES (new.show_id);
+                INSERT INTO movies_fts (rowid, {columns}) VALUES ({docid.format(row="new")}, {new_values});
+            END;
+            CREATE TRIGGER IF NOT EXISTS movies_fts_ad AFTER DELETE ON movies BEGIN
+                DELETE FROM movies_fts WHERE rowid = {docid.format(row="old")};
+                DELETE FROM movies_fts_ids WHERE show_id = old.show_id;
+            END;
+            CREATE TRIGGER IF NOT EXISTS movies_fts_au AFTER UPDATE OF {columns}, show_id ON movies BEGIN
+                DELETE FROM movies_fts WHERE rowid = {docid.format(row="old")};
+                UPDATE movies_fts_ids SET show_id = new.show_id WHERE show_id = old.show_id;
+                INSERT INTO movies_fts (rowid, {columns}) VALUES ({docid.format(row="new")}, {new_values});
+            END;
+        """)
+        if not exists:
+            self.rebuild_search_index()
+
+    def rebuild_search_index(self) -> None:
+        db = get_db()
+        columns = ", ".join(f'"{c}"' for c in FTS_COLUMNS)
+        values = ", ".join(f'm."{c}"' for c in FTS_COLUMNS)
+        db.execute("DELETE FROM movies_fts")
+        db.execute("DELETE FROM movies_fts_ids")
+        db.execute("INSERT INTO movies_fts_ids (show_id) SELECT show_id FROM movies ORDER BY show_id")
+        db.execute(
+            f"INSERT INTO movies_fts (rowid, {columns}) "
+            f"SELECT f.docid, {values} "
+            f"FROM movies m JOIN movies_fts_ids f ON f.show_id = m.show_id"
+        )
         db.commit()
+
+    @staticmethod
+    def _fts_query(text: str, columns: tuple[str, ...] | None = None) -> str | None:
+        """
+        Turns free user input into an FTS5 expression: every word must match,
+        the last one as a prefix. Returns None when there is nothing to match.
+        """
+        tokens = FTS_TOKEN.findall(text or "")
+        if not tokens:
+            return None
+        terms = [f'"{t}"' for t in tokens[:-1]] + [f'"{tokens[-1]}"*']
+        expression = " ".join(terms)
+        if columns:
+            expression = "{" + " ".join(columns) + "} : (" + expression + ")"
+        return expression
     
-    def fetch_omdb_data(self, title: str, year: int = None) -> dict:
-        params = {'t': title, 'apikey': self.omdb_api_key, 'r': 'json'}
-        if year:
-            params['y'] = year
-        
-        try:
-            response = requests.get(self.base_omdb_url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('Response') == 'True':
-                    return {
-                        'imdb_rating': float(data.get('imdbRating', 0)) if data.get('imdbRating') not in [None, 'N/A'] else None,
-                        'imdb_votes': data.get('imdbVotes', '').replace(',', '') if data.get('imdbVotes') != 'N/A' else None,
-                        'runtime': data.get('Runtime') if data.get('Runtime') != 'N/A' else None,
-                        'genre': data.get('Genre') if data.get('Genre') != 'N/A' else None,
-                        'language': data.get('Language') if data.get('Language') != 'N/A' else None,
-                        'awards': data.get('Awards') if data.get('Awards') != 'N/A' else None,
-                        'box_office': data.get('BoxOffice') if data.get('BoxOffice') != 'N/A' else None,
-                        'poster': data.get('Poster') if data.get('Poster') != 'N/A' else None,
-                        'production': data.get('Production') if data.get('Production') != 'N/A' else None,
-                        'website': data.get('Website') if data.get('Website') != 'N/A' else None,
-                        'success': True
-                    }
-            return {'success': False, 'error': 'Movie not found or API error'}
-        except requests.RequestException as e:
-            return {'success': False, 'error': str(e)}
+    def seed_movies_from_csv(self, csv_path: str, force: bool = False) -> dict:
+        return ingest_csv(NETFLIX_TITLES, csv_path, force=force)
     
-    def consolidate_movie(self, movie_id: str, force_refresh: bool = False) -> tuple[bool, str]:
-        db = get_db()
-        movie_data = db.execute(
-            "SELECT title, release_year, omdb_data_available, omdb_last_attempt FROM movies WHERE show_id = ?",
-            (movie_id,)
-        ).fetchone()
-        
-        if not movie_data:
-            return False, "Movie not found"
-        
-        if not force_refresh:
-            if movie_data['omdb_data_available']:
-                return True, "Already consolidated"
-            if movie_data['omdb_last_attempt']:
-                last_attempt = datetime.strptime(movie_data['omdb_last_attempt'], '%Y-%m-%d %H:%M:%S')
-                if (datetime.now() - last_attempt).days < 7:
-                    return False, "Attempted recently"
-        
-        omdb_data = self.fetch_omdb_data(movie_data['title'], movie_data['release_year'])
-        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
+    def _observe_fetch(self, started: float, path: str, fetched: bool) -> None:
+        if self.metrics is not None:
+            self.metrics.observe_omdb_fetch(time.perf_counter() - started, path, "omdb" if fetched else "cache")
+
+    def _fetch_omdb(self, title: str, year: int = None) -> dict:
+        started = time.perf_counter()
+        payload = self.omdb_cache.get(title, year)
+        if payload is None:
+            try:
+                payload = self.omdb_client.fetch_payload(title, year)
+            except (requests.RequestException, ValueError) as e:
+                return {'success': False, 'error': str(e)}
+            finally:
+                self._observe_fetch(started, "single", True)
+            self.omdb_cache.put(title, year, payload)
+        else:
+            self._observe_fetch(started, "single", False)
+        return parse_omdb_payload(payload)
+    
+    def _skip_reason(self, movie_data, force_refresh: bool) -> tuple[bool, str] | None:
+        if force_refresh:
+            return None
+        if movie_data['omdb_data_available']:
+            return True, "Already consolidated"
+        # Recent OMDB misses are answered by the negative entries of omdb_cache.
+        return None
+
+    def _store_omdb_result(self, db, movie_id: str, omdb_data: dict, now: str) -> tuple[bool, str]:
         if omdb_data.get('success'):
             db.execute("""
                 UPDATE movies SET imdb_rating = ?, imdb_votes = ?, runtime = ?, genre = ?,
@@ -107,117 +184,312 @@ class movieService:
                 omdb_data.get('box_office'), omdb_data.get('poster'), omdb_data.get('production'),
                 omdb_data.get('website'), now, now, movie_id
             ))
-            db.commit()
             return True, "Consolidation successful"
-        else:
-            if omdb_data.get('error') == 'Movie not found':
-                db.execute("DELETE FROM movies WHERE show_id = ?", (movie_id,))
-                db.commit()
-                return False, "Deleted - OMDB match not found"
-            
-            db.execute("UPDATE movies SET omdb_last_attempt = ? WHERE show_id = ?", (now, movie_id))
+
+        db.execute("UPDATE movies SET omdb_last_attempt = ? WHERE show_id = ?", (now, movie_id))
+        return False, f"OMDB error: {omdb_data.get('error', 'Unknown error')}"
+
+    def consolidate_movie(self, movie_id: str, force_refresh: bool = False) -> tuple[bool, str]:
+        db = get_db()
+        movie_data = db.execute(
+            "SELECT title, release_year, omdb_data_available FROM movies WHERE show_id = ?",
+            (movie_id,)
+        ).fetchone()
+        
+        if not movie_data:
+            return False, "Movie not found"
+        
+        skipped = self._skip_reason(movie_data, force_refresh)
+        if skipped:
+            return skipped
+        
+        omdb_data = self._fetch_omdb(movie_data['title'], movie_data['release_year'])
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        result = self._store_omdb_result(db, movie_id, omdb_data, now)
+        db.commit()
+        return result
+
+    def consolidate_many(self, show_ids: list[str], concurrency: int = 4, batch_size: int = 50,
+                         force_refresh: bool = False) -> dict[str, tuple[bool, str]]:
+        """
+        Consolidates several titles, fetching OMDB concurrently and committing
+        each batch in a single transaction.
+        """
+        db = get_db()
+        results: dict[str, tuple[bool, str]] = {}
+        ids = list(dict.fromkeys(show_ids))
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            placeholders = ", ".join("?" for _ in batch)
+            rows = db.execute(
+                f"SELECT show_id, title, release_year, omdb_data_available "
+                f"FROM movies WHERE show_id IN ({placeholders})",
+                tuple(batch)
+            ).fetchall()
+            found = {r['show_id']: r for r in rows}
+
+            lookups = {}
+            for show_id in batch:
+                row = found.get(show_id)
+                if row is None:
+                    results[show_id] = (False, "Movie not found")
+                    continue
+                skipped = self._skip_reason(row, force_refresh)
+                if skipped:
+                    results[show_id] = skipped
+                else:
+                    lookups[show_id] = (row['title'], row['release_year'])
+
+            started = time.perf_counter()
+            payloads = self.omdb_cache.get_many(lookups)
+            misses = {k: v for k, v in lookups.items() if k not in payloads}
+            fetched = self.omdb_client.fetch_many(misses, concurrency=concurrency)
+            if lookups:
+                self._observe_fetch(started, "batch", bool(misses))
+            fresh = []
+            for show_id, payload in fetched.items():
+                if not isinstance(payload, Exception):
+                    title, year = misses[show_id]
+                    fresh.append((title, year, payload))
+                    payloads[show_id] = payload
+            self.omdb_cache.put_many(fresh)
+
+            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            for show_id in lookups:
+                if show_id in payloads:
+                    omdb_data = parse_omdb_payload(payloads[show_id])
+                else:
+                    omdb_data = {'success': False, 'error': str(fetched[show_id])}
+                results[show_id] = self._store_omdb_result(db, show_id, omdb_data, now)
             db.commit()
-            return False, f"OMDB error: {omdb_data.get('error', 'Unknown error')}"
+        return results
     
-    def search_movies(self, query: str, page: int = 1, page_size: int = 20, consolidate: bool = True) -> tuple[list[movie], bool]:
+    def _to_movies(self, rows: list, consolidate: bool) -> list[movie]:
+        """
+        Maps a listing page to movies. With `consolidate`, titles missing OMDB
+        data are enriched as one batch and only those rows are read back.
+        """
+        if consolidate:
+            pending = [r['show_id'] for r in rows if not r['omdb_data_available']]
+            if pending:
+                self.consolidate_many(pending)
+                placeholders = ", ".join("?" for _ in pending)
+                fresh = {
+                    r['show_id']: r for r in get_db().execute(
+                        "SELECT m.* FROM movies m "
+                        f"WHERE m.show_id IN ({placeholders})",
+                        tuple(pending)
+                    )
+                }
+                # A title deleted meanwhile drops out of the page.
+                rows = [r if r['omdb_data_available'] else fresh.get(r['show_id']) for r in rows]
+        return [row_to_movie(r) for r in rows if r is not None]
+
+    def search_movies(self, query: str, page_size: int = 20, after: str | None = None,
+                      before: str | None = None, consolidate: bool = True,
+                      filters: dict | None = None) -> tuple[list[movie], str | None, str | None]:
         db = get_db()
-        offset = (page - 1) * page_size
-        search_pattern = f"%{query}%"
+        match = self._fts_query(query)
+        if match is None:
+            return [], None, None
         
+        condition, params, order_by, backwards = keyset_window(("score", "show_id"), after, before)
+        facets, facet_params = filter_clause(filters)
         rows = db.execute(
-            "SELECT * FROM movies WHERE title LIKE ? ORDER BY title ASC LIMIT ? OFFSET ?",
-            (search_pattern, page_size, offset)
+            f"SELECT * FROM ("
+            "SELECT m.*, movies_fts.rank AS score "
+            f"FROM movies_fts {FTS_JOIN} "
+            f"WHERE movies_fts MATCH ? AND {facets}"
+            f") WHERE {condition} ORDER BY {order_by} LIMIT ?",
+            (match, *facet_params, *params, page_size + 1)
         ).fetchall()
-        
-        movies = []
-        for r in rows:
-            if consolidate:
-                self.consolidate_movie(r['show_id'])
-                r = db.execute("SELECT * FROM movies WHERE show_id = ?", (r['show_id'],)).fetchone()
-            
-            movies.append(movie(
-                show_id=r['show_id'], type=r['type'], title=r['title'], director=r['director'],
-                cast=r['cast'], country=r['country'], date_added=r['date_added'],
-                release_year=r['release_year'], rating=r['rating'], duration=r['duration'],
-                listed_in=r['listed_in'], description=r['description'],
-                imdb_rating=r['imdb_rating'], imdb_votes=r['imdb_votes'], runtime=r['runtime'],
-                genre=r['genre'], language=r['language'], awards=r['awards'],
-                box_office=r['box_office'], poster=r['poster'], production=r['production'],
-                website=r['website'], last_updated=r['last_updated'],
-                omdb_data_available=bool(r['omdb_data_available'])
-            ))
-        
-        total = db.execute(
-            "SELECT COUNT(*) AS c FROM movies WHERE title LIKE ?",
-            (search_pattern,)
+        rows, next_cursor, prev_cursor = build_page(
+            rows, page_size, backwards, bool(params), lambda r: (r['score'], r['show_id'])
+        )
+        return self._to_movies(rows, consolidate), next_cursor, prev_cursor
+
+    def count_search_results(self, query: str, filters: dict | None = None) -> int:
+        match = self._fts_query(query)
+        if match is None:
+            return 0
+        facets, facet_params = filter_clause(filters)
+        return get_db().execute(
+            f"SELECT COUNT(*) AS c FROM movies_fts {FTS_JOIN} "
+            f"WHERE movies_fts MATCH ? AND {facets}",
+            (match, *facet_params)
         ).fetchone()['c']
-        
-        return movies, (page * page_size) < total
 
-    def get_movies_paginated(self, page: int = 1, page_size: int = 20, consolidate: bool = True) -> tuple[list[movie], bool]:
+    def fuzzy_search_movies(self, query: str, page_size: int = 20,
+                            filters: dict | None = None) -> tuple[list[movie], list[dict]]:
+        """
+        Typo-tolerant fallback for searches with no exact match: titles of the closest
+        titles, people and genres (see TrigramIndex), best match first, as one page.
+        Returns the movies and the matched entries.
+        """
+        matches = self.fuzzy_index.search(query, limit=10)
+        ranked: dict[str, None] = {}
+        for match in matches:
+            # People and genres stand for several titles: take a page's worth of each.
+            for show_id in sorted(match['show_ids'])[:page_size]:
+                ranked.setdefault(show_id)
+        movies = self.get_movies_by_ids(list(ranked), filters)[:page_size]
+        return movies, [{k: v for k, v in m.items() if k != 'show_ids'} for m in matches]
+
+    def get_movies_by_ids(self, show_ids: list[str], filters: dict | None = None) -> list[movie]:
+        """
+        The given titles in the given order, skipping missing ones and those the filters exclude.
+        """
+        if not show_ids:
+            return []
+        facets, facet_params = filter_clause(filters)
+        placeholders = ", ".join("?" for _ in show_ids)
+        rows = get_db().execute(
+            "SELECT m.* FROM movies m "
+            f"WHERE m.show_id IN ({placeholders}) AND {facets}",
+            (*show_ids, *facet_params)
+        ).fetchall()
+        order = {show_id: i for i, show_id in enumerate(show_ids)}
+        return [row_to_movie(r) for r in sorted(rows, key=lambda r: order[r['show_id']])]
+
+    def get_movies_paginated(self, page_size: int = 20, after: str | None = None, before: str | None = None,
+                             consolidate: bool = True,
+                             filters: dict | None = None) -> tuple[list[movie], str | None, str | None]:
         db = get_db()
-        offset = (page - 1) * page_size
-        rows = db.execute("SELECT * FROM movies ORDER BY title ASC LIMIT ? OFFSET ?", (page_size, offset)).fetchall()
-        
-        movies = []
-        for r in rows:
-            if consolidate:
-                self.consolidate_movie(r['show_id'])
-                r = db.execute("SELECT * FROM movies WHERE show_id = ?", (r['show_id'],)).fetchone()
-            
-            movies.append(movie(
-                show_id=r['show_id'], type=r['type'], title=r['title'], director=r['director'],
-                cast=r['cast'], country=r['country'], date_added=r['date_added'],
-                release_year=r['release_year'], rating=r['rating'], duration=r['duration'],
-                listed_in=r['listed_in'], description=r['description'],
-                imdb_rating=r['imdb_rating'], imdb_votes=r['imdb_votes'], runtime=r['runtime'],
-                genre=r['genre'], language=r['language'], awards=r['awards'],
-                box_office=r['box_office'], poster=r['poster'], production=r['production'],
-                website=r['website'], last_updated=r['last_updated'],
-                omdb_data_available=bool(r['omdb_data_available'])
-            ))
-        
-        total = db.execute("SELECT COUNT(*) AS c FROM movies").fetchone()['c']
-        return movies, (page * page_size) < total
+        condition, params, order_by, backwards = keyset_window(("title", "show_id"), after, before)
+        facets, facet_params = filter_clause(filters)
+        rows = db.execute(
+            "SELECT m.* FROM movies m "
+            f"WHERE {condition} AND {facets} ORDER BY {order_by} LIMIT ?",
+            (*params, *facet_params, page_size + 1)
+        ).fetchall()
+        rows, next_cursor, prev_cursor = build_page(
+            rows, page_size, backwards, bool(params), lambda r: (r['title'], r['show_id'])
+        )
+        return self._to_movies(rows, consolidate), next_cursor, prev_cursor
     
+    def has_movies(self) -> bool:
+        return get_db().execute("SELECT 1 FROM movies LIMIT 1").fetchone() is not None
+
     def get_movie_by_id(self, show_id: str) -> movie | None:
-        db = get_db()
         self.consolidate_movie(show_id)
-        row = db.execute("SELECT * FROM movies WHERE show_id = ?", (show_id,)).fetchone()
-        return movie(**{k: row[k] for k in row.keys()}, omdb_data_available=bool(row['omdb_data_available'])) if row else None
+        row = get_db().execute(
+            "SELECT * FROM movies WHERE show_id = ?",
+            (show_id,)
+        ).fetchone()
+        return row_to_movie(row)
     
     def get_consolidation_stats(self) -> dict:
-        db = get_db()
-        stats = db.execute("""
-            SELECT COUNT(*) as total_movies,
-                SUM(omdb_data_available) as consolidated_movies,
-                AVG(CASE WHEN omdb_data_available = 1 THEN 1 ELSE 0 END) * 100 as consolidation_rate,
-                COUNT(CASE WHEN poster IS NOT NULL AND poster != '' THEN 1 END) as movies_with_poster,
-                COUNT(CASE WHEN imdb_rating IS NOT NULL THEN 1 END) as movies_with_imdb_rating
-            FROM movies
-        """).fetchone()
-        return dict(stats)
+        counters = get_counters("movies_total", "movies_consolidated", "movies_with_poster",
+                                "movies_with_imdb_rating")
+        total = counters["movies_total"]
+        return {
+            'total_movies': total,
+            'consolidated_movies': counters["movies_consolidated"],
+            'consolidation_rate': counters["movies_consolidated"] * 100.0 / total if total else 0.0,
+            'movies_with_poster': counters["movies_with_poster"],
+            'movies_with_imdb_rating': counters["movies_with_imdb_rating"],
+        }
 
     # Admin CRUD helpers
-    def list_movies(self, search: str | None, page: int = 1, page_size: int = 20) -> tuple[list[movie], bool]:
+    def list_movies(self, search: str | None, page_size: int = 20, after: str | None = None,
+                    before: str | None = None) -> tuple[list[movie], str | None, str | None]:
         db = get_db()
-        offset = (page - 1) * page_size
-        params = []
-        where = ""
         if search:
-            where = "WHERE title LIKE ? OR director LIKE ? OR cast LIKE ?"
-            like = f"%{search}%"
-            params.extend([like, like, like])
-        rows = db.execute(
-            f"SELECT * FROM movies {where} ORDER BY title ASC LIMIT ? OFFSET ?",
-            (*params, page_size, offset)
-        ).fetchall()
-        movies_list = [
-            movie(**{k: r[k] for k in r.keys()}, omdb_data_available=bool(r['omdb_data_available']))
-            for r in rows
-        ]
-        total = db.execute(f"SELECT COUNT(*) AS c FROM movies {where}", tuple(params)).fetchone()["c"]
-        return movies_list, (page * page_size) < total
+            match = self._fts_query(search, columns=("title", "director", "cast"))
+            if match is None:
+                return [], None, None
+            condition, params, order_by, backwards = keyset_window(("score", "show_id"), after, before)
+            rows = db.execute(
+                f"SELECT * FROM ("
+                f"SELECT {SUMMARY_COLUMNS}, movies_fts.rank AS score "
+                f"FROM movies_fts {FTS_JOIN} "
+                f"WHERE movies_fts MATCH ?"
+                f") WHERE {condition} ORDER BY {order_by} LIMIT ?",
+                (match, *params, page_size + 1)
+            ).fetchall()
+            key = lambda r: (r['score'], r['show_id'])
+        else:
+            condition, params, order_by, backwards = keyset_window(("title", "show_id"), after, before)
+            rows = db.execute(
+                f"SELECT {SUMMARY_COLUMNS} FROM movies m "
+                f"WHERE {condition} ORDER BY {order_by} LIMIT ?",
+                (*params, page_size + 1)
+            ).fetchall()
+            key = lambda r: (r['title'], r['show_id'])
+        rows, next_cursor, prev_cursor = build_page(rows, page_size, backwards, bool(params), key)
+        return [row_to_movie(r) for r in rows], next_cursor, prev_cursor
+
+    # API helpers: plain dicts, only the requested columns
+    @staticmethod
+    def _projection(fields: tuple[str, ...] | None) -> tuple[tuple[str, ...], str]:
+        """
+        Validates `fields` against MOVIE_FIELDS and returns (fields, select list).
+        Raises ValueError on unknown fields.
+        """
+        fields = tuple(dict.fromkeys(fields)) if fields else MOVIE_FIELDS
+        unknown = [f for f in fields if f not in MOVIE_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return fields, ", ".join(f'm."{f}"' for f in fields)
+
+    @staticmethod
+    def _row_to_dict(row, fields: tuple[str, ...]) -> dict:
+        item = {f: row[f] for f in fields}
+        if "omdb_data_available" in item:
+            item["omdb_data_available"] = bool(item["omdb_data_available"])
+        return item
+
+    def query_movies(self, fields: tuple[str, ...] | None = None, search: str | None = None,
+                     page_size: int = 50, after: str | None = None, before: str | None = None,
+                     filters: dict | None = None) -> tuple[list[dict], str | None, str | None]:
+        fields, columns = self._projection(fields)
+        facets, facet_params = filter_clause(filters)
+        db = get_db()
+        if search:
+            match = self._fts_query(search)
+            if match is None:
+                return [], None, None
+            condition, params, order_by, backwards = keyset_window(("_score", "_show_id"), after, before)
+            rows = db.execute(
+                f"SELECT * FROM ("
+                f"SELECT {columns}, movies_fts.rank AS _score, m.show_id AS _show_id "
+                f"FROM movies_fts {FTS_JOIN} "
+                f"WHERE movies_fts MATCH ? AND {facets}"
+                f") WHERE {condition} ORDER BY {order_by} LIMIT ?",
+                (match, *facet_params, *params, page_size + 1)
+            ).fetchall()
+            key = lambda r: (r['_score'], r['_show_id'])
+        else:
+            condition, params, order_by, backwards = keyset_window(("m.title", "m.show_id"), after, before)
+            rows = db.execute(
+                f"SELECT {columns}, m.title AS _title, m.show_id AS _show_id FROM movies m "
+                f"WHERE {condition} AND {facets} ORDER BY {order_by} LIMIT ?",
+                (*params, *facet_params, page_size + 1)
+            ).fetchall()
+            key = lambda r: (r['_title'], r['_show_id'])
+        rows, next_cursor, prev_cursor = build_page(rows, page_size, backwards, bool(params), key)
+        return [self._row_to_dict(r, fields) for r in rows], next_cursor, prev_cursor
+
+    def get_movie_fields(self, show_id: str, fields: tuple[str, ...] | None = None) -> dict | None:
+        fields, columns = self._projection(fields)
+        row = get_db().execute(f"SELECT {columns} FROM movies m WHERE m.show_id = ?", (show_id,)).fetchone()
+        return self._row_to_dict(row, fields) if row else None
+
+    def iter_movies(self, fields: tuple[str, ...] | None = None, batch_size: int = 500) -> Iterator[dict]:
+        """
+        Yields the whole catalog in show_id order, holding one fetchmany() batch at a time.
+        """
+        fields, columns = self._projection(fields)
+        cursor = get_db().execute(f"SELECT {columns} FROM movies m ORDER BY m.show_id")
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                for row in rows:
+                    yield self._row_to_dict(row, fields)
+        finally:
+            cursor.close()
 
     def create_movie(self, data: dict) -> None:
         db = get_db()
@@ -232,6 +504,7 @@ class movieService:
             data.get("rating"), data.get("duration"), data.get("listed_in"), data.get("description")
         ))
         db.commit()
+        self.fuzzy_index.refresh([data.get("show_id")])
 
     def update_movie(self, show_id: str, updates: dict) -> None:
         if not updates:
@@ -246,11 +519,19 @@ class movieService:
                 values.append(updates[key])
         if not fields:
             return
+        # A new title or year needs a new OMDB match; omdb_cache makes known ones free.
+        identity = [k for k in ("title", "release_year") if updates.get(k) is not None]
+        if identity:
+            unchanged = " AND ".join(f"{k} IS ?" for k in identity)
+            fields.append(f"omdb_data_available = CASE WHEN {unchanged} THEN omdb_data_available ELSE 0 END")
+            values.extend(updates[k] for k in identity)
         values.append(show_id)
         db.execute(f"UPDATE movies SET {', '.join(fields)} WHERE show_id = ?", tuple(values))
         db.commit()
+        self.fuzzy_index.refresh([show_id])
 
     def delete_movie(self, show_id: str) -> None:
         db = get_db()
         db.execute("DELETE FROM movies WHERE show_id = ?", (show_id,))
-        db.commit()
\ No newline at end of file
+        db.commit()
+        self.fuzzy_index.refresh([show_id])
\ No newline at end of file
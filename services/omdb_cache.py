@@ -0,0 +1,183 @@
+import json
+import threading
+import time
+import unicodedata
+from services.database_service import get_db
+
+DAY = 86400
+# OMDB's answers for titles it does not have. Other errors ("Error getting data.", "Request
+# limit reached!", ...) are transient and not cached, so the next lookup asks again.
+NOT_FOUND_ERRORS = frozenset(("Movie not found!", "Series or episode not found!"))
+
+
+def normalize_title(title: str) -> str:
+    decomposed = unicodedata.normalize('NFKD', title or '')
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(stripped.casefold().split())
+
+
+class OmdbCache:
+    """
+    Raw OMDB responses stored in SQLite, keyed by normalized (title, year).
+    Found and not-found answers expire separately; the least recently used
+    entries are evicted past `max_entries`. Reads do not write: their access
+    times and hit counts are kept in memory and flushed with the next eviction,
+    or once `touch_batch` entries are pending. Writes are left to the caller's
+    transaction.
+    """
+
+    def __init__(self, hit_ttl: float = 30 * DAY, miss_ttl: float = 7 * DAY,
+                 max_entries: int = 50000, evict_every: int = 100, touch_batch: int = 500):
+        self.hit_ttl = hit_ttl
+        self.miss_ttl = miss_ttl
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self.touch_batch = touch_batch
+        self._lock = threading.Lock()
+        self._puts_since_evict = 0
+        # (title_key, year) -> [last access, hits since the last flush]
+        self._touches: dict[tuple[str, int], list] = {}
+        self.counters = {'hits': 0, 'negative_hits': 0, 'misses': 0, 'expired': 0, 'stores': 0, 'evictions': 0}
+
+    def create_cache_table(self) -> None:
+        db = get_db()
+        db.execute("""
+        CREATE TABLE IF NOT EXISTS omdb_cache (
+            title_key TEXT NOT NULL, year INTEGER NOT NULL DEFAULT 0,
+            found INTEGER NOT NULL, payload TEXT NOT NULL,
+            fetched_at REAL NOT NULL, expires_at REAL NOT NULL,
+            last_access REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (title_key, year)
+        )
+        """)
+        db.execute("CREATE INDEX IF NOT EXISTS idx_omdb_cache_last_access ON omdb_cache (last_access)")
+        db.commit()
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += n
+
+    def get(self, title: str, year: int | None) -> dict | None:
+        return self.get_many({None: (title, year)}).get(None)
+
+    def get_many(self, lookups: dict) -> dict:
+        """
+        Returns {key: payload} for the (title, year) lookups still fresh in the cache.
+        """
+        if not lookups:
+            return {}
+        db = get_db()
+        now = time.time()
+        wanted = {key: (normalize_title(title), year or 0) for key, (title, year) in lookups.items()}
+        found = {}
+        for title_key, year in set(wanted.values()):
+            row = db.execute(
+                "SELECT found, payload, expires_at FROM omdb_cache WHERE title_key = ? AND year = ?",
+                (title_key, year)
+            ).fetchone()
+            if row is None:
+                continue
+            if row['expires_at'] <= now:
+                self._count('expired')
+                continue
+            found[(title_key, year)] = row
+
+        if found:
+            with self._lock:
+                for cache_key in found:
+                    touch = self._touches.setdefault(cache_key, [now, 0])
+                    touch[0] = now
+                    touch[1] += 1
+                due = len(self._touches) >= self.touch_batch
+            if due:
+                self.flush_touches()
+
+        payloads = {}
+        for key, cache_key in wanted.items():
+            row = found.get(cache_key)
+            if row is None:
+                self._count('misses')
+                continue
+            self._count('hits' if row['found'] else 'negative_hits')
+            payloads[key] = json.loads(row['payload'])
+        return payloads
+
+    def put(self, title: str, year: int | None, payload: dict) -> None:
+        self.put_many([(title, year, payload)])
+
+    def flush_touches(self) -> None:
+        """
+        Writes the pending access times and hit counts.
+        """
+        with self._lock:
+            touches, self._touches = self._touches, {}
+        if touches:
+            get_db().executemany(
+                "UPDATE omdb_cache SET last_access = MAX(last_access, ?), hits = hits + ? "
+                "WHERE title_key = ? AND year = ?",
+                [(last_access, hits, title_key, year) for (title_key, year), (last_access, hits) in touches.items()]
+            )
+
+    def put_many(self, entries: list[tuple[str, int | None, dict]]) -> None:
+        """
+        Stores found answers and definite not-found ones; transient errors are skipped.
+        """
+        db = get_db()
+        now = time.time()
+        rows = []
+        for title, year, payload in entries:
+            found = payload.get('Response') == 'True'
+            if not found and payload.get('Error') not in NOT_FOUND_ERRORS:
+                continue
+            ttl = self.hit_ttl if found else self.miss_ttl
+            rows.append((normalize_title(title), year or 0, int(found), json.dumps(payload), now, now + ttl, now))
+        if not rows:
+            return
+        db.executemany("""
+            INSERT INTO omdb_cache (title_key, year, found, payload, fetched_at, expires_at, last_access)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(title_key, year) DO UPDATE SET
+                found = excluded.found, payload = excluded.payload, fetched_at = excluded.fetched_at,
+                expires_at = excluded.expires_at, last_access = excluded.last_access
+        """, rows)
+        self._count('stores', len(rows))
+        with self._lock:
+            self._puts_since_evict += len(rows)
+            due = self._puts_since_evict >= self.evict_every
+            if due:
+                self._puts_since_evict = 0
+        if due:
+            self.evict()
+
+    def evict(self) -> int:
+        db = get_db()
+        self.flush_touches()  # the LRU order depends on them
+        db.execute("DELETE FROM omdb_cache WHERE expires_at <= ?", (time.time(),))
+        expired = db.execute("SELECT changes() AS c").fetchone()['c']
+        total = db.execute("SELECT COUNT(*) AS c FROM omdb_cache").fetchone()['c']
+        overflow = max(0, total - self.max_entries)
+        if overflow:
+            db.execute("""
+                DELETE FROM omdb_cache WHERE rowid IN (
+                    SELECT rowid FROM omdb_cache ORDER BY last_access ASC LIMIT ?
+                )
+            """, (overflow,))
+        self._count('evictions', expired + overflow)
+        return expired + overflow
+
+    def get_stats(self) -> dict:
+        db = get_db()
+        row = db.execute("""
+            SELECT COUNT(*) AS entries, COALESCE(SUM(found), 0) AS found_entries,
+                COALESCE(SUM(hits), 0) AS lifetime_hits
+            FROM omdb_cache
+        """).fetchone()
+        with self._lock:
+            stats = dict(self.counters)
+            pending_hits = sum(hits for _, hits in self._touches.values())
+        lookups = stats['hits'] + stats['negative_hits'] + stats['misses']
+        stats['hit_ratio'] = (stats['hits'] + stats['negative_hits']) / lookups if lookups else 0.0
+        stats.update(dict(row))
+        stats['lifetime_hits'] += pending_hits
+        stats['max_entries'] = self.max_entries
+        return stats
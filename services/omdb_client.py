@@ -0,0 +1,143 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class _RateLimiter:
+    """
+    Token bucket shared by every thread talking to the same host.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int):
+        self.rate = rate_per_second
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            # Reserve the token now so concurrent callers queue up behind us.
+            self._tokens -= 1
+        if wait > 0:
+            time.sleep(wait)
+
+
+_limiters: dict[str, _RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _limiter_for(url: str, rate_per_second: float) -> _RateLimiter:
+    host = urlsplit(url).netloc
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = _RateLimiter(rate_per_second, burst=max(1, int(rate_per_second)))
+            _limiters[host] = limiter
+        return limiter
+
+
+def parse_omdb_payload(data: dict) -> dict:
+    if data.get('Response') == 'True':
+        return {
+            'imdb_rating': float(data.get('imdbRating', 0)) if data.get('imdbRating') not in [None, 'N/A'] else None,
+            'imdb_votes': data.get('imdbVotes', '').replace(',', '') if data.get('imdbVotes') != 'N/A' else None,
+            'runtime': data.get('Runtime') if data.get('Runtime') != 'N/A' else None,
+            'genre': data.get('Genre') if data.get('Genre') != 'N/A' else None,
+            'language': data.get('Language') if data.get('Language') != 'N/A' else None,
+            'awards': data.get('Awards') if data.get('Awards') != 'N/A' else None,
+            'box_office': data.get('BoxOffice') if data.get('BoxOffice') != 'N/A' else None,
+            'poster': data.get('Poster') if data.get('Poster') != 'N/A' else None,
+            'production': data.get('Production') if data.get('Production') != 'N/A' else None,
+            'website': data.get('Website') if data.get('Website') != 'N/A' else None,
+            'success': True
+        }
+    return {'success': False, 'error': 'Movie not found or API error'}
+
+
+class OmdbClient:
+    """
+    OMDB HTTP client reusing pooled connections, with per-host rate limiting
+    and jittered exponential backoff on transient failures.
+    """
+
+    def __init__(self, api_key: str, base_url: str = "http://www.omdbapi.com/", timeout: float = 10,
+                 max_retries: int = 3, backoff_base: float = 0.5, rate_per_second: float = 5.0,
+                 pool_size: int = 10, metrics=None):
+        self.api_key = api_key
+        self.metrics = metrics
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.limiter = _limiter_for(base_url, rate_per_second)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def fetch_payload(self, title: str, year: int = None) -> dict:
+        """
+        Returns the raw OMDB JSON document. Raises requests.RequestException
+        once retries are exhausted.
+        """
+        if self.metrics is None:
+            return self._fetch_payload(title, year)
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            payload = self._fetch_payload(title, year)
+            outcome = "ok"
+            return payload
+        finally:
+            self.metrics.observe_omdb_request(time.perf_counter() - started, outcome)
+
+    def _fetch_payload(self, title: str, year: int = None) -> dict:
+        params = {'t': title, 'apikey': self.api_key, 'r': 'json'}
+        if year:
+            params['y'] = year
+
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            try:
+                response = self.session.get(self.base_url, params=params, timeout=self.timeout)
+                if response.status_code not in RETRYABLE_STATUS:
+                    response.raise_for_status()
+                    return response.json()
+                error = requests.HTTPError(f"{response.status_code} Error for url: {self.base_url}", response=response)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            if attempt >= self.max_retries:
+                raise error
+            # Full jitter: spreads retries of concurrent callers over the window.
+            time.sleep(random.uniform(0, self.backoff_base * (2 ** attempt)))
+            attempt += 1
+
+    def fetch_many(self, lookups: dict[str, tuple[str, int | None]], concurrency: int = 4) -> dict[str, dict | Exception]:
+        """
+        Fetches {key: (title, year)} with at most `concurrency` requests in flight.
+        Each key maps to the raw payload, or to the exception that ended its retries.
+        """
+        if not lookups:
+            return {}
+
+        def fetch_one(title, year):
+            try:
+                return self.fetch_payload(title, year)
+            except (requests.RequestException, ValueError) as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(lookups)))) as executor:
+            futures = {key: executor.submit(fetch_one, title, year) for key, (title, year) in lookups.items()}
+            return {key: future.result() for key, future in futures.items()}
@@ -0,0 +1,168 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+from services.cache import LruCache
+from services.database_service import get_db
+
+
+class MemoryPageBackend:
+    """
+    Per-process LRU; entries are tagged with the catalog version they were rendered from.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 512, ttl: float = 3600):
+        self.cache = LruCache(max_entries=max_entries, ttl=ttl)
+
+    def get(self, key: str, version: int) -> Any | None:
+        entry = self.cache.get(key)
+        if entry is None or entry[0] != version:
+            return None
+        return entry[1]
+
+    def put(self, key: str, version: int, value: Any) -> None:
+        self.cache.put(key, (version, value))
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    def size(self) -> int:
+        return self.cache.get_stats()['entries']
+
+
+class SqlitePageBackend:
+    """
+    page_cache table in the application database, shared by every worker process
+    using the same file. Values must be JSON-serializable.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, max_entries: int = 2000, ttl: float = 3600, trim_every: int = 50):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.trim_every = trim_every
+        self._puts = 0
+        self._lock = threading.Lock()
+
+    def create_table(self) -> None:
+        db = get_db()
+        db.execute("""
+        CREATE TABLE IF NOT EXISTS page_cache (
+            key TEXT PRIMARY KEY, version INTEGER NOT NULL,
+            value TEXT NOT NULL, expires_at REAL NOT NULL
+        )
+        """)
+        db.execute("CREATE INDEX IF NOT EXISTS idx_page_cache_expires_at ON page_cache (expires_at)")
+        db.commit()
+
+    def get(self, key: str, version: int) -> Any | None:
+        row = get_db().execute(
+            "SELECT value FROM page_cache WHERE key = ? AND version = ? AND expires_at > ?",
+            (key, version, time.time())
+        ).fetchone()
+        return json.loads(row['value']) if row else None
+
+    def put(self, key: str, version: int, value: Any) -> None:
+        db = get_db()
+        db.execute("""
+            INSERT INTO page_cache (key, version, value, expires_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET version = excluded.version, value = excluded.value,
+                expires_at = excluded.expires_at
+        """, (key, version, json.dumps(value, separators=(',', ':')), time.time() + self.ttl))
+        with self._lock:
+            self._puts += 1
+            trim = self._puts % self.trim_every == 0
+        if trim:
+            # Drop entries rendered from older catalogs, then the soonest-expiring overflow.
+            db.execute("DELETE FROM page_cache WHERE version < ? OR expires_at <= ?", (version, time.time()))
+            db.execute("""
+                DELETE FROM page_cache WHERE key IN (
+                    SELECT key FROM page_cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+        db.commit()
+
+    def clear(self) -> None:
+        db = get_db()
+        db.execute("DELETE FROM page_cache")
+        db.commit()
+
+    def size(self) -> int:
+        return get_db().execute("SELECT COUNT(*) AS c FROM page_cache").fetchone()['c']
+
+
+class PageCache:
+    """
+    Caches rendered page fragments by key and catalog version, so a catalog write
+    makes every older entry unreachable. Hits and misses are tracked per key
+    (bounded to the `track_keys` most recent) to size the cache.
+    """
+
+    def __init__(self, backend=None, track_keys: int = 200):
+        self.backend = backend
+        self.track_keys = track_keys
+        self._lock = threading.Lock()
+        self._key_stats: OrderedDict[str, list[int]] = OrderedDict()
+        self.hits = self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def _record(self, key: str, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            stats = self._key_stats.pop(key, None) or [0, 0]
+            stats[0 if hit else 1] += 1
+            self._key_stats[key] = stats
+            while len(self._key_stats) > self.track_keys:
+                self._key_stats.popitem(last=False)
+
+    def get(self, key: str, version: int) -> Any | None:
+        if not self.enabled:
+            return None
+        value = self.backend.get(key, version)
+        self._record(key, value is not None)
+        return value
+
+    def put(self, key: str, version: int, value: Any) -> None:
+        if self.enabled:
+            self.backend.put(key, version, value)
+
+    def invalidate(self) -> None:
+        if self.enabled:
+            self.backend.clear()
+
+    def get_stats(self, top: int = 20) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            keys = sorted(self._key_stats.items(), key=lambda kv: kv[1][0] + kv[1][1], reverse=True)[:top]
+            hits, misses = self.hits, self.misses
+        return {
+            'backend': self.backend.name if self.enabled else 'disabled',
+            'entries': self.backend.size() if self.enabled else 0,
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / lookups if lookups else None,
+            'keys': [
+                {'key': k, 'hits': h, 'misses': m, 'hit_ratio': h / (h + m)}
+                for k, (h, m) in keys
+            ],
+        }
+
+
+def create_page_cache(backend: str = "memory", max_entries: int = 512, ttl: float = 3600) -> PageCache:
+    if backend == "sqlite":
+        sqlite_backend = SqlitePageBackend(max_entries=max_entries, ttl=ttl)
+        sqlite_backend.create_table()
+        return PageCache(sqlite_backend)
+    if backend == "memory":
+        return PageCache(MemoryPageBackend(max_entries=max_entries, ttl=ttl))
+    return PageCache(None)
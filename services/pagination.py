@@ -0,0 +1,70 @@
+import base64
+import json
+from typing import Any, Callable, Sequence
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(list(values), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str | None, size: int) -> list | None:
+    """
+    Returns the key values of an opaque cursor, or None when it is missing or malformed.
+    """
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(values, list) or len(values) != size:
+        return None
+    # Values are bound as SQL parameters: anything but a scalar would fail in sqlite3.
+    if any(isinstance(v, bool) or not isinstance(v, (str, int, float, type(None))) for v in values):
+        return None
+    return values
+
+
+def keyset_window(key_columns: Sequence[str], after: str | None = None, before: str | None = None,
+                  descending: bool = False) -> tuple[str, list, str, bool]:
+    """
+    Builds the keyset predicate for a listing ordered by `key_columns`.
+    Returns (condition, params, order_by, backwards); fetch with LIMIT page_size + 1
+    and hand the rows to build_page().
+    """
+    columns = ", ".join(key_columns)
+    placeholders = ", ".join("?" for _ in key_columns)
+    direction = "DESC" if descending else "ASC"
+    reverse = "ASC" if descending else "DESC"
+
+    before_values = decode_cursor(before, len(key_columns))
+    if before_values is not None:
+        op = ">" if descending else "<"
+        order_by = ", ".join(f"{c} {reverse}" for c in key_columns)
+        return f"({columns}) {op} ({placeholders})", before_values, order_by, True
+
+    order_by = ", ".join(f"{c} {direction}" for c in key_columns)
+    after_values = decode_cursor(after, len(key_columns))
+    if after_values is not None:
+        op = "<" if descending else ">"
+        return f"({columns}) {op} ({placeholders})", after_values, order_by, False
+    return "1 = 1", [], order_by, False
+
+
+def build_page(rows: list, page_size: int, backwards: bool, has_cursor: bool,
+               cursor_of: Callable[[Any], Sequence[Any]]) -> tuple[list, str | None, str | None]:
+    """
+    Trims the page_size + 1 probe row and returns (rows, next_cursor, prev_cursor).
+    """
+    more = len(rows) > page_size
+    rows = list(rows[:page_size])
+    if not rows:
+        return rows, None, None
+    if backwards:
+        rows.reverse()
+        return rows, encode_cursor(cursor_of(rows[-1])), (encode_cursor(cursor_of(rows[0])) if more else None)
+    next_cursor = encode_cursor(cursor_of(rows[-1])) if more else None
+    prev_cursor = encode_cursor(cursor_of(rows[0])) if has_cursor else None
+    return rows, next_cursor, prev_cursor
@@ -0,0 +1,122 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from functools import cached_property
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class HashingBusy(Exception):
+    """
+    Raised when every hashing slot is taken for longer than the caller may wait.
+    """
+
+
+class PasswordHasher:
+    """
+    Runs werkzeug's password hashing in a small process pool so key stretching
+    neither holds the GIL nor blocks request threads. At most `max_pending`
+    hashes are queued or running; callers beyond that wait up to `queue_timeout`
+    seconds and then get HashingBusy. With workers=0 hashing runs inline.
+    """
+
+    def __init__(self, method: str = "scrypt", workers: int = 2, max_pending: int = 8,
+                 queue_timeout: float = 2.0, timeout: float = 10.0):
+        self.method = method
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        # fork rather than spawn: spawned children re-import __main__, i.e. app.py. Only the
+        # first pool forks, from start(), before the app runs threads; see _discard_pool().
+        self._start_method = "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+
+    @cached_property
+    def prefix(self) -> str:
+        # werkzeug expands "scrypt" to "scrypt:32768:8:1"; hashes made with anything else are outdated.
+        return generate_password_hash("", method=self.method, salt_length=1).split("$", 1)[0]
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context(self._start_method)
+                )
+            return self._executor
+
+    def start(self) -> None:
+        """
+        Starts the worker processes now, while the app has no other threads to fork.
+        """
+        if self.workers > 0:
+            self._pool().submit(int).result()
+
+    def _discard_pool(self, executor: ProcessPoolExecutor) -> None:
+        """
+        Drops a broken pool so the next call starts fresh workers. Request and
+        background threads are running by now and forking them could copy a held
+        lock into the children, so replacement pools use forkserver (or spawn).
+        """
+        with self._executor_lock:
+            if self._executor is executor:
+                self._executor = None
+                methods = multiprocessing.get_all_start_methods()
+                self._start_method = "forkserver" if "forkserver" in methods else "spawn"
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise HashingBusy("password hashing queue is full")
+        executor = self._pool()
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._slots.release()
+            self._discard_pool(executor)
+            raise HashingBusy("password hashing workers died") from None
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot stays taken until the job ends, even when the caller gives up waiting.
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            raise HashingBusy("password hashing timed out") from None
+        except BrokenProcessPool:
+            self._discard_pool(executor)
+            raise HashingBusy("password hashing workers died") from None
+
+    def hash(self, password: str) -> str:
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, stored_hash: str, password: str) -> bool:
+        return self._run(check_password_hash, stored_hash, password)
+
+    def needs_rehash(self, stored_hash: str) -> bool:
+        return stored_hash.split("$", 1)[0] != self.prefix
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+_hasher = PasswordHasher(workers=0)
+
+
+def configure_password_hasher(**options) -> PasswordHasher:
+    global _hasher
+    _hasher.shutdown()
+    _hasher = PasswordHasher(**options)
+    _hasher.start()
+    return _hasher
+
+
+def get_password_hasher() -> PasswordHasher:
+    return _hasher
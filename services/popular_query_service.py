@@ -0,0 +1,152 @@
+import threading
+import time
+from datetime import datetime, timezone
+from services.background import BackgroundLoop
+from services.database_service import get_db
+from services.stats_service import get_text_version
+
+
+class popularQueryService:
+    """
+    Warm cache for the most frequent searches in search_logs: a background thread
+    precomputes the show_ids, cursors and total count of their first /movies page.
+    Which titles match and in what order only depends on the text columns, so
+    entries are tagged with the text version (see stats_service.TEXT_COLUMNS) and
+    OMDB enrichment does not cool them; the caller loads the rows themselves, with
+    their current OMDB fields. get() answers from memory only; an entry built for
+    another text version is never served.
+    """
+
+    def __init__(self, app, movie_service, top_n: int = 50, page_size: int = 20,
+                 window_days: int | None = None, refresh_interval: float = 5.0, mine_interval: float = 600.0):
+        self.app = app
+        self.movie_service = movie_service
+        self.top_n = top_n
+        self.page_size = page_size
+        self.window_days = window_days
+        self.refresh_interval = refresh_interval
+        self.mine_interval = mine_interval
+        # (text version, key -> entry), swapped as one reference.
+        self._state: tuple[int | None, dict[str, dict]] = (None, {})
+        self._queries: list[tuple[str, int]] = []
+        self._query_hits: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._loop = BackgroundLoop(app, "popular-queries", self._check, refresh_interval)
+        self._mined_at = 0.0
+        self.lookups = self.hits = self.stale = self.refreshes = 0
+        self.logged_searches = self.covered_searches = 0
+        self.last_refresh_ms: float | None = None
+        self.last_refresh_at: str | None = None
+
+    @staticmethod
+    def key(query: str) -> str:
+        """
+        FTS matching ignores case and extra spaces, so the cache does too.
+        """
+        return " ".join((query or "").lower().split())
+
+    def mine(self) -> list[tuple[str, int]]:
+        """
+        The top_n distinct queries of search_logs with their search counts; also
+        records how many logged searches they account for.
+        """
+        window, params = "", []
+        if self.window_days:
+            window, params = "WHERE search_date >= date('now', ?)", [f"-{self.window_days} days"]
+        db = get_db()
+        rows = db.execute(
+            f"SELECT lower(trim(search_query)) AS q, COUNT(*) AS c FROM search_logs {window} "
+            f"GROUP BY q HAVING q != '' ORDER BY c DESC, q LIMIT ?",
+            (*params, self.top_n)
+        ).fetchall()
+        total = db.execute(f"SELECT COUNT(*) AS c FROM search_logs {window}", params).fetchone()['c']
+        queries = [(r['q'], r['c']) for r in rows]
+        with self._lock:
+            self._queries = queries
+            self.logged_searches = total
+            self.covered_searches = sum(c for _, c in queries)
+        self._mined_at = time.monotonic()
+        return queries
+
+    def refresh(self) -> dict:
+        """
+        Recomputes every mined query for the current text version.
+        """
+        started = time.perf_counter()
+        if time.monotonic() - self._mined_at >= self.mine_interval or not self._queries:
+            self.mine()
+        # Read first: rows written meanwhile land in entries tagged with the older version, never the reverse.
+        version = get_text_version()
+        entries = {}
+        for query, _ in self._queries:
+            key = self.key(query)
+            if not key or key in entries:
+                continue
+            movies, next_cursor, prev_cursor = self.movie_service.search_movies(
+                query, page_size=self.page_size, consolidate=False
+            )
+            entries[key] = {
+                'query': query,
+                'show_ids': [m.show_id for m in movies],
+                'next_cursor': next_cursor,
+                'prev_cursor': prev_cursor,
+                'total': self.movie_service.count_search_results(query),
+            }
+        self._state = (version, entries)
+        with self._lock:
+            self.refreshes += 1
+            self.last_refresh_ms = round((time.perf_counter() - started) * 1000, 2)
+            self.last_refresh_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        return {'version': version, 'entries': len(entries), 'ms': self.last_refresh_ms}
+
+    def get(self, query: str, version: int) -> dict | None:
+        """
+        The precomputed first page of `query` if it is warm for `version`, else None.
+        """
+        built_for, entries = self._state
+        entry = entries.get(self.key(query))
+        with self._lock:
+            self.lookups += 1
+            if entry is None:
+                return None
+            if built_for != version:
+                self.stale += 1
+                return None
+            self.hits += 1
+            self._query_hits[entry['query']] = self._query_hits.get(entry['query'], 0) + 1
+        return entry
+
+    def start(self) -> None:
+        if self.top_n > 0:
+            self._loop.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._loop.stop(timeout)
+
+    def _check(self) -> None:
+        stale = time.monotonic() - self._mined_at >= self.mine_interval
+        if stale or self._state[0] != get_text_version():
+            self.refresh()
+
+    def get_stats(self) -> dict:
+        version, entries = self._state
+        with self._lock:
+            return {
+                'top_n': self.top_n,
+                'entries': len(entries),
+                'version': version,
+                'logged_searches': self.logged_searches,
+                'covered_searches': self.covered_searches,
+                'coverage': self.covered_searches / self.logged_searches if self.logged_searches else None,
+                'lookups': self.lookups,
+                'hits': self.hits,
+                'stale': self.stale,
+                'hit_ratio': self.hits / self.lookups if self.lookups else None,
+                'refreshes': self.refreshes,
+                'last_refresh_ms': self.last_refresh_ms,
+                'last_refresh_at': self.last_refresh_at,
+                'queries': [
+                    {'query': q, 'searches': c, 'hits': self._query_hits.get(q, 0)} for q, c in self._queries[:10]
+                ],
+                'alive': self._loop.alive() > 0,
+            }
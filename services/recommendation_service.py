@@ -0,0 +1,334 @@
+import heapq
+import json
+import math
+import re
+import threading
+import time
+from collections import Counter
+from operator import itemgetter
+from services.background import BackgroundLoop
+from services.database_service import get_db
+from services.stats_service import bump_catalog_version, get_text_changes, get_text_version
+
+WORD = re.compile(r"[^\W\d_]{3,}", re.UNICODE)
+STOP_WORDS = frozenset("""
+    the and for with his her their from that this who when into after they them are has have its was
+    but not out about our while one two must can all off over after before your you what where how
+    been will him she only more most than then there these those which would could also just
+""".split())
+# movies column -> (term prefix, weight of one occurrence); no prefix = free text split into words
+FEATURES = (("description", "", 1), ("listed_in", "g:", 2), ("director", "d:", 2), ("cast", "p:", 1))
+SOURCE_COLUMNS = ", ".join(f'"{column}"' for column, _, _ in FEATURES)
+
+
+def _terms(row) -> Counter:
+    terms = Counter()
+    for column, prefix, weight in FEATURES:
+        value = (row[column] or "").lower()
+        if prefix:
+            for item in value.split(","):
+                item = item.strip()
+                if item:
+                    terms[prefix + item] += weight
+        else:
+            terms.update(w for w in WORD.findall(value) if w not in STOP_WORDS)
+    return terms
+
+
+class SimilarityIndex:
+    """
+    Sparse TF-IDF vectors of the catalog plus an inverted index term -> {doc: weight},
+    so the cosine scores of one title cost a walk over its terms' postings. Terms
+    found in more than `max_df` of the titles are left out: they make up most of the
+    pairwise work and barely separate titles.
+
+    Incremental updates re-weight only the changed title; the other vectors keep
+    the IDF of the last full build until the next one.
+    """
+
+    def __init__(self, rows, max_df: float = 0.05):
+        self.max_df = max_df
+        self.ids: list[str | None] = []
+        self.pos: dict[str, int] = {}
+        self.terms: list[Counter | None] = []
+        self.df = Counter()
+        for row in rows:
+            counts = _terms(row)
+            self.pos[row['show_id']] = len(self.ids)
+            self.ids.append(row['show_id'])
+            self.terms.append(counts)
+            self.df.update(counts.keys())
+        self.vectors = [self._vector(counts) for counts in self.terms]
+        self.postings: dict[str, dict[int, float]] = {}
+        for doc, vector in enumerate(self.vectors):
+            self._post(doc, vector)
+
+    def _vector(self, counts: Counter) -> dict[str, float]:
+        n = len(self.pos)
+        cap = max(2.0, self.max_df * n)
+        vector = {
+            term: (1 + math.log(count)) * (math.log((1 + n) / (1 + self.df[term])) + 1)
+            for term, count in counts.items() if self.df[term] <= cap
+        }
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        return {term: w / norm for term, w in vector.items()} if norm else {}
+
+    def _post(self, doc: int, vector: dict[str, float]) -> None:
+        for term, weight in vector.items():
+            self.postings.setdefault(term, {})[doc] = weight
+
+    def _unpost(self, doc: int) -> None:
+        for term in self.vectors[doc]:
+            posting = self.postings[term]
+            del posting[doc]
+            if not posting:
+                del self.postings[term]
+
+    def upsert(self, row) -> None:
+        doc = self.pos.get(row['show_id'])
+        if doc is None:
+            doc = len(self.ids)
+            self.pos[row['show_id']] = doc
+            self.ids.append(row['show_id'])
+            self.terms.append(None)
+            self.vectors.append({})
+        else:
+            self._unpost(doc)
+            self.df.subtract(self.terms[doc].keys())
+        counts = _terms(row)
+        self.df.update(counts.keys())
+        self.terms[doc] = counts
+        self.vectors[doc] = self._vector(counts)
+        self._post(doc, self.vectors[doc])
+
+    def remove(self, show_id: str) -> None:
+        doc = self.pos.pop(show_id, None)
+        if doc is None:
+            return
+        self._unpost(doc)
+        self.df.subtract(self.terms[doc].keys())
+        self.ids[doc] = self.terms[doc] = None
+        self.vectors[doc] = {}
+
+    def scores(self, show_id: str) -> dict[int, float]:
+        doc = self.pos[show_id]
+        acc: dict[int, float] = {}
+        get = acc.get
+        for term, weight in self.vectors[doc].items():
+            for other, other_weight in self.postings[term].items():
+                acc[other] = get(other, 0.0) + weight * other_weight
+        acc.pop(doc, None)
+        return acc
+
+    def neighbors(self, show_id: str, k: int) -> list[tuple[str, float]]:
+        best = heapq.nlargest(k, self.scores(show_id).items(), key=itemgetter(1))
+        return [(self.ids[doc], score) for doc, score in best]
+
+
+class recommendationService:
+    """
+    "Similar titles": the top-K TF-IDF neighbours of every show_id, precomputed into
+    movie_similar so serving them is one primary-key range read. Triggers on movies
+    queue changed titles in similar_dirty; a background thread recomputes them, and
+    the titles whose lists they enter or leave, against an in-memory index.
+
+    Worker processes split the similar_dirty queue between them, so each index is
+    kept current from movie_text_changes instead, the log of text changes every
+    process reads; an index the log cannot bring up to date is rebuilt.
+    """
+
+    def __init__(self, app, k: int = 10, max_df: float = 0.05, workers: int = 1, poll_interval: float = 2.0):
+        self.app = app
+        self.k = k
+        self.max_df = max_df
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.last_rebuild: dict | None = None
+        self._index: SimilarityIndex | None = None
+        # text version (movie_text_changes seq) the index includes every change up to
+        self._index_seq = 0
+        self._lock = threading.Lock()
+        self._loop = BackgroundLoop(app, "recommendation-refresh", self.refresh, poll_interval, threads=min(workers, 1))
+
+    def create_tables(self) -> None:
+        db = get_db()
+        dirty = "INSERT OR REPLACE INTO similar_dirty (show_id) VALUES"
+        db.executescript(f"""
+            CREATE TABLE IF NOT EXISTS movie_similar (
+                show_id TEXT NOT NULL, rank INTEGER NOT NULL,
+                similar_id TEXT NOT NULL, score REAL NOT NULL,
+                PRIMARY KEY (show_id, rank)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_movie_similar_similar_id ON movie_similar (similar_id);
+            CREATE TABLE IF NOT EXISTS similar_dirty (
+                show_id TEXT PRIMARY KEY,
+                marked_at TEXT NOT NULL DEFAULT (datetime('now'))
+            );
+            CREATE TRIGGER IF NOT EXISTS movies_similar_ai AFTER INSERT ON movies BEGIN
+                {dirty} (new.show_id);
+            END;
+            CREATE TRIGGER IF NOT EXISTS movies_similar_ad AFTER DELETE ON movies BEGIN
+                {dirty} (old.show_id);
+            END;
+            CREATE TRIGGER IF NOT EXISTS movies_similar_au AFTER UPDATE OF {SOURCE_COLUMNS}, show_id ON movies BEGIN
+                {dirty} (old.show_id);
+                {dirty} (new.show_id);
+            END;
+        """)
+
+    def _source_rows(self, show_ids: list[str] | None = None) -> list:
+        sql = f"SELECT show_id, {SOURCE_COLUMNS} FROM movies"
+        if show_ids is None:
+            return get_db().execute(sql).fetchall()
+        placeholders = ", ".join("?" for _ in show_ids)
+        return get_db().execute(f"{sql} WHERE show_id IN ({placeholders})", show_ids).fetchall()
+
+    def _write(self, db, show_ids, index: SimilarityIndex) -> None:
+        db.executemany("DELETE FROM movie_similar WHERE show_id = ?", [(s,) for s in show_ids])
+        db.executemany(
+            "INSERT INTO movie_similar (show_id, rank, similar_id, score) VALUES (?, ?, ?, ?)",
+            [
+                (show_id, rank, similar_id, score)
+                for show_id in show_ids if show_id in index.pos
+                for rank, (similar_id, score) in enumerate(index.neighbors(show_id, self.k), 1)
+            ]
+        )
+
+    def rebuild(self) -> dict:
+        """
+        Recomputes every neighbour list from scratch; returns timings in ms.
+        """
+        with self._lock:
+            db = get_db()
+            started = time.perf_counter()
+            # Titles changed after this point are marked again and picked up by refresh().
+            db.execute("DELETE FROM similar_dirty")
+            db.commit()
+            seq = get_text_version()
+            index = SimilarityIndex(self._source_rows(), self.max_df)
+            indexed = time.perf_counter()
+            neighbors = [
+                (show_id, rank, similar_id, score)
+                for show_id in index.pos
+                for rank, (similar_id, score) in enumerate(index.neighbors(show_id, self.k), 1)
+            ]
+            computed = time.perf_counter()
+            db.execute("DELETE FROM movie_similar")
+            db.executemany(
+                "INSERT INTO movie_similar (show_id, rank, similar_id, score) VALUES (?, ?, ?, ?)", neighbors
+            )
+            bump_catalog_version()
+            db.commit()
+            self._index, self._index_seq = index, seq
+            self.last_rebuild = {
+                'titles': len(index.pos),
+                'terms': len(index.postings),
+                'postings': sum(len(p) for p in index.postings.values()),
+                'neighbors': len(neighbors),
+                'index_ms': round((indexed - started) * 1000, 1),
+                'neighbors_ms': round((computed - indexed) * 1000, 1),
+                'write_ms': round((time.perf_counter() - computed) * 1000, 1),
+            }
+            return self.last_rebuild
+
+    def refresh(self) -> int:
+        """
+        Recomputes the titles queued in similar_dirty and returns how many neighbour
+        lists were rewritten. An empty movie_similar gets a full rebuild instead.
+        """
+        db = get_db()
+        if db.execute("SELECT 1 FROM movie_similar LIMIT 1").fetchone() is None:
+            if db.execute("SELECT 1 FROM movies LIMIT 1").fetchone() is None:
+                return 0
+            return self.rebuild()['titles']
+        with self._lock:
+            dirty = [r['show_id'] for r in db.execute("DELETE FROM similar_dirty RETURNING show_id").fetchall()]
+            db.commit()
+            if not dirty:
+                return 0
+            try:
+                return self._refresh(db, dirty)
+            except Exception:
+                db.rollback()
+                db.executemany("INSERT OR IGNORE INTO similar_dirty (show_id) VALUES (?)", [(s,) for s in dirty])
+                db.commit()
+                raise
+
+    def _sync_index(self, db) -> SimilarityIndex:
+        """
+        Applies to the in-memory index every change logged since it was last synced,
+        whichever process made or claimed it.
+        """
+        latest, changed = get_text_changes(self._index_seq)
+        if self._index is None or changed is None:
+            # First change since this process started, or more than the log can replay.
+            self._index = SimilarityIndex(self._source_rows(), self.max_df)
+        elif changed:
+            rows = {r['show_id']: r for r in self._source_rows(changed)}
+            for show_id in changed:
+                if show_id in rows:
+                    self._index.upsert(rows[show_id])
+                else:
+                    self._index.remove(show_id)
+        self._index_seq = latest
+        return self._index
+
+    def _refresh(self, db, dirty: list[str]) -> int:
+        index = self._sync_index(db)
+        rows = [show_id for show_id in dirty if show_id in index.pos]
+
+        placeholders = ", ".join("?" for _ in dirty)
+        # Lists holding a changed title may reorder or lose it...
+        stale = set(dirty) | {
+            r['show_id'] for r in db.execute(
+                f"SELECT DISTINCT show_id FROM movie_similar WHERE similar_id IN ({placeholders})", dirty
+            )
+        }
+        # ...and lists whose K-th score a changed title now beats gain it.
+        candidates: dict[str, float] = {}
+        for show_id in rows:
+            for doc, score in index.scores(show_id).items():
+                other = index.ids[doc]
+                candidates[other] = max(score, candidates.get(other, 0.0))
+        # Only the candidates' floors: a primary-key range read each, not a scan of movie_similar.
+        floors = {
+            r['show_id']: r['floor'] if r['n'] >= self.k else 0.0
+            for r in db.execute(
+                "SELECT show_id, MIN(score) AS floor, COUNT(*) AS n FROM movie_similar "
+                "WHERE show_id IN (SELECT value FROM json_each(?)) GROUP BY show_id",
+                (json.dumps(list(candidates)),)
+            )
+        }
+        stale.update(other for other, score in candidates.items() if score > floors.get(other, 0.0))
+
+        self._write(db, sorted(stale), index)
+        bump_catalog_version()
+        db.commit()
+        return len(stale)
+
+    def get_similar_many(self, show_ids: list[str], limit: int | None = None) -> dict[str, list[dict]]:
+        if not show_ids:
+            return {}
+        placeholders = ", ".join("?" for _ in show_ids)
+        rows = get_db().execute(f"""
+            SELECT s.show_id, s.similar_id, s.score, m.title, m.type, m.release_year
+            FROM movie_similar s JOIN movies m ON m.show_id = s.similar_id
+            WHERE s.show_id IN ({placeholders}) AND s.rank <= ?
+            ORDER BY s.show_id, s.rank
+        """, (*show_ids, limit or self.k)).fetchall()
+        similar = {}
+        for r in rows:
+            similar.setdefault(r['show_id'], []).append({
+                'show_id': r['similar_id'], 'title': r['title'], 'type': r['type'],
+                'release_year': r['release_year'], 'score': round(r['score'], 4),
+            })
+        return similar
+
+    def get_similar(self, show_id: str, limit: int | None = None) -> list[dict]:
+        return self.get_similar_many([show_id], limit).get(show_id, [])
+
+    def start(self) -> None:
+        self._loop.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._loop.stop(timeout)
@@ -0,0 +1,87 @@
+from services.database_service import get_db
+
+# Running sums per review, as (stats column, expression over a reviews row).
+_AGGREGATES = (
+    ("review_count", "1"),
+    ("rating_count", "{r}.rating IS NOT NULL"),
+    ("rating_sum", "COALESCE({r}.rating, 0)"),
+    ("verified_count", "COALESCE({r}.is_verified_watch, 0)"),
+    ("helpful_votes_sum", "COALESCE({r}.helpful_votes, 0)"),
+    ("total_votes_sum", "COALESCE({r}.total_votes, 0)"),
+    ("sentiment_count", "{r}.sentiment_score IS NOT NULL"),
+    ("sentiment_sum", "COALESCE({r}.sentiment_score, 0)"),
+)
+
+
+def _apply(row: str, sign: str) -> str:
+    columns = ", ".join(c for c, _ in _AGGREGATES)
+    values = ", ".join(f"{sign}({e.format(r=row)})" for _, e in _AGGREGATES)
+    updates = ", ".join(f"{c} = {c} + excluded.{c}" for c, _ in _AGGREGATES)
+    return f"""
+        INSERT INTO movie_review_stats (movie_id, {columns}, updated_at)
+        VALUES ({row}.movie_id, {values}, datetime('now'))
+        ON CONFLICT(movie_id) DO UPDATE SET {updates}, updated_at = excluded.updated_at;
+    """
+
+
+def create_review_stats_table() -> None:
+    """
+    movie_review_stats holds one row of running sums per reviewed movie,
+    maintained by triggers on reviews; movie_review_summary derives the ratios.
+    """
+    db = get_db()
+    exists = db.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'movie_review_stats'"
+    ).fetchone()
+    sums = ",\n            ".join(f"{c} {'REAL' if c == 'sentiment_sum' else 'INTEGER'} NOT NULL DEFAULT 0"
+                                  for c, _ in _AGGREGATES)
+    prune = "DELETE FROM movie_review_stats WHERE movie_id = old.movie_id AND review_count <= 0;"
+    db.executescript(f"""
+        CREATE TABLE IF NOT EXISTS movie_review_stats (
+            movie_id TEXT PRIMARY KEY,
+            {sums},
+            updated_at TEXT
+        );
+
+        CREATE VIEW IF NOT EXISTS movie_review_summary AS
+        SELECT movie_id, review_count,
+            rating_sum * 1.0 / NULLIF(rating_count, 0) AS avg_user_rating,
+            verified_count * 1.0 / NULLIF(review_count, 0) AS verified_share,
+            helpful_votes_sum * 1.0 / NULLIF(total_votes_sum, 0) AS helpfulness_ratio,
+            sentiment_sum / NULLIF(sentiment_count, 0) AS sentiment_score
+        FROM movie_review_stats;
+
+        CREATE TRIGGER IF NOT EXISTS reviews_stats_ai AFTER INSERT ON reviews BEGIN
+            {_apply("new", "+")}
+        END;
+        CREATE TRIGGER IF NOT EXISTS reviews_stats_ad AFTER DELETE ON reviews BEGIN
+            {_apply("old", "-")}
+            {prune}
+        END;
+        CREATE TRIGGER IF NOT EXISTS reviews_stats_au AFTER UPDATE ON reviews BEGIN
+            {_apply("old", "-")}
+            {_apply("new", "+")}
+            {prune}
+        END;
+    """)
+    if not exists:
+        rebuild_review_stats()
+
+
+def rebuild_review_stats() -> int:
+    db = get_db()
+    columns = ", ".join(c for c, _ in _AGGREGATES)
+    sums = ", ".join(f"SUM({e.format(r='reviews')})" for _, e in _AGGREGATES)
+    db.execute("DELETE FROM movie_review_stats")
+    db.execute(f"""
+        INSERT INTO movie_review_stats (movie_id, {columns}, updated_at)
+        SELECT movie_id, {sums}, datetime('now') FROM reviews GROUP BY movie_id
+    """)
+    db.commit()
+    return db.execute("SELECT COUNT(*) AS c FROM movie_review_stats").fetchone()['c']
+
+
+def get_review_stats(movie_id: str) -> dict | None:
+    db = get_db()
+    row = db.execute("SELECT * FROM movie_review_summary WHERE movie_id = ?", (movie_id,)).fetchone()
+    return dict(row) if row else None
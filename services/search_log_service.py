@@ -0,0 +1,123 @@
+import atexit
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from services.background import BackgroundLoop
+from services.database_service import get_db
+
+# search_logs columns filled from live searches, in insert order
+EVENT_COLUMNS = ("search_id", "user_id", "search_query", "search_date", "results_returned",
+                 "clicked_result_position", "device_type", "search_duration_seconds", "had_typo",
+                 "used_filters", "location_country")
+
+
+def device_type(user_agent: str | None) -> str:
+    """
+    The device_type buckets of search_logs.csv, from the User-Agent header.
+    """
+    ua = (user_agent or "").lower()
+    if "ipad" in ua or "tablet" in ua:
+        return "Tablet"
+    if "mobi" in ua or "android" in ua:
+        return "Mobile"
+    return "Desktop"
+
+
+class searchLogService:
+    """
+    Records search events without touching SQLite on the request path: record()
+    appends to a bounded in-memory ring buffer and a background thread drains it
+    into search_logs, one transaction per batch. When the buffer is full the
+    oldest event is overwritten and counted as dropped.
+    """
+
+    def __init__(self, app, capacity: int = 10000, batch_size: int = 500, flush_interval: float = 1.0):
+        self.app = app
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: deque[tuple] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        # The last step after stop() writes what is still buffered.
+        self._loop = BackgroundLoop(app, "search-log-flusher", self.flush, flush_interval, final_step=True)
+        self.recorded = self.flushed = self.dropped_overflow = self.dropped_errors = self.batches = 0
+        self.last_flush_ms: float | None = None
+        self.last_flush_at: str | None = None
+
+    def record(self, query: str, results: int | None, duration: float, user_id: str | None = None,
+               device: str | None = None, had_typo: bool = False, used_filters: bool = False,
+               country: str | None = None) -> None:
+        now = datetime.now(timezone.utc)
+        event = (
+            f"web_{uuid.uuid4().hex}", user_id, query, now.strftime('%Y-%m-%d'), results, None,
+            device, round(duration, 4), int(had_typo), int(used_filters), country,
+        )
+        with self._lock:
+            if len(self._buffer) == self.capacity:
+                self.dropped_overflow += 1
+            self._buffer.append(event)
+            self.recorded += 1
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._loop.wake()
+
+    def _drain(self) -> list[tuple]:
+        with self._lock:
+            count = min(self.batch_size, len(self._buffer))
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def flush(self) -> int:
+        """
+        Writes everything buffered so far; returns the number of events written.
+        """
+        written = 0
+        placeholders = ", ".join("?" for _ in EVENT_COLUMNS)
+        sql = f"INSERT OR IGNORE INTO search_logs ({', '.join(EVENT_COLUMNS)}) VALUES ({placeholders})"
+        while True:
+            batch = self._drain()
+            if not batch:
+                return written
+            started = time.perf_counter()
+            db = get_db()
+            try:
+                db.executemany(sql, batch)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                with self._lock:
+                    self.dropped_errors += len(batch)
+                self.app.logger.warning("Dropped %d search events: %s", len(batch), e)
+                continue
+            written += len(batch)
+            with self._lock:
+                self.flushed += len(batch)
+                self.batches += 1
+                self.last_flush_ms = round((time.perf_counter() - started) * 1000, 2)
+                self.last_flush_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+    def start(self) -> None:
+        if self._loop.alive():
+            return
+        self._loop.start()
+        # Buffered events are written on a clean interpreter exit too.
+        atexit.register(self.stop)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._loop.stop(timeout)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                'capacity': self.capacity,
+                'buffered': len(self._buffer),
+                'recorded': self.recorded,
+                'flushed': self.flushed,
+                'dropped_overflow': self.dropped_overflow,
+                'dropped_errors': self.dropped_errors,
+                'batches': self.batches,
+                'last_flush_ms': self.last_flush_ms,
+                'last_flush_at': self.last_flush_at,
+                'alive': self._loop.alive() > 0,
+            }
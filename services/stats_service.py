@@ -0,0 +1,193 @@
+from services.database_service import get_db
+
+# (counter name, table, predicate over a row of that table)
+COUNTERS = (
+    ("movies_total", "movies", "1"),
+    ("movies_consolidated", "movies", "COALESCE({r}.omdb_data_available, 0) = 1"),
+    ("movies_with_poster", "movies", "COALESCE({r}.poster, '') != ''"),
+    ("movies_with_imdb_rating", "movies", "{r}.imdb_rating IS NOT NULL"),
+    ("users_total", "users", "1"),
+    ("users_active", "users", "COALESCE({r}.is_active, 0) = 1"),
+)
+# Tables whose writes change what /movies renders, with columns that do not count.
+CATALOG_SOURCES = (
+    ("movies", ("omdb_last_attempt",)),
+)
+# users columns that do not change what the identity cache holds (user_service.get_cached_user).
+USERS_VERSION_IGNORED = ("password_hash",)
+# Columns the in-memory text indexes read (suggestions, fuzzy matching, similar titles,
+# popular searches). Only inserts, deletes and writes changing one of them are logged
+# in movie_text_changes, so OMDB enrichment leaves those indexes alone.
+TEXT_COLUMNS = ("title", "director", "cast", "description", "listed_in", "release_year")
+TEXT_CHANGE_LOG_SIZE = 10000
+
+
+def _trigger_body(table: str, event: str) -> str:
+    statements = []
+    for name, source, predicate in COUNTERS:
+        if source != table:
+            continue
+        new, old = predicate.format(r="new"), predicate.format(r="old")
+        if event == "INSERT":
+            delta, guard = f"({new})", f"({new})"
+        elif event == "DELETE":
+            delta, guard = f"-({old})", f"({old})"
+        else:
+            # Skip the write entirely when the row's membership did not change.
+            delta, guard = f"({new}) - ({old})", f"({new}) != ({old})"
+        statements.append(
+            f"UPDATE app_counters SET value = value + {delta}, updated_at = datetime('now') "
+            f"WHERE name = '{name}' AND {guard};"
+        )
+    return "\n            ".join(statements)
+
+
+def create_counters_table() -> None:
+    """
+    app_counters keeps one running count per COUNTERS entry, maintained by
+    triggers on movies and users so dashboards read them without scanning.
+    """
+    db = get_db()
+    exists = db.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'app_counters'"
+    ).fetchone()
+    script = """
+        CREATE TABLE IF NOT EXISTS app_counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT
+        );
+    """
+    for table in sorted({source for _, source, _ in COUNTERS}):
+        for event, suffix in (("INSERT", "ai"), ("DELETE", "ad"), ("UPDATE", "au")):
+            script += f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_counters_{suffix} AFTER {event} ON {table} BEGIN
+            {_trigger_body(table, event)}
+        END;
+            """
+    for table, ignored in CATALOG_SOURCES:
+        columns = ", ".join(
+            f'"{r["name"]}"' for r in db.execute(f"PRAGMA table_info({table})") if r["name"] not in ignored
+        )
+        bump = ("UPDATE app_counters SET value = value + 1, updated_at = datetime('now') "
+                "WHERE name = 'catalog_version';")
+        script += f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_version_ai AFTER INSERT ON {table} BEGIN {bump} END;
+        CREATE TRIGGER IF NOT EXISTS {table}_version_ad AFTER DELETE ON {table} BEGIN {bump} END;
+        CREATE TRIGGER IF NOT EXISTS {table}_version_au AFTER UPDATE OF {columns} ON {table} BEGIN {bump} END;
+        """
+    user_columns = ", ".join(
+        f'"{r["name"]}"' for r in db.execute("PRAGMA table_info(users)") if r["name"] not in USERS_VERSION_IGNORED
+    )
+    bump = "UPDATE app_counters SET value = value + 1, updated_at = datetime('now') WHERE name = 'users_version';"
+    script += f"""
+        INSERT OR IGNORE INTO app_counters (name, value, updated_at) VALUES ('users_version', 1, datetime('now'));
+        CREATE TRIGGER IF NOT EXISTS users_version_ad AFTER DELETE ON users BEGIN {bump} END;
+        CREATE TRIGGER IF NOT EXISTS users_version_au AFTER UPDATE OF {user_columns} ON users BEGIN {bump} END;
+    """
+    watched = ", ".join(f'"{c}"' for c in TEXT_COLUMNS)
+    changed = " OR ".join(f'old."{c}" IS NOT new."{c}"' for c in (*TEXT_COLUMNS, "show_id"))
+    script += f"""
+        INSERT OR IGNORE INTO app_counters (name, value, updated_at) VALUES ('catalog_version', 1, datetime('now'));
+
+        CREATE TABLE IF NOT EXISTS movie_text_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT, show_id TEXT NOT NULL
+        );
+        CREATE TRIGGER IF NOT EXISTS movie_text_changes_trim AFTER INSERT ON movie_text_changes BEGIN
+            DELETE FROM movie_text_changes WHERE seq <= new.seq - {TEXT_CHANGE_LOG_SIZE};
+        END;
+        CREATE TRIGGER IF NOT EXISTS movies_text_ai AFTER INSERT ON movies BEGIN
+            INSERT INTO movie_text_changes (show_id) VALUES (new.show_id);
+        END;
+        CREATE TRIGGER IF NOT EXISTS movies_text_ad AFTER DELETE ON movies BEGIN
+            INSERT INTO movie_text_changes (show_id) VALUES (old.show_id);
+        END;
+        CREATE TRIGGER IF NOT EXISTS movies_text_au AFTER UPDATE OF {watched}, show_id ON movies
+        WHEN {changed} BEGIN
+            INSERT INTO movie_text_changes (show_id) VALUES (old.show_id);
+            INSERT INTO movie_text_changes (show_id) SELECT new.show_id WHERE new.show_id IS NOT old.show_id;
+        END;
+    """
+    db.executescript(script)
+    if not exists:
+        rebuild_counters()
+
+
+def rebuild_counters() -> dict:
+    db = get_db()
+    for name, table, predicate in COUNTERS:
+        db.execute(f"""
+            INSERT INTO app_counters (name, value, updated_at)
+            SELECT ?, COUNT(*), datetime('now') FROM {table} WHERE {predicate.format(r=table)}
+            ON CONFLICT(name) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+        """, (name,))
+    db.commit()
+    return get_counters()
+
+
+def get_counters(*names: str) -> dict:
+    db = get_db()
+    if names:
+        placeholders = ", ".join("?" for _ in names)
+        rows = db.execute(f"SELECT name, value FROM app_counters WHERE name IN ({placeholders})", names)
+    else:
+        rows = db.execute("SELECT name, value FROM app_counters")
+    counters = dict.fromkeys(names, 0)
+    counters.update({r['name']: r['value'] for r in rows})
+    return counters
+
+
+def get_catalog_version() -> tuple[int, str]:
+    """
+    Returns (version, updated_at UTC) of the catalog; the version grows on every
+    write to the rendered movie columns.
+    """
+    row = get_db().execute(
+        "SELECT value, updated_at FROM app_counters WHERE name = 'catalog_version'"
+    ).fetchone()
+    return (row['value'], row['updated_at']) if row else (0, None)
+
+
+def bump_catalog_version() -> None:
+    """
+    For bulk writes to derived data /movies renders: one bump per batch, in the
+    caller's transaction, instead of a trigger firing per row.
+    """
+    get_db().execute(
+        "UPDATE app_counters SET value = value + 1, updated_at = datetime('now') WHERE name = 'catalog_version'"
+    )
+
+
+def get_users_version() -> int:
+    """
+    Grows on every update or delete of a users row, password rehashes aside.
+    """
+    row = get_db().execute("SELECT value FROM app_counters WHERE name = 'users_version'").fetchone()
+    return row['value'] if row else 0
+
+
+def get_text_version() -> int:
+    """
+    Sequence number of the last logged change to the TEXT_COLUMNS of movies.
+    """
+    return get_db().execute(
+        "SELECT COALESCE(MAX(seq), 0) AS seq FROM movie_text_changes"
+    ).fetchone()['seq']
+
+
+def get_text_changes(since: int, limit: int = 1000) -> tuple[int, list[str] | None]:
+    """
+    Returns (text version, show_ids whose text changed after `since`). The ids
+    are None when the log no longer reaches back to `since` or holds more than
+    `limit` changes since then: rebuilding from movies is the way to catch up.
+    """
+    latest = get_text_version()
+    if latest == since:
+        return latest, []
+    rows = get_db().execute(
+        "SELECT seq, show_id FROM movie_text_changes WHERE seq > ? AND seq <= ? ORDER BY seq LIMIT ?",
+        (since, latest, limit + 1)
+    ).fetchall()
+    if latest < since or len(rows) > limit or not rows or rows[0]['seq'] != since + 1:
+        return latest, None
+    return latest, list(dict.fromkeys(r['show_id'] for r in rows))
@@ -0,0 +1,277 @@
+import heapq
+import re
+import sys
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+from services.background import BackgroundLoop
+from services.database_service import get_db
+from services.stats_service import get_text_changes, get_text_version
+
+NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text: str | None) -> str:
+    """
+    Lowercase ASCII folding: "Amélie: Le Fabuleux" -> "amelie le fabuleux".
+    """
+    folded = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode("ascii")
+    return NON_ALNUM.sub(" ", folded.lower()).strip()
+
+
+def _word_suffixes(key: str) -> list[str]:
+    """
+    The key and every suffix starting at a later word, so "irish" finds "the irishman".
+    """
+    words = key.split(" ")
+    return [" ".join(words[i:]) for i in range(len(words)) if len(words[i]) > 1 or i == 0]
+
+
+def _people(row) -> set[str]:
+    names = set()
+    for column in ("director", "cast"):
+        for name in (row[column] or "").split(","):
+            if name.strip():
+                names.add(name.strip())
+    return names
+
+
+class _SuggestData:
+    """
+    One generation of the index: the sorted (keys, refs) arrays and the entries
+    they point to. A rebuild makes a new one; refresh() patches the current one.
+    """
+
+    def __init__(self):
+        self.arrays: tuple[list[str], array] = ([], array("l"))
+        self.entries: list[tuple[str, str] | None] = []
+        self.entry_ids: dict[tuple[str, str], int] = {}
+        self.titles: dict[str, tuple[str, int | None, tuple[str, ...]]] = {}
+        self.people: dict[str, list] = {}
+
+    def refs(self, kind: str, ident: str, key: str) -> list[tuple[str, int]]:
+        entry_id = self.entry_ids.get((kind, ident))
+        if entry_id is None:
+            entry_id = self.entry_ids[(kind, ident)] = len(self.entries)
+            self.entries.append((kind, ident))
+        return [(k, entry_id * 2 + (i == 0)) for i, k in enumerate(_word_suffixes(key))]
+
+    def title_entries(self, row) -> tuple[tuple[str, int | None, tuple[str, ...]], list[tuple[str, int]]]:
+        people = tuple(sorted(_people(row)))
+        return (row['title'], row['release_year'], people), self.refs("t", row['show_id'], normalize(row['title']))
+
+    def add_person(self, name: str, entries: list[tuple[str, int]]) -> None:
+        key = normalize(name)
+        if not key:
+            return
+        person = self.people.get(key)
+        if person is None:
+            self.people[key] = [name, 1]
+            entries.extend(self.refs("p", key, key))
+        else:
+            person[1] += 1
+
+    def drop_person(self, name: str, removed: list[tuple[str, int]]) -> None:
+        key = normalize(name)
+        person = self.people.get(key)
+        if person is None:
+            return
+        person[1] -= 1
+        if person[1] <= 0:
+            del self.people[key]
+            removed.extend(self.refs("p", key, key))
+
+
+class SuggestIndex:
+    """
+    Typeahead over titles and people as two parallel sorted arrays searched with
+    bisect: normalized keys, and refs packing the entry id with a bit telling whether
+    the key starts at the entry's first word. Readers take the arrays without
+    locking: writers copy them, apply the change and swap the pair in one assignment.
+
+    Entries are titles (by show_id) and people (directors and cast, by normalized
+    name, ranked by how many titles they appear in). A background thread builds
+    the index, then replays movie_text_changes into it: titles written since
+    `version` are patched in, and only a gap in the log (or a burst such as
+    seeding) costs a rebuild. refresh() applies this process's admin writes right
+    away. Lookups answer nothing until the first build is done.
+    """
+
+    def __init__(self, scan_limit: int = 256):
+        self.scan_limit = scan_limit
+        self.version: int | None = None
+        self._data: _SuggestData | None = None
+        self._lock = threading.Lock()
+        self._loop: BackgroundLoop | None = None
+
+    @staticmethod
+    def _build() -> _SuggestData:
+        data = _SuggestData()
+        entries: list[tuple[str, int]] = []
+        for row in get_db().execute(
+            'SELECT show_id, title, release_year, director, "cast" FROM movies WHERE title IS NOT NULL'
+        ):
+            info, title_entries = data.title_entries(row)
+            data.titles[row['show_id']] = info
+            entries.extend(title_entries)
+            for name in info[2]:
+                data.add_person(name, entries)
+        entries.sort()
+        data.arrays = ([k for k, _ in entries], array("l", (r for _, r in entries)))
+        return data
+
+    def rebuild(self) -> None:
+        """
+        Builds a new generation from movies and swaps it in; readers keep the old
+        one until then.
+        """
+        with self._lock:
+            # Read first: a write landing during the build is replayed by the next sync().
+            version = get_text_version()
+            self._data = self._build()
+            self.version = version
+
+    def ready(self) -> bool:
+        return self._data is not None
+
+    def sync(self) -> None:
+        """
+        Brings the index up to the last logged text change: builds it the first
+        time, then patches the titles changed since, rebuilding only when the log
+        cannot say which ones.
+        """
+        if self._data is None:
+            self.rebuild()
+            return
+        latest, changed = get_text_changes(self.version)
+        if changed is None:
+            self.rebuild()
+        elif changed:
+            self.refresh(changed, latest)
+
+    def refresh(self, show_ids: list[str], version: int | None = None) -> None:
+        """
+        Re-reads the given titles from movies (missing ones are removed) and patches
+        the arrays; `version` is the text version the patch brings the index to.
+        """
+        if self._data is None:
+            return  # the first build reads rows that already include the change
+        placeholders = ", ".join("?" for _ in show_ids)
+        with self._lock:
+            # Read under the lock, so a slower caller cannot patch older rows over newer ones.
+            rows = {
+                r['show_id']: r for r in get_db().execute(
+                    f'SELECT show_id, title, release_year, director, "cast" FROM movies '
+                    f'WHERE title IS NOT NULL AND show_id IN ({placeholders})', show_ids
+                )
+            }
+            data = self._data
+            added: list[tuple[str, int]] = []
+            removed: list[tuple[str, int]] = []
+            for show_id in show_ids:
+                old = data.titles.pop(show_id, None)
+                if old is not None:
+                    removed.extend(data.refs("t", show_id, normalize(old[0])))
+                    for name in old[2]:
+                        data.drop_person(name, removed)
+                if show_id in rows:
+                    info, title_entries = data.title_entries(rows[show_id])
+                    data.titles[show_id] = info
+                    added.extend(title_entries)
+                    for name in info[2]:
+                        data.add_person(name, added)
+            keys, refs = list(data.arrays[0]), array("l", data.arrays[1])
+            for key, ref in removed:
+                lo, hi = bisect_left(keys, key), bisect_right(keys, key)
+                for i in range(lo, hi):
+                    if refs[i] == ref:
+                        del keys[i], refs[i]
+                        break
+            for key, ref in added:
+                i = bisect_right(keys, key)
+                keys.insert(i, key)
+                refs.insert(i, ref)
+            data.arrays = (keys, refs)
+            if version is not None:
+                self.version = version
+
+    def suggest(self, query: str, limit: int = 10) -> list[dict]:
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        data = self._data
+        if data is None:
+            return []
+        keys, refs = data.arrays
+        lo = bisect_left(keys, prefix)
+        # Keys only hold [0-9a-z ], so "\x7f" sorts after every key sharing the prefix.
+        hi = min(bisect_left(keys, prefix + "\x7f", lo), lo + self.scan_limit)
+        window = refs[lo:hi]
+        leading = {ref >> 1 for ref in window if ref & 1}
+        items = self._rank(data, leading, limit)
+        if len(items) < limit:
+            items += self._rank(data, {ref >> 1 for ref in window} - leading, limit - len(items))
+        return items
+
+    @staticmethod
+    def _rank(data: _SuggestData, entry_ids: set[int], limit: int) -> list[dict]:
+        """
+        Titles before people, then more prolific people and shorter labels first.
+        """
+        candidates = []
+        for entry_id in entry_ids:
+            kind, ident = data.entries[entry_id]
+            # A concurrent refresh() may have dropped an entry the arrays still hold.
+            value = (data.titles if kind == "t" else data.people).get(ident)
+            if value is not None:
+                weight = 0 if kind == "t" else -value[1]
+                candidates.append((kind == "p", weight, len(value[0]), entry_id, ident, value))
+        return [
+            {'kind': 'person', 'label': value[0], 'titles': value[1]} if person
+            else {'kind': 'title', 'label': value[0], 'show_id': ident, 'release_year': value[1]}
+            for person, _, _, _, ident, value in heapq.nsmallest(limit, candidates)
+        ]
+
+    def start(self, app, refresh_interval: float = 30.0) -> None:
+        """
+        Builds the index in the background right away, then syncs it every `refresh_interval` seconds.
+        """
+        if self._loop is None:
+            self._loop = BackgroundLoop(app, "suggest-index", self.sync, refresh_interval)
+        self._loop.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._loop is not None:
+            self._loop.stop(timeout)
+
+    def memory_report(self) -> dict:
+        """
+        Approximate resident size of the index (sys.getsizeof of the containers
+        and of every string, tuple and list they hold); all zeros until the first build.
+        """
+        data = self._data or _SuggestData()
+        keys, refs = data.arrays
+        size = sys.getsizeof
+        arrays = size(keys) + size(refs) + sum(size(k) for k in keys)
+        entries = size(data.entries) + size(data.entry_ids) + sum(
+            size(entry) + size(entry[1]) for entry in data.entries if entry is not None
+        )
+        titles = size(data.titles) + sum(
+            size(show_id) + size(info) + size(info[0]) + size(info[1]) + size(info[2]) + sum(size(n) for n in info[2])
+            for show_id, info in data.titles.items()
+        )
+        people = size(data.people) + sum(
+            size(key) + size(person) + size(person[0]) + size(person[1]) for key, person in data.people.items()
+        )
+        return {
+            'keys': len(keys),
+            'titles': len(data.titles),
+            'people': len(data.people),
+            'version': self.version,
+            'arrays_bytes': arrays,
+            'entries_bytes': entries,
+            'titles_bytes': titles,
+            'people_bytes': people,
+            'total_bytes': arrays + entries + titles + people,
+        }
@@ -1,7 +1,19 @@
+import threading
+import time
 from typing import Optional, Any
-from werkzeug.security import generate_password_hash, check_password_hash
 from services.database_service import get_db
-from models.users import User, row_to_user
+from models.users import User, USER_SELECT, row_to_user
+from services.pagination import keyset_window, build_page
+from services.stats_service import get_counters, get_users_version
+from services.cache import LruCache
+from services.password_service import HashingBusy, get_password_hasher
+
+# Identity cache for Flask-Login's user_loader; update_user/delete_user invalidate it.
+_user_cache = LruCache(max_entries=1024, ttl=300)
+# Writes by other processes show up through users_version, read at most every _version_check seconds.
+_version_check = 1.0
+_version_state: tuple[float, int | None] = (float("-inf"), None)
+_version_lock = threading.Lock()
 
 
 def create_user(
@@ -24,7 +36,7 @@ def create_user(
     household_size: Optional[int] = None,
 ) -> User:
     db = get_db()
-    password_hash = generate_password_hash(password)
+    password_hash = get_password_hasher().hash(password)
     cur = db.execute(
         """
         INSERT INTO users (
@@ -47,26 +59,84 @@ def create_user(
 def get_user_by_id(user_id: int) -> Optional[User]:
     db = get_db()
     row = db.execute(
-        "SELECT * FROM users WHERE user_id = ?", (user_id,)
+        f"SELECT {USER_SELECT} FROM users WHERE user_id = ?", (user_id,)
     ).fetchone()
     return row_to_user(row)
 
 
+def configure_user_cache(max_entries: int, ttl: float, version_check: float = 1.0) -> None:
+    global _user_cache, _version_check
+    _user_cache = LruCache(max_entries=max_entries, ttl=ttl)
+    _version_check = version_check
+
+
+def _users_version() -> int | None:
+    """
+    The users_version last read, re-read when older than _version_check seconds.
+    When it moved, some process changed a user: the whole cache is dropped.
+    """
+    global _version_state
+    checked_at, version = _version_state
+    if time.monotonic() - checked_at < _version_check:
+        return version
+    with _version_lock:
+        checked_at, version = _version_state
+        if time.monotonic() - checked_at >= _version_check:
+            latest = get_users_version()
+            if latest != version:
+                _user_cache.clear()
+            _version_state = (time.monotonic(), latest)
+            version = latest
+    return version
+
+
+def get_cached_user(user_id: int) -> Optional[User]:
+    """
+    get_user_by_id() behind the in-process LRU/TTL cache. Unknown ids are not cached.
+    Entries are tagged with the users_version read before the row: one filled while
+    another process wrote is not served once the new version has been seen.
+    """
+    version = _users_version()
+    cached = _user_cache.get(user_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    user = get_user_by_id(user_id)
+    if user is not None:
+        _user_cache.put(user_id, (version, user))
+    return user
+
+
+def get_user_cache_stats() -> dict:
+    return _user_cache.get_stats()
+
+
 def get_user_by_email(email: str) -> Optional[User]:
     db = get_db()
     row = db.execute(
-        "SELECT * FROM users WHERE email = ?", (email,)
+        f"SELECT {USER_SELECT} FROM users WHERE email = ?", (email,)
     ).fetchone()
     return row_to_user(row)
 
 
 def verify_credentials(email: str, password: str) -> Optional[User]:
-    user = get_user_by_email(email)
-    if user is None:
+    db = get_db()
+    row = db.execute(
+        f"SELECT {USER_SELECT}, password_hash FROM users WHERE email = ?", (email,)
+    ).fetchone()
+    if row is None:
         return None
-    if check_password_hash(user.password_hash, password):
-        return user
-    return None
+    hasher = get_password_hasher()
+    if not hasher.verify(row["password_hash"], password):
+        return None
+    if hasher.needs_rehash(row["password_hash"]):
+        # The plaintext is only available here; upgrade hashes made with older parameters.
+        try:
+            new_hash = hasher.hash(password)
+        except HashingBusy:
+            return row_to_user(row)  # the password checked out; upgrade on a later login
+        db.execute("UPDATE users SET password_hash = ? WHERE user_id = ?", (new_hash, row["user_id"]))
+        db.commit()
+    return row_to_user(row)
 
 
 def update_user(
@@ -140,7 +210,7 @@ def update_user(
         values.append(role)
     if password is not None:
         fields.append("password_hash = ?")
-        values.append(generate_password_hash(password))
+        values.append(get_password_hasher().hash(password))
 
     if not fields:
         return get_user_by_id(user_id)
@@ -151,6 +221,7 @@ def update_user(
         tuple(values),
     )
     db.commit()
+    _user_cache.invalidate(user_id)
     return get_user_by_id(user_id)
 
 
@@ -158,37 +229,42 @@ def delete_user(user_id: int) -> None:
     db = get_db()
     db.execute("DELETE FROM users WHERE user_id = ?", (user_id,))
     db.commit()
+    _user_cache.invalidate(user_id)
 
 
 # Admin helpers
-def list_users(search: Optional[str] = None, page: int = 1, page_size: int = 20) -> tuple[list[User], bool]:
+def list_users(
+    search: Optional[str] = None,
+    page_size: int = 20,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+) -> tuple[list[User], Optional[str], Optional[str]]:
     db = get_db()
-    offset = (page - 1) * page_size
-    params: list[Any] = []
-    where = ""
+    condition, params, order_by, backwards = keyset_window(
+        ("created_at", "user_id"), after, before, descending=True
+    )
+    has_cursor = bool(params)
+    where = f"WHERE {condition}"
     if search:
-        where = "WHERE email LIKE ? OR first_name LIKE ? OR last_name LIKE ?"
+        where += " AND (email LIKE ? OR first_name LIKE ? OR last_name LIKE ?)"
         like = f"%{search}%"
         params.extend([like, like, like])
     rows = db.execute(
-        f"SELECT * FROM users {where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
-        (*params, page_size, offset)
+        f"SELECT {USER_SELECT} FROM users {where} ORDER BY {order_by} LIMIT ?",
+        (*params, page_size + 1)
     ).fetchall()
+    rows, next_cursor, prev_cursor = build_page(
+        rows, page_size, backwards, has_cursor, lambda r: (r["created_at"], r["user_id"])
+    )
     users = [row_to_user(r) for r in rows if r]
-    total = db.execute(
-        f"SELECT COUNT(*) AS c FROM users {where}",
-        tuple(params)
-    ).fetchone()["c"]
-    return users, (page * page_size) < total
+    return users, next_cursor, prev_cursor
 
 
 def count_users() -> int:
-    db = get_db()
-    return db.execute("SELECT COUNT(*) AS c FROM users").fetchone()["c"]
+    return get_counters("users_total")["users_total"]
 
 
 def count_active_users() -> int:
-    db = get_db()
-    return db.execute("SELECT COUNT(*) AS c FROM users WHERE is_active = 1").fetchone()["c"]
+    return get_counters("users_active")["users_active"]
 
 
@@ -0,0 +1,54 @@
+import os
+import sys
+import tempfile
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_tmp = tempfile.mkdtemp(prefix="tpfilm-tests-")
+# Read by create_app() when app.py is imported: a scratch database, no OMDB calls, no background workers.
+os.environ.update({
+    "DATABASE_PATH": os.path.join(_tmp, "app.db"),
+    "EXPORT_DIR": os.path.join(_tmp, "exports"),
+    "OMDB_BASE_URL": "http://127.0.0.1:9/",
+    "ENRICHMENT_WORKERS": "0",
+    "RECOMMENDATION_WORKERS": "0",
+    "METRICS_ENABLED": "0",
+})
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope="session")
+def app():
+    # The app seeds from ./data relative to the working directory.
+    os.chdir(ROOT)
+    from app import app
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def movie_service(app):
+    from services.movie_service import movieService
+    with app.app_context():
+        yield movieService(None, base_omdb_url=os.environ["OMDB_BASE_URL"])
+
+
+@pytest.fixture
+def new_movie(movie_service):
+    """
+    Creates titles for one test and deletes them afterwards.
+    """
+    created = []
+
+    def create(show_id: str, **data):
+        movie_service.create_movie({"show_id": show_id, **data})
+        created.append(show_id)
+        return show_id
+
+    yield create
+    for show_id in created:
+        movie_service.delete_movie(show_id)
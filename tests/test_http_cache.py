@@ -0,0 +1,57 @@
+import pytest
+
+
+@pytest.mark.parametrize("url", ["/api/movies?limit=5", "/api/movies/facets", "/movies"])
+def test_conditional_get_returns_304(client, url):
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"catalog-')
+
+    revalidated = client.get(url, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b""
+    assert revalidated.headers["ETag"] == etag
+
+    by_date = client.get(url, headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert by_date.status_code == 304
+
+
+def test_catalog_write_invalidates_etag(client, movie_service, new_movie):
+    etag = client.get("/api/movies?limit=5").headers["ETag"]
+    new_movie("zz-etag", title="Qwzetag")
+
+    response = client.get("/api/movies?limit=5", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_unrelated_etag_is_ignored(client):
+    assert client.get("/api/movies?limit=5", headers={"If-None-Match": 'W/"catalog-0"'}).status_code == 200
+
+
+def test_api_is_public_and_pages_are_scoped(client):
+    api = client.get("/api/movies?limit=5")
+    assert api.cache_control.public and api.cache_control.max_age == 60
+
+    page = client.get("/movies")
+    assert page.headers["ETag"].endswith('-anon"')
+
+
+def test_signed_in_pages_are_private(app, client):
+    from services.user_service import create_user, delete_user
+    with app.app_context():
+        user_id = int(create_user(email="qwz-etag@example.com", password="pw", role="user").get_id())
+    try:
+        anonymous = client.get("/movies").headers["ETag"]
+        client.post("/login", data={"email": "qwz-etag@example.com", "password": "pw"})
+        page = client.get("/movies")
+        assert page.headers["ETag"] != anonymous
+        assert page.headers["ETag"].endswith(f'-u{user_id}-user"')
+        assert page.cache_control.private and page.cache_control.no_cache
+        assert "Cookie" in page.headers["Vary"]
+        # Another viewer's validator does not revalidate this one's page.
+        assert client.get("/movies", headers={"If-None-Match": anonymous}).status_code == 200
+    finally:
+        with app.app_context():
+            delete_user(user_id)
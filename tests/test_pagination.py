@@ -0,0 +1,111 @@
+import base64
+import json
+import pytest
+from services.pagination import build_page, decode_cursor, encode_cursor, keyset_window
+
+
+def _token(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip('=')
+
+
+@pytest.mark.parametrize("values", [
+    ["The Crown", "s42"],
+    [-3.25, "s1"],
+    [None, 7],
+    ["Amélie ✓ ==", "s9"],
+])
+def test_cursor_round_trip(values):
+    token = encode_cursor(values)
+    assert "=" not in token
+    assert decode_cursor(token, len(values)) == values
+
+
+@pytest.mark.parametrize("token", [None, "", "!!not base64!!", _token("abc"), _token(["only one"])])
+def test_decode_cursor_rejects_malformed_tokens(token):
+    assert decode_cursor(token, 2) is None
+
+
+@pytest.mark.parametrize("values", [[["nested"], "s1"], [{"a": 1}, "s1"], [True, "s1"]])
+def test_decode_cursor_rejects_non_scalar_values(values):
+    assert decode_cursor(_token(values), 2) is None
+
+
+def test_keyset_window_without_cursor():
+    assert keyset_window(("title", "show_id")) == ("1 = 1", [], "title ASC, show_id ASC", False)
+
+
+def test_keyset_window_after_and_before():
+    after = keyset_window(("title", "show_id"), after=encode_cursor(["B", "s2"]))
+    assert after == ("(title, show_id) > (?, ?)", ["B", "s2"], "title ASC, show_id ASC", False)
+    before = keyset_window(("title", "show_id"), before=encode_cursor(["B", "s2"]))
+    assert before == ("(title, show_id) < (?, ?)", ["B", "s2"], "title DESC, show_id DESC", True)
+    descending = keyset_window(("score",), after=encode_cursor([1.5]), descending=True)
+    assert descending == ("(score) < (?)", [1.5], "score DESC", False)
+
+
+def test_keyset_window_ignores_bad_cursor():
+    assert keyset_window(("title", "show_id"), after="garbage")[:2] == ("1 = 1", [])
+
+
+def test_build_page_probe_row():
+    rows, next_cursor, prev_cursor = build_page([1, 2, 3], 2, False, False, lambda r: (r,))
+    assert rows == [1, 2]
+    assert decode_cursor(next_cursor, 1) == [2]
+    assert prev_cursor is None
+
+    # Walking backwards the rows come in reverse and are put back in order.
+    rows, next_cursor, prev_cursor = build_page([5, 4, 3], 2, True, True, lambda r: (r,))
+    assert rows == [4, 5]
+    assert decode_cursor(next_cursor, 1) == [5]
+    assert decode_cursor(prev_cursor, 1) == [4]
+
+    assert build_page([], 2, False, True, lambda r: (r,)) == ([], None, None)
+
+
+def _walk(fetch, cursor=None, direction="after"):
+    pages = []
+    while True:
+        items, next_cursor, prev_cursor = fetch(**{direction: cursor})
+        pages.append(items)
+        cursor = next_cursor if direction == "after" else prev_cursor
+        if cursor is None:
+            return pages
+
+
+def test_keyset_pages_forward_and_back(movie_service, new_movie):
+    for i in range(7):
+        # Equal titles: the show_id tie-breaker keeps the order total.
+        new_movie(f"zz-page-{i}", title="Qwzpaging", listed_in="Qwzgenre", release_year=2000 + i)
+    filters = {"genre": "Qwzgenre"}
+
+    def fetch(after=None, before=None):
+        movies, next_cursor, prev_cursor = movie_service.get_movies_paginated(
+            page_size=3, after=after, before=before, consolidate=False, filters=filters
+        )
+        return [m.show_id for m in movies], next_cursor, prev_cursor
+
+    forward = _walk(fetch)
+    assert forward == [["zz-page-0", "zz-page-1", "zz-page-2"], ["zz-page-3", "zz-page-4", "zz-page-5"],
+                       ["zz-page-6"]]
+
+    # From the last page, prev cursors lead back over the same pages.
+    _, cursor, _ = fetch()
+    _, cursor, _ = fetch(after=cursor)
+    last, _, prev_cursor = fetch(after=cursor)
+    assert last == ["zz-page-6"]
+    backward = _walk(fetch, prev_cursor, direction="before")
+    assert backward == forward[-2::-1]
+
+
+def test_search_pages_do_not_overlap(movie_service, new_movie):
+    for i in range(5):
+        new_movie(f"zz-search-{i}", title=f"Qwzsearch {i}", description="qwzsearch " * (i + 1))
+
+    seen = []
+    after = None
+    while True:
+        movies, after, _ = movie_service.search_movies("qwzsearch", page_size=2, after=after, consolidate=False)
+        seen.extend(m.show_id for m in movies)
+        if after is None:
+            break
+    assert sorted(seen) == [f"zz-search-{i}" for i in range(5)]
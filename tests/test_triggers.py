@@ -0,0 +1,129 @@
+from services.database_service import get_db
+from services.stats_service import get_catalog_version, get_counters, get_text_changes, get_text_version
+
+
+def _search(movie_service, query: str) -> list[str]:
+    movies, _, _ = movie_service.search_movies(query, page_size=50, consolidate=False)
+    return [m.show_id for m in movies]
+
+
+def _facets(show_id: str) -> dict:
+    db = get_db()
+    return {
+        "genre": {r["genre"] for r in db.execute("SELECT genre FROM movie_genre WHERE show_id = ?", (show_id,))},
+        "country": {r["country"] for r in db.execute("SELECT country FROM movie_country WHERE show_id = ?", (show_id,))},
+        "person": {(r["name"], r["role"])
+                   for r in db.execute("SELECT name, role FROM movie_person WHERE show_id = ?", (show_id,))},
+    }
+
+
+def test_fts_follows_inserts_updates_and_deletes(movie_service, new_movie):
+    new_movie("zz-fts", title="Qwzfirst", director="Qwzdirector")
+    assert _search(movie_service, "qwzfirst") == ["zz-fts"]
+    assert _search(movie_service, "qwzdirector") == ["zz-fts"]
+
+    movie_service.update_movie("zz-fts", {"title": "Qwzsecond"})
+    assert _search(movie_service, "qwzfirst") == []
+    assert _search(movie_service, "qwzsecond") == ["zz-fts"]
+    assert _search(movie_service, "qwzdirector") == ["zz-fts"]
+
+    movie_service.delete_movie("zz-fts")
+    assert _search(movie_service, "qwzsecond") == []
+    assert get_db().execute("SELECT 1 FROM movies_fts_ids WHERE show_id = 'zz-fts'").fetchone() is None
+
+
+def test_fts_follows_show_id_renames(movie_service, new_movie):
+    new_movie("zz-fts-old", title="Qwzrenamed")
+    db = get_db()
+    db.execute("UPDATE movies SET show_id = 'zz-fts-new' WHERE show_id = 'zz-fts-old'")
+    db.commit()
+    try:
+        assert _search(movie_service, "qwzrenamed") == ["zz-fts-new"]
+    finally:
+        movie_service.delete_movie("zz-fts-new")
+    assert _search(movie_service, "qwzrenamed") == []
+
+
+def test_fts_survives_vacuum(movie_service, new_movie):
+    # VACUUM may renumber movies rowids; the FTS index is keyed on its own docids.
+    new_movie("zz-vacuum-a", title="Qwzvacuum alpha")
+    new_movie("zz-vacuum-b", title="Qwzvacuum beta")
+    movie_service.delete_movie("zz-vacuum-a")
+    db = get_db()
+    db.commit()
+    db.execute("VACUUM")
+    assert _search(movie_service, "qwzvacuum") == ["zz-vacuum-b"]
+    assert _search(movie_service, "qwzvacuum beta") == ["zz-vacuum-b"]
+
+
+def test_facet_tables_follow_movies(movie_service, new_movie):
+    new_movie("zz-facets", listed_in="Dramas, Qwz Thrillers", country="France, Qwzland",
+              director="Ann Qwz", cast="Bob Qwz, Cy Qwz")
+    assert _facets("zz-facets") == {
+        "genre": {"Dramas", "Qwz Thrillers"},
+        "country": {"France", "Qwzland"},
+        "person": {("Ann Qwz", "director"), ("Bob Qwz", "cast"), ("Cy Qwz", "cast")},
+    }
+
+    movie_service.update_movie("zz-facets", {"listed_in": "Comedies", "cast": 'Dee "Qwz", Bob Qwz'})
+    facets = _facets("zz-facets")
+    assert facets["genre"] == {"Comedies"}
+    assert facets["country"] == {"France", "Qwzland"}
+    assert facets["person"] == {("Ann Qwz", "director"), ('Dee "Qwz"', "cast"), ("Bob Qwz", "cast")}
+
+    movie_service.delete_movie("zz-facets")
+    assert _facets("zz-facets") == {"genre": set(), "country": set(), "person": set()}
+
+
+def test_counters_follow_movies(movie_service, new_movie):
+    names = ("movies_total", "movies_consolidated", "movies_with_poster", "movies_with_imdb_rating")
+    before = get_counters(*names)
+
+    new_movie("zz-counters", title="Qwzcounted")
+    assert get_counters(*names) == {**before, "movies_total": before["movies_total"] + 1}
+
+    db = get_db()
+    db.execute("UPDATE movies SET omdb_data_available = 1, poster = 'http://x/p.jpg', imdb_rating = 7.5 "
+               "WHERE show_id = 'zz-counters'")
+    db.commit()
+    assert get_counters(*names) == {name: value + 1 for name, value in before.items()}
+
+    db.execute("UPDATE movies SET poster = '' WHERE show_id = 'zz-counters'")
+    db.commit()
+    assert get_counters("movies_with_poster") == {"movies_with_poster": before["movies_with_poster"]}
+
+    movie_service.delete_movie("zz-counters")
+    assert get_counters(*names) == before
+    assert get_counters("movies_total")["movies_total"] == \
+        db.execute("SELECT COUNT(*) AS c FROM movies").fetchone()["c"]
+
+
+def test_catalog_version_ignores_omdb_attempts(movie_service, new_movie):
+    new_movie("zz-version", title="Qwzversion")
+    version, _ = get_catalog_version()
+
+    db = get_db()
+    db.execute("UPDATE movies SET omdb_last_attempt = datetime('now') WHERE show_id = 'zz-version'")
+    db.commit()
+    assert get_catalog_version()[0] == version
+
+    movie_service.update_movie("zz-version", {"rating": "PG"})
+    assert get_catalog_version()[0] == version + 1
+
+
+def test_text_change_log(movie_service, new_movie):
+    since = get_text_version()
+    new_movie("zz-text", title="Qwztext")
+    movie_service.update_movie("zz-text", {"rating": "PG"})
+    assert get_text_changes(since) == (since + 1, ["zz-text"])
+
+    # Rewriting the same text logs nothing.
+    movie_service.update_movie("zz-text", {"title": "Qwztext"})
+    assert get_text_version() == since + 1
+
+    movie_service.update_movie("zz-text", {"description": "Qwz"})
+    latest, changed = get_text_changes(since + 1)
+    assert (latest, changed) == (since + 2, ["zz-text"])
+    # A gap the log cannot replay asks for a rebuild.
+    assert get_text_changes(since, limit=1)[1] is None
+    assert get_text_changes(latest + 5)[1] is None